@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analiz Zamanlayıcısı
+Yüz analizlerini tek bir frame'de toplamak yerine analiz aralığına yayar,
+böylece frame süresi düz kalır. Görüntüsü değişmeyen yüzlerin yeniden
+analizini atlayan filtreyi de içerir.
+"""
+
+import math
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class AnalysisScheduler:
+    def __init__(self, tracker, max_per_frame=1):
+        """
+        Frame başına bütçeli, sıralı (round-robin) analiz zamanlayıcısı
+
+        Args:
+            tracker: Sonuç geçerlilik süresini belirleyen FaceTracker
+            max_per_frame: Bir frame'de en fazla kaç yüz analiz edilir
+        """
+        self.tracker = tracker
+        self.max_per_frame = max_per_frame
+        self.deferred = 0  # Bütçe yüzünden sonraki frame'e kalan analizler
+
+    def select(self, tracks, frame_index):
+        """
+        Bu frame'de analiz edilecek takipleri seç
+
+        Yeni yüzler önce, ardından sonucu en eski olanlar gelir. Bütçe, tüm
+        yüzlerin bir aralık içinde yenilenebileceği kadar otomatik büyütülür.
+
+        Args:
+            tracks: Bu frame'deki Track listesi
+            frame_index: Frame numarası
+
+        Returns:
+            Analiz edilecek Track listesi
+        """
+        due = [t for t in tracks if self.tracker.needs_analysis(t, frame_index)]
+        if not due:
+            return []
+
+        due.sort(key=lambda t: -1 if t.analyzed_frame is None else t.analyzed_frame)
+        budget = max(
+            self.max_per_frame,
+            math.ceil(len(tracks) / self.tracker.result_ttl)
+        )
+
+        selected = due[:budget]
+        self.deferred += len(due) - len(selected)
+        return selected
+
+
+def crop_signature(frame, box, size=16):
+    """
+    Yüz bölgesinin küçültülmüş, parlaklıktan arındırılmış gri özeti
+
+    Args:
+        frame: BGR frame
+        box: (x, y, w, h) kutusu
+        size: Özetin kenar uzunluğu
+
+    Returns:
+        size x size float32 dizi (ortalaması sıfır); kutu frame dışındaysa None
+    """
+    x, y, w, h = box
+    x0, y0 = max(int(x), 0), max(int(y), 0)
+    x1, y1 = min(int(x + w), frame.shape[1]), min(int(y + h), frame.shape[0])
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return None
+    gray = cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+    signature = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA).astype(np.float32)
+    # Kameranın otomatik pozlaması yüzünden oluşan genel parlaklık kaymasını yok say
+    return signature - signature.mean()
+
+
+class CropChangeFilter:
+    def __init__(self, threshold=2.5, max_age=300):
+        """
+        Görüntüsü değişmeyen yüzler için önceki duygu sonucunu yeniden kullanır
+
+        Karşılaştırma, son çıkarımın yapıldığı kutu konumunda yapılır: kişi
+        kıpırdamıyorsa aynı konumdaki pikseller yalnızca gürültü kadar değişir,
+        tespit kutusunun titremesi değişiklik sayılmaz. Kişi hareket ettiyse
+        ya da ifadesi değiştiyse fark eşiği aşar.
+
+        Args:
+            threshold: Özetler arası ortalama mutlak fark (0-255) bunun altındaysa yüz değişmemiş sayılır
+            max_age: Son gerçek çıkarımdan bu kadar frame sonra değişmese de yeniden analiz edilir
+        """
+        self.threshold = threshold
+        self.max_age = max_age
+
+        # İstatistikler
+        self.checks = 0
+        self.reused = 0
+
+    def filter(self, tracks, frame, frame_index):
+        """
+        Analiz sırası gelen takiplerden görüntüsü değişmeyenleri ayıkla
+
+        Ayıklanan takiplerin sonucu geçerli sayılır (analyzed_frame güncellenir).
+
+        Args:
+            tracks: Analiz sırası gelen Track listesi
+            frame: Henüz üzerine çizilmemiş BGR frame
+            frame_index: Frame numarası
+
+        Returns:
+            Gerçekten analiz edilmesi gereken Track listesi
+        """
+        changed = []
+        for track in tracks:
+            if (track.emotion is None or track.signature is None
+                    or frame_index - track.inferred_frame >= self.max_age):
+                changed.append(track)
+                continue
+
+            self.checks += 1
+            signature = crop_signature(frame, track.signature_box)
+            if signature is not None and np.abs(signature - track.signature).mean() < self.threshold:
+                track.analyzed_frame = frame_index
+                self.reused += 1
+            else:
+                changed.append(track)
+        return changed
+
+    def record(self, track, frame, frame_index):
+        """Çıkarıma gönderilen yüzün özetini sakla (sonraki karşılaştırmalar için)"""
+        track.signature_box = track.box
+        track.signature = crop_signature(frame, track.box)
+        track.inferred_frame = frame_index
+
+    def stats(self):
+        """
+        Yeniden kullanım istatistikleri
+
+        Returns:
+            Karşılaştırma, yeniden kullanılan sonuç sayısı ve isabet oranı
+        """
+        return {
+            'checks': self.checks,
+            'reused': self.reused,
+            'hit_rate': self.reused / self.checks if self.checks else 0.0
+        }
+
+
+class FrameTimeStats:
+    def __init__(self, window=3000):
+        """
+        Son frame sürelerini saklayıp yüzdelik değerleri hesaplar
+
+        Args:
+            window: Hesaba katılan en son frame sayısı
+        """
+        self.samples = deque(maxlen=window)
+
+    def add(self, seconds):
+        """Bir frame'in işlenme süresini (saniye) ekle"""
+        self.samples.append(seconds)
+
+    def percentile(self, q):
+        """Frame süresinin q. yüzdeliği (milisaniye)"""
+        if not self.samples:
+            return 0.0
+        return float(np.percentile(self.samples, q)) * 1000
+
+    def summary(self):
+        """p50 / p99 / en yüksek frame süreleri (milisaniye)"""
+        return {
+            'frames': len(self.samples),
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+            'max_ms': max(self.samples) * 1000 if self.samples else 0.0
+        }
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mikro Toplu Analiz Havuzu
+Eşzamanlı isteklerden gelen yüzleri kısa bir bekleme süresi içinde toplayıp
+tek model çağrısında sınıflandıran işçi havuzu.
+"""
+
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from analysis_scheduler import FrameTimeStats
+
+
+class PoolFullError(Exception):
+    """Kuyruk dolu olduğu için istek kabul edilmedi"""
+
+
+class PoolTimeoutError(Exception):
+    """Sonuçlar bekleme süresi içinde hazır olmadı"""
+
+
+class MicroBatchPool:
+    def __init__(self, emotion_model, workers=1, max_batch=16, max_wait=0.01,
+                 max_queue=256):
+        """
+        Yüzleri mikro toplu işlere ayıran analiz havuzu
+
+        Args:
+            emotion_model: Yüklenmiş EmotionModel
+            workers: İşçi thread sayısı
+            max_batch: Bir model çağrısındaki en fazla yüz sayısı
+            max_wait: İlk yüzden sonra toplu işi doldurmak için beklenecek en fazla süre (saniye)
+            max_queue: Kuyrukta bekleyebilecek en fazla yüz sayısı
+        """
+        self.emotion_model = emotion_model
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue(maxsize=max_queue)
+        self.threads = []
+        self.running = False
+        self.lock = threading.Lock()
+
+        # İstatistikler
+        self.submitted = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batch_sizes = Counter()
+        self.latencies = FrameTimeStats()  # Yüz başına kuyruğa girişten sonuca kadar
+
+    def start(self):
+        """İşçi thread'lerini başlat"""
+        if self.running:
+            return
+        self.running = True
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"batch-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=2.0):
+        """İşçi thread'lerini durdur"""
+        if not self.running:
+            return
+        self.running = False
+        for _ in self.threads:
+            try:
+                self.requests.put_nowait(None)
+            except queue.Full:
+                pass
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def submit(self, face_rois):
+        """
+        Yüzleri kuyruğa ekle (beklemeden)
+
+        Args:
+            face_rois: BGR yüz bölgeleri
+
+        Returns:
+            Her yüz için sonucu taşıyan Future listesi
+        """
+        futures = []
+        for face_roi in face_rois:
+            future = Future()
+            try:
+                self.requests.put_nowait((time.perf_counter(), face_roi, future))
+            except queue.Full:
+                with self.lock:
+                    self.rejected += len(face_rois) - len(futures)
+                for queued in futures:
+                    queued.cancel()
+                raise PoolFullError("Analiz kuyruğu dolu")
+            futures.append(future)
+
+        with self.lock:
+            self.submitted += len(futures)
+        return futures
+
+    def analyze(self, face_rois, timeout=30.0):
+        """
+        Yüzleri analiz et ve sonuçları bekle
+
+        Args:
+            face_rois: BGR yüz bölgeleri
+            timeout: Yüz başına en fazla bekleme süresi (saniye)
+
+        Returns:
+            Her yüz için sonuç (başarısızsa None), aynı sırada
+        """
+        futures = self.submit(face_rois)
+        return [future.result(timeout) for future in futures]
+
+    def stats(self):
+        """
+        Kuyruk, toplu iş ve gecikme istatistikleri
+
+        Returns:
+            Kuyruk derinliği, toplu iş boyutları ve gecikme yüzdelikleri (ms)
+        """
+        with self.lock:
+            faces = sum(size * count for size, count in self.batch_sizes.items())
+            return {
+                'queue_depth': self.requests.qsize(),
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'batches': self.batches,
+                'mean_batch_size': faces / self.batches if self.batches else 0.0,
+                'batch_sizes': {str(size): count for size, count in sorted(self.batch_sizes.items())},
+                'latency_p50_ms': self.latencies.percentile(50),
+                'latency_p95_ms': self.latencies.percentile(95),
+                'latency_p99_ms': self.latencies.percentile(99)
+            }
+
+    def _collect_batch(self):
+        """İlk yüzü bekle, ardından max_wait dolana kadar toplu işi doldur"""
+        first = self.requests.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Durdurma işaretini diğer işçiler için geri koy
+                self.requests.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while self.running:
+            batch = self._collect_batch()
+            if batch is None:
+                break
+
+            # İptal edilmiş (kuyruk dolduğu için geri çevrilmiş) isteklerin yüzlerini atla
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                results = self.emotion_model.analyze_batch([face_roi for _, face_roi, _ in batch])
+            except Exception:
+                results = [None] * len(batch)
+
+            done = time.perf_counter()
+            with self.lock:
+                self.batches += 1
+                self.batch_sizes[len(batch)] += 1
+                for submitted_at, _, _ in batch:
+                    self.latencies.add(done - submitted_at)
+
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
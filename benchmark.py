@@ -0,0 +1,990 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Performans Ölçüm Scripti
+Duygu analizi hattının farklı bölümlerinin hızını webcam olmadan ölçer.
+"""
+
+import argparse
+import contextlib
+import glob
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import cv2
+import numpy as np
+from face_detection import available_backends
+
+
+def load_face_rois(count, image_path=None, size=120):
+    """
+    Ölçüm için yüz bölgeleri hazırla
+
+    Args:
+        count: İstenen yüz sayısı
+        image_path: Verilirse yüzler bu görüntüden kesilir (gerekirse tekrar edilir)
+        size: Sentetik yüz bölgelerinin kenar uzunluğu
+
+    Returns:
+        BGR yüz bölgeleri listesi
+    """
+    rois = []
+    if image_path:
+        image = cv2.imread(image_path)
+        if image is None:
+            raise SystemExit(f"Hata: '{image_path}' görüntüsü yüklenemedi!")
+        from face_detection import CascadeFaceDetector
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        faces = CascadeFaceDetector('haar').detect(gray)
+        rois = [image[y:y+h, x:x+w] for (x, y, w, h) in faces]
+        if not rois:
+            raise SystemExit("Hata: Görüntüde yüz tespit edilemedi!")
+
+    if not rois:
+        rng = np.random.default_rng(0)
+        rois = [rng.integers(0, 255, (size, size, 3), dtype=np.uint8)]
+
+    return [rois[i % len(rois)] for i in range(count)]
+
+
+def draw_synthetic_face(size):
+    """Haar/LBP cascade'lerinin yüz olarak bulduğu basit çizim yüz (BGR)"""
+    face = np.full((size, size, 3), 60, dtype=np.uint8)
+    center = size // 2
+    cv2.ellipse(face, (center, center), (int(size * 0.36), int(size * 0.46)),
+                0, 0, 360, (150, 170, 200), -1)
+    for side in (-1, 1):
+        eye_x = center + side * int(size * 0.16)
+        eye_y = int(size * 0.40)
+        # Kaş ve göz
+        cv2.ellipse(face, (eye_x, eye_y - int(size * 0.08)), (int(size * 0.10), int(size * 0.025)),
+                    0, 0, 360, (40, 40, 50), -1)
+        cv2.ellipse(face, (eye_x, eye_y), (int(size * 0.08), int(size * 0.04)),
+                    0, 0, 360, (30, 30, 30), -1)
+    cv2.ellipse(face, (center, int(size * 0.58)), (int(size * 0.04), int(size * 0.08)),
+                0, 0, 360, (120, 140, 170), -1)
+    cv2.ellipse(face, (center, int(size * 0.72)), (int(size * 0.14), int(size * 0.04)),
+                0, 0, 360, (60, 60, 120), -1)
+    return cv2.GaussianBlur(face, (0, 0), size / 60)
+
+
+def synthetic_frames(count, faces, width=1280, height=720, face_image=None, seed=0):
+    """
+    Webcam yerine kullanılacak sentetik frame'ler
+
+    Gürültülü bir arka plan üzerine ızgara halinde yüzler yerleştirilir;
+    yüzler frame'den frame'e birkaç piksel kayar.
+
+    Args:
+        count: Frame sayısı
+        faces: Frame başına yüz sayısı
+        width: Frame genişliği
+        height: Frame yüksekliği
+        face_image: Verilirse yüzler bu görüntüden kesilir, yoksa çizim yüz kullanılır
+        seed: Gürültü ve kayma için rastgelelik tohumu
+
+    Returns:
+        BGR frame listesi
+    """
+    rng = np.random.default_rng(seed)
+    background = rng.integers(70, 130, (height, width, 3), dtype=np.uint8)
+
+    placements = []
+    if faces:
+        columns = int(np.ceil(np.sqrt(faces * width / height)))
+        rows = int(np.ceil(faces / columns))
+        cell_w, cell_h = width // columns, height // rows
+        size = min(int(min(cell_w, cell_h) * 0.7), 200)
+        if face_image:
+            templates = [cv2.resize(roi, (size, size)) for roi in load_face_rois(faces, face_image)]
+        else:
+            templates = [draw_synthetic_face(size)] * faces
+        for i in range(faces):
+            x = (i % columns) * cell_w + (cell_w - size) // 2
+            y = (i // columns) * cell_h + (cell_h - size) // 2
+            placements.append((x, y, templates[i]))
+
+    frames = []
+    for _ in range(count):
+        frame = background.copy()
+        for x, y, template in placements:
+            dx, dy = rng.integers(-3, 4, 2)
+            x = int(np.clip(x + dx, 0, width - template.shape[1]))
+            y = int(np.clip(y + dy, 0, height - template.shape[0]))
+            frame[y:y + template.shape[0], x:x + template.shape[1]] = template
+        frames.append(frame)
+    return frames
+
+
+def measure(func, repeats):
+    """Fonksiyonu tekrar tekrar çalıştır ve ortalama süreyi (saniye) döndür"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def measure_samples(func, repeats):
+    """Fonksiyonu tekrar tekrar çalıştır ve her çağrının süresini (saniye) döndür"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_batch(args):
+    """Yüz başına DeepFace.analyze döngüsü ile toplu model çağrısını karşılaştır"""
+    from deepface import DeepFace
+    from emotion_model import EmotionModel
+
+    face_counts = args.faces
+    rois = load_face_rois(max(face_counts), args.image)
+    emotion_model = EmotionModel()
+
+    def per_face(face_rois):
+        for face_roi in face_rois:
+            DeepFace.analyze(
+                face_roi,
+                actions=['emotion'],
+                enforce_detection=False,
+                silent=True
+            )
+
+    # İlk çağrı maliyetlerini ölçüme katma
+    per_face(rois[:1])
+    emotion_model.analyze_batch(rois[:1])
+
+    print("Toplu çıkarım ölçümü (yüz başına döngü vs. tek model çağrısı)")
+    print("-" * 72)
+    print(f"{'Yüz':>5} | {'Döngü ms':>10} | {'Döngü yüz/s':>11} | "
+          f"{'Toplu ms':>10} | {'Toplu yüz/s':>11} | {'Hızlanma':>8}")
+    print("-" * 72)
+
+    for count in face_counts:
+        face_rois = rois[:count]
+        loop_time = measure(lambda: per_face(face_rois), args.repeats)
+        batch_time = measure(lambda: emotion_model.analyze_batch(face_rois), args.repeats)
+        print(f"{count:5d} | {loop_time * 1000:10.1f} | {count / loop_time:11.1f} | "
+              f"{batch_time * 1000:10.1f} | {count / batch_time:11.1f} | "
+              f"{loop_time / batch_time:7.2f}x")
+
+
+def bench_precrop(args):
+    """Yüz başına gecikme: DeepFace.analyze vs. yeniden tespitli / kesit modu"""
+    from deepface import DeepFace
+    from emotion_model import EmotionModel
+
+    rois = load_face_rois(args.count, args.image)
+    redetect_model = EmotionModel()
+    precropped_model = EmotionModel(precropped=True)
+
+    def deepface_path(face_roi):
+        DeepFace.analyze(
+            face_roi,
+            actions=['emotion'],
+            enforce_detection=False,
+            silent=True
+        )
+
+    # (ad, tam analiz, yalnızca ön işleme)
+    paths = [
+        ("DeepFace.analyze", deepface_path, None),
+        ("Yeniden tespit", redetect_model.analyze, redetect_model.preprocess),
+        ("Kesit modu", precropped_model.analyze, precropped_model.preprocess),
+    ]
+
+    # İlk çağrı maliyetlerini ölçüme katma
+    for _, analyze, _ in paths:
+        analyze(rois[0])
+
+    print("Yüz başına gecikme (ms)")
+    print("-" * 76)
+    print(f"{'Yol':18s} | {'Ön işleme':>9} | {'Ort.':>7} | {'p50':>7} | {'p95':>7} | {'Hızlanma':>8}")
+    print("-" * 76)
+
+    baseline = None
+    for name, analyze, preprocess in paths:
+        samples = []
+        for face_roi in rois:
+            samples.extend(measure_samples(lambda: analyze(face_roi), args.repeats))
+        samples = np.array(samples) * 1000
+
+        preprocess_ms = float('nan')
+        if preprocess is not None:
+            preprocess_ms = np.mean([
+                measure(lambda: preprocess(face_roi), args.repeats)
+                for face_roi in rois
+            ]) * 1000
+
+        mean = samples.mean()
+        baseline = baseline or mean
+        print(f"{name:18s} | {preprocess_ms:9.2f} | {mean:7.2f} | "
+              f"{np.percentile(samples, 50):7.2f} | {np.percentile(samples, 95):7.2f} | "
+              f"{baseline / mean:7.2f}x")
+
+
+def load_images(patterns):
+    """Dosya, dizin veya glob desenlerinden görüntüleri yükle"""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*')
+        paths.extend(sorted(glob.glob(pattern)))
+
+    images = []
+    for path in paths:
+        image = cv2.imread(path)
+        if image is not None:
+            images.append((path, image))
+    if not images:
+        raise SystemExit("Hata: Görüntü bulunamadı!")
+    return images
+
+
+def match_recall(reference, detected, iou_threshold=0.5):
+    """Referans kutuların kaçının tespit kutularıyla eşleştiği"""
+    from face_tracker import box_iou
+
+    matched = 0
+    for ref_box in reference:
+        if any(box_iou(ref_box, box) >= iou_threshold for box in detected):
+            matched += 1
+    return matched
+
+
+def bench_detect_scale(args):
+    """Küçültülmüş tespit: farklı genişliklerde hız ve tam çözünürlüğe göre duyarlılık"""
+    from face_detection import CascadeFaceDetector
+
+    detectors = {
+        detect_width: CascadeFaceDetector(args.detector, detect_width=detect_width)
+        for detect_width in [None] + args.widths
+    }
+    images = [
+        (path, cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+        for path, image in load_images(args.images)
+    ]
+
+    # Referans: tam çözünürlükte bulunan yüzler
+    references = [detectors[None].detect(gray) for _, gray in images]
+    total_faces = sum(len(faces) for faces in references)
+
+    print(f"{len(images)} görüntü, tam çözünürlükte {total_faces} yüz")
+    print("-" * 58)
+    print(f"{'Genişlik':>9} | {'Tespit ms':>10} | {'Hızlanma':>8} | {'Bulunan':>7} | {'Duyarlılık':>10}")
+    print("-" * 58)
+
+    baseline = None
+    for detect_width, detector in detectors.items():
+        elapsed = 0.0
+        matched = 0
+        for (_, gray), reference in zip(images, references):
+            elapsed += measure(lambda: detector.detect(gray), args.repeats)
+            matched += match_recall(reference, detector.detect(gray))
+
+        mean_ms = elapsed / len(images) * 1000
+        baseline = baseline or mean_ms
+        recall = matched / total_faces if total_faces else float('nan')
+        label = "tam" if detect_width is None else str(detect_width)
+        print(f"{label:>9} | {mean_ms:10.2f} | {baseline / mean_ms:7.2f}x | "
+              f"{matched:7d} | {recall:10.1%}")
+
+
+def bench_detectors(args):
+    """Tespit yöntemleri: frame başına maliyet ve referans yönteme göre duyarlılık"""
+    from face_detection import CascadeFaceDetector
+
+    images = [
+        (path, cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+        for path, image in load_images(args.images)
+    ]
+
+    detectors = []
+    for backend in args.backends:
+        try:
+            detectors.append(CascadeFaceDetector(backend, detect_width=args.detect_width))
+        except (FileNotFoundError, IOError) as e:
+            print(f"'{backend}' atlandı: {e}")
+
+    reference_detector = CascadeFaceDetector(args.reference, detect_width=args.detect_width)
+    references = [reference_detector.detect(gray) for _, gray in images]
+    total_faces = sum(len(faces) for faces in references)
+
+    print(f"{len(images)} görüntü, referans ({args.reference}) {total_faces} yüz")
+    print("-" * 66)
+    print(f"{'Yöntem':>13} | {'Ort. ms':>8} | {'p99 ms':>8} | {'Bulunan':>7} | "
+          f"{'Eşleşen':>7} | {'Duyarlılık':>10}")
+    print("-" * 66)
+
+    for detector in detectors:
+        found = 0
+        matched = 0
+        for (_, gray), reference in zip(images, references):
+            faces = detector.detect(gray)
+            found += len(faces)
+            matched += match_recall(reference, faces)
+            for _ in range(args.repeats - 1):
+                detector.detect(gray)
+
+        stats = detector.stats()
+        recall = matched / total_faces if total_faces else float('nan')
+        print(f"{stats['backend']:>13} | {stats['mean_ms']:8.2f} | {stats['p99_ms']:8.2f} | "
+              f"{found:7d} | {matched:7d} | {recall:10.1%}")
+
+
+def load_video_frames(path, count):
+    """Kayıtlı videodan en fazla count frame oku"""
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"Hata: '{path}' videosundan frame okunamadı!")
+    return frames
+
+
+def peak_rss_mb():
+    """Sürecin şimdiye kadarki en yüksek bellek kullanımı (MB; ölçülemiyorsa None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux kilobayt, macOS bayt cinsinden verir
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def git_commit():
+    """Çalışılan commit (git yoksa None)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Ölçüm takımında EmotionDetector.detect_emotions yolu ölçülen uygulamalar
+PIPELINE_TARGETS = {
+    'desktop': 'emotion_detection',
+    'realtime': 'emotion_detection_realtime',
+    'web': 'emotion_detection_web',
+    'webcam': 'emotion_detection_webcam'
+}
+SUITE_TARGETS = ['cascade', 'incremental', 'analyze_image'] + list(PIPELINE_TARGETS)
+
+
+def run_suite_config(config):
+    """
+    Tek bir ölçüm yapılandırmasını çalıştır (ayrı süreçte çağrılır)
+
+    Args:
+        config: target, backend, faces ve frame kaynağını tanımlayan sözlük
+
+    Returns:
+        Verim, gecikme yüzdelikleri ve en yüksek bellek kullanımı
+    """
+    from face_detection import CascadeFaceDetector, IncrementalFaceDetector
+
+    if config['video']:
+        frames = load_video_frames(config['video'], config['frames'])
+    else:
+        frames = synthetic_frames(config['frames'], config['faces'], config['width'],
+                                  config['height'], config['face_image'])
+
+    result = {key: config[key] for key in ('name', 'target', 'backend', 'faces')}
+    result['frames'] = len(frames)
+    try:
+        detector = CascadeFaceDetector(config['backend'], detect_width=config['detect_width'])
+    except (FileNotFoundError, IOError) as e:
+        result['error'] = str(e)
+        return result
+
+    found = []
+    workdir = None
+    if config['target'] == 'analyze_image':
+        from image_emotion_detection import analyze_image, load_emotion_model
+
+        workdir = tempfile.mkdtemp(prefix='emotion_bench_')
+        inputs = []
+        for i, frame in enumerate(frames):
+            path = os.path.join(workdir, f"frame_{i:05d}.jpg")
+            cv2.imwrite(path, frame)
+            inputs.append(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            emotion_model = load_emotion_model(config['precropped'])
+
+        def step(path):
+            # analyze_image konsola ayrıntılı çıktı yazar, ölçümü kirletmesin
+            with contextlib.redirect_stdout(io.StringIO()):
+                analyze_image(path, emotion_model=emotion_model, detector=config['backend'],
+                              detect_width=config['detect_width'])
+    elif config['target'] in PIPELINE_TARGETS:
+        try:
+            module = importlib.import_module(PIPELINE_TARGETS[config['target']])
+        except ImportError as e:
+            # ör. web hedefi Flask ister
+            result['error'] = str(e)
+            return result
+        options = {
+            'precropped': config['precropped'],
+            'detect_width': config['detect_width'],
+            'full_scan_interval': config['full_scan_interval'],
+            'detector': config['backend']
+        }
+        if config['target'] == 'webcam':
+            options['save_video'] = False
+        # Model ısınma çıktısı ölçüm tablosuna karışmasın
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline = module.EmotionDetector(**options)
+        inputs = frames
+
+        def step(frame):
+            # Uygulamaların döngüleri gibi frame sayacını çağrıdan önce artır
+            if hasattr(pipeline, 'frame_count'):
+                pipeline.frame_count += 1
+            with contextlib.redirect_stdout(io.StringIO()):
+                pipeline.detect_emotions(frame.copy())
+            if hasattr(pipeline, 'last_faces'):
+                found.append(len(pipeline.last_faces))
+    else:
+        inputs = frames
+        if config['target'] == 'incremental':
+            detector = IncrementalFaceDetector(detector.detect,
+                                               full_scan_interval=config['full_scan_interval'])
+
+        def step(frame):
+            found.append(len(detector.detect(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))))
+
+    # İlk çağrı maliyetlerini ölçüme katma
+    step(inputs[0])
+    found.clear()
+
+    samples = []
+    start = time.perf_counter()
+    for item in inputs:
+        item_start = time.perf_counter()
+        step(item)
+        samples.append(time.perf_counter() - item_start)
+    elapsed = time.perf_counter() - start
+    if workdir is not None:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    samples = np.array(samples) * 1000
+    result.update({
+        'fps': len(inputs) / elapsed,
+        'mean_ms': float(samples.mean()),
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p95_ms': float(np.percentile(samples, 95)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'max_ms': float(samples.max()),
+        'faces_found': float(np.mean(found)) if found else None,
+        'peak_rss_mb': peak_rss_mb()
+    })
+    return result
+
+
+def print_suite_comparison(results, baseline_path):
+    """Sonuçları önceki bir çalıştırmanın JSON çıktısıyla karşılaştır"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {r['name']: r for r in baseline['results'] if 'error' not in r}
+
+    print()
+    print(f"Karşılaştırma: {baseline_path} (commit {baseline.get('commit') or '?'})")
+    print("-" * 78)
+    print(f"{'Yapılandırma':32s} | {'fps önce':>9} | {'fps şimdi':>9} | {'Değişim':>8} | {'p95 farkı':>9}")
+    print("-" * 78)
+    for result in results:
+        old = previous.get(result['name'])
+        if old is None or 'error' in result:
+            continue
+        change = (result['fps'] / old['fps'] - 1) if old['fps'] else float('nan')
+        print(f"{result['name']:32s} | {old['fps']:9.1f} | {result['fps']:9.1f} | "
+              f"{change:+8.1%} | {result['p95_ms'] - old['p95_ms']:+9.2f}")
+
+
+def bench_suite(args):
+    """Webcam gerektirmeyen ölçüm takımı: tespit sınıfları, analyze_image ve uygulama detektörleri"""
+    configs = []
+    for target in args.targets:
+        for backend in args.backends:
+            for faces in args.faces:
+                name = f"{target}:{backend} faces={faces}"
+                if args.video:
+                    name = f"{target}:{backend} video"
+                configs.append({
+                    'name': name,
+                    'target': target,
+                    'backend': backend,
+                    'faces': None if args.video else faces,
+                    'frames': args.frames,
+                    'width': args.width,
+                    'height': args.height,
+                    'video': args.video,
+                    'face_image': args.image,
+                    'detect_width': args.detect_width,
+                    'full_scan_interval': args.full_scan_every,
+                    'precropped': args.precropped
+                })
+                if args.video:
+                    break
+
+    source = args.video or f"sentetik {args.width}x{args.height}"
+    print(f"Ölçüm takımı: {len(configs)} yapılandırma, {args.frames} frame, kaynak: {source}")
+    print("-" * 92)
+    print(f"{'Yapılandırma':32s} | {'fps':>7} | {'p50 ms':>7} | {'p95 ms':>7} | "
+          f"{'p99 ms':>7} | {'Yüz':>5} | {'RSS MB':>7}")
+    print("-" * 92)
+
+    # Her yapılandırma ayrı süreçte çalışır: en yüksek bellek ölçümü birbirini
+    # etkilemez ve model yüklemesi yalnızca analyze_image ölçümlerine düşer
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for config in configs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_suite_config, config).result()
+        results.append(result)
+        if 'error' in result:
+            print(f"{result['name']:32s} | atlandı: {result['error']}")
+            continue
+        faces_found = '-' if result['faces_found'] is None else f"{result['faces_found']:.1f}"
+        rss = '-' if result['peak_rss_mb'] is None else f"{result['peak_rss_mb']:.0f}"
+        print(f"{result['name']:32s} | {result['fps']:7.1f} | {result['p50_ms']:7.2f} | "
+              f"{result['p95_ms']:7.2f} | {result['p99_ms']:7.2f} | {faces_found:>5} | {rss:>7}")
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'cpu_count': os.cpu_count(),
+        'source': source,
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nSonuçlar kaydedildi: {args.output}")
+
+    if args.compare:
+        print_suite_comparison(results, args.compare)
+
+
+def bench_segments(args):
+    """Paralel bölüm işleme: işçi sayısına göre verim ve ölçeklenme"""
+    from emotion_detection_parallel import process_video
+
+    options = {'detect_width': args.detect_width, 'detector': args.detector}
+    print(f"{args.video}, işçi başına {args.segments_per_worker} bölüm, "
+          f"{os.cpu_count()} çekirdek")
+    print("-" * 62)
+    print(f"{'İşçi':>5} | {'Frame':>6} | {'Süre sn':>8} | {'fps':>7} | {'Hızlanma':>8} | {'Verimlilik':>10}")
+    print("-" * 62)
+
+    # Hızlanma her zaman ölçülmüş tek işçili çalıştırmaya göre hesaplanır
+    baseline = None
+    for workers in sorted(set(args.workers) | {1}):
+        workdir = tempfile.mkdtemp(prefix='emotion_bench_')
+        try:
+            summary = process_video(
+                args.video,
+                workers=workers,
+                segments=workers * args.segments_per_worker,
+                output_path=None if args.no_save else os.path.join(workdir, 'output.avi'),
+                records_path=os.path.join(workdir, 'frames.jsonl'),
+                options=options,
+                verbose=False
+            )
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        if workers == 1:
+            baseline = summary['fps']
+        speedup = summary['fps'] / baseline
+        print(f"{workers:5d} | {summary['frames']:6d} | {summary['elapsed']:8.1f} | "
+              f"{summary['fps']:7.1f} | {speedup:7.2f}x | {speedup / workers:10.0%}")
+
+    # İşçi başlatma maliyeti uzun videolarda önemsizleşir
+    print("Not: Sürelere işçi süreçlerin başlatılması (TensorFlow ve model yükleme) dahildir; "
+          "kısa videolarda ölçeklenme olduğundan düşük görünür.")
+
+
+async def watch_stream(url, duration, results):
+    """Bir MJPEG akışına bağlan ve süre boyunca gelen frame'leri say"""
+    import asyncio
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    result = {'connected': False, 'frames': 0, 'bytes': 0}
+    results.append(result)
+    writer = None
+    try:
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: close\r\n\r\n"
+            .encode('latin-1')
+        )
+        await writer.drain()
+
+        status_line = await asyncio.wait_for(reader.readline(), duration)
+        result['connected'] = b' 200 ' in status_line
+
+        loop = asyncio.get_running_loop()
+        end = loop.time() + duration
+        tail = b''
+        while result['connected']:
+            remaining = end - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                data = await asyncio.wait_for(reader.read(65536), remaining)
+            except asyncio.TimeoutError:
+                break
+            if not data:
+                break
+            result['bytes'] += len(data)
+            # Parça sınırında bölünen sınır işaretlerini kaçırmamak için kuyruğu ekle
+            chunk = tail + data
+            result['frames'] += chunk.count(b'--frame')
+            tail = chunk[-6:]
+    except (OSError, asyncio.TimeoutError):
+        pass
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def bench_viewers(args):
+    """Eşzamanlı MJPEG izleyici yük testi: sunucular arası izleyici kapasitesi"""
+    import asyncio
+
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    async def run_step(url, clients):
+        results = []
+        await asyncio.gather(*[
+            watch_stream(url, args.duration, results) for _ in range(clients)
+        ])
+        return results
+
+    print(f"Her adım {args.duration} sn, yeterli izleyici: en az {args.min_fps} fps")
+    for url in args.urls:
+        print()
+        print(url)
+        print("-" * 70)
+        print(f"{'İzleyici':>8} | {'Bağlanan':>8} | {'Ort. fps':>8} | {'En düşük':>8} | "
+              f"{'Yeterli':>7} | {'Mbit/s':>8}")
+        print("-" * 70)
+
+        max_viewers = 0
+        for clients in args.clients:
+            results = asyncio.run(run_step(url, clients))
+            connected = [r for r in results if r['connected']]
+            fps = [r['frames'] / args.duration for r in connected]
+            served = sum(1 for f in fps if f >= args.min_fps)
+            mbps = sum(r['bytes'] for r in connected) * 8 / 1e6 / args.duration
+            print(f"{clients:8d} | {len(connected):8d} | "
+                  f"{np.mean(fps) if fps else 0.0:8.2f} | {min(fps) if fps else 0.0:8.2f} | "
+                  f"{served:7d} | {mbps:8.1f}")
+            if served == clients:
+                max_viewers = clients
+            time.sleep(1.0)
+
+        print(f"En fazla yeterli hizmet alan eşzamanlı izleyici: {max_viewers}")
+
+
+def main():
+    """Ana program"""
+    parser = argparse.ArgumentParser(description='Duygu analizi performans ölçümleri')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch_parser = subparsers.add_parser(
+        'batch',
+        help='Yüz sayısına göre toplu çıkarım verimini ölç'
+    )
+    batch_parser.add_argument(
+        '--faces',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4, 8, 16],
+        help='Ölçülecek yüz sayıları (varsayılan: 1 2 4 8 16)'
+    )
+    batch_parser.add_argument(
+        '--image',
+        help='Yüzlerin kesileceği görüntü (verilmezse sentetik yüzler kullanılır)'
+    )
+    batch_parser.add_argument(
+        '--repeats',
+        type=int,
+        default=10,
+        help='Her ölçümün tekrar sayısı (varsayılan: 10)'
+    )
+    batch_parser.set_defaults(func=bench_batch)
+
+    precrop_parser = subparsers.add_parser(
+        'precrop',
+        help='Kesit modunun yüz başına gecikmesini mevcut yol ile karşılaştır'
+    )
+    precrop_parser.add_argument(
+        '--count',
+        type=int,
+        default=4,
+        help='Ölçülecek farklı yüz sayısı (varsayılan: 4)'
+    )
+    precrop_parser.add_argument(
+        '--image',
+        help='Yüzlerin kesileceği görüntü (verilmezse sentetik yüzler kullanılır)'
+    )
+    precrop_parser.add_argument(
+        '--repeats',
+        type=int,
+        default=20,
+        help='Her yüz için tekrar sayısı (varsayılan: 20)'
+    )
+    precrop_parser.set_defaults(func=bench_precrop)
+
+    scale_parser = subparsers.add_parser(
+        'detect-scale',
+        help='Küçültülmüş yüz taramasının hız/duyarlılık tablosu'
+    )
+    scale_parser.add_argument(
+        'images',
+        nargs='+',
+        help='Görüntü dosyaları, dizinler veya glob desenleri'
+    )
+    scale_parser.add_argument(
+        '--widths',
+        type=int,
+        nargs='+',
+        default=[1280, 960, 640, 480, 320],
+        help='Denenecek tarama genişlikleri (varsayılan: 1280 960 640 480 320)'
+    )
+    scale_parser.add_argument(
+        '--repeats',
+        type=int,
+        default=5,
+        help='Her görüntü için tekrar sayısı (varsayılan: 5)'
+    )
+    scale_parser.add_argument(
+        '--detector',
+        choices=available_backends(),
+        default='haar',
+        help='Yüz tespit yöntemi; lbp, lbpcascade_frontalface_improved.xml cascades/ klasörüne konunca seçilebilir (varsayılan: haar)'
+    )
+    scale_parser.set_defaults(func=bench_detect_scale)
+
+    detectors_parser = subparsers.add_parser(
+        'detectors',
+        help='Yüz tespit yöntemlerinin frame başına maliyet/duyarlılık tablosu'
+    )
+    detectors_parser.add_argument(
+        'images',
+        nargs='+',
+        help='Görüntü dosyaları, dizinler veya glob desenleri'
+    )
+    detectors_parser.add_argument(
+        '--backends',
+        nargs='+',
+        choices=available_backends(),
+        default=available_backends(),
+        help='Karşılaştırılacak yöntemler (varsayılan: cascade dosyası bulunan hepsi)'
+    )
+    detectors_parser.add_argument(
+        '--reference',
+        choices=available_backends(),
+        default='haar-profile',
+        help='Duyarlılık için referans alınan yöntem (varsayılan: haar-profile)'
+    )
+    detectors_parser.add_argument(
+        '--detect-width',
+        type=int,
+        default=None,
+        help='Taramanın yapılacağı genişlik (varsayılan: tam çözünürlük)'
+    )
+    detectors_parser.add_argument(
+        '--repeats',
+        type=int,
+        default=5,
+        help='Her görüntü için tekrar sayısı (varsayılan: 5)'
+    )
+    detectors_parser.set_defaults(func=bench_detectors)
+
+    viewers_parser = subparsers.add_parser(
+        'viewers',
+        help='Web sunucularına eşzamanlı MJPEG izleyici yük testi'
+    )
+    viewers_parser.add_argument(
+        'urls',
+        nargs='+',
+        help='Akış adresleri, ör. http://localhost:5000/video_feed'
+    )
+    viewers_parser.add_argument(
+        '--clients',
+        type=int,
+        nargs='+',
+        default=[10, 50, 100, 200, 400],
+        help='Denenecek eşzamanlı izleyici sayıları (varsayılan: 10 50 100 200 400)'
+    )
+    viewers_parser.add_argument(
+        '--duration',
+        type=float,
+        default=10.0,
+        help='Her adımın süresi, saniye (varsayılan: 10)'
+    )
+    viewers_parser.add_argument(
+        '--min-fps',
+        type=float,
+        default=5.0,
+        help='Bir izleyicinin yeterli hizmet aldığı sayılan en düşük fps (varsayılan: 5)'
+    )
+    viewers_parser.set_defaults(func=bench_viewers)
+
+    segments_parser = subparsers.add_parser(
+        'segments',
+        help='Videonun süreç havuzunda paralel işlenmesinin çekirdek sayısına göre ölçeklenmesi'
+    )
+    segments_parser.add_argument('video', help='İşlenecek video dosyası')
+    segments_parser.add_argument(
+        '--workers',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4],
+        help='Denenecek işçi süreç sayıları; hızlanma için 1 işçi her zaman ölçülür (varsayılan: 1 2 4)'
+    )
+    segments_parser.add_argument(
+        '--segments-per-worker',
+        type=int,
+        default=4,
+        help='İşçi başına bölüm sayısı (varsayılan: 4)'
+    )
+    segments_parser.add_argument(
+        '--detect-width',
+        type=int,
+        default=None,
+        help='Taramanın yapılacağı genişlik (varsayılan: tam çözünürlük)'
+    )
+    segments_parser.add_argument(
+        '--detector',
+        choices=available_backends(),
+        default='haar',
+        help='Yüz tespit yöntemi; lbp, lbpcascade_frontalface_improved.xml cascades/ klasörüne konunca seçilebilir (varsayılan: haar)'
+    )
+    segments_parser.add_argument(
+        '--no-save',
+        action='store_true',
+        help='İşaretlenmiş videoyu yazma (yalnızca analiz ve frame kayıtları)'
+    )
+    segments_parser.set_defaults(func=bench_segments)
+
+    suite_parser = subparsers.add_parser(
+        'suite',
+        help='Webcam olmadan tespit sınıfları ve analyze_image için verim/gecikme/bellek ölçümü'
+    )
+    suite_parser.add_argument(
+        '--targets',
+        nargs='+',
+        choices=SUITE_TARGETS,
+        default=SUITE_TARGETS,
+        help='Ölçülecek bileşenler; desktop, realtime, web ve webcam ilgili uygulamanın '
+             'EmotionDetector.detect_emotions yolunu ölçer (varsayılan: hepsi)'
+    )
+    suite_parser.add_argument(
+        '--backends',
+        nargs='+',
+        choices=available_backends(),
+        default=['haar'],
+        help='Yüz tespit yöntemleri (varsayılan: haar)'
+    )
+    suite_parser.add_argument(
+        '--faces',
+        type=int,
+        nargs='+',
+        default=[0, 1, 4],
+        help='Sentetik frame başına yüz sayıları (varsayılan: 0 1 4)'
+    )
+    suite_parser.add_argument(
+        '--frames',
+        type=int,
+        default=100,
+        help='Yapılandırma başına frame sayısı (varsayılan: 100)'
+    )
+    suite_parser.add_argument(
+        '--width',
+        type=int,
+        default=1280,
+        help='Sentetik frame genişliği (varsayılan: 1280)'
+    )
+    suite_parser.add_argument(
+        '--height',
+        type=int,
+        default=720,
+        help='Sentetik frame yüksekliği (varsayılan: 720)'
+    )
+    suite_parser.add_argument(
+        '--video',
+        help='Sentetik frame yerine kayıtlı videodan frame kullan'
+    )
+    suite_parser.add_argument(
+        '--image',
+        help='Sentetik frame\'lere bu görüntüdeki yüzleri yerleştir (verilmezse çizim yüz kullanılır)'
+    )
+    suite_parser.add_argument(
+        '--detect-width',
+        type=int,
+        default=None,
+        help='Taramanın yapılacağı genişlik (varsayılan: tam çözünürlük)'
+    )
+    suite_parser.add_argument(
+        '--full-scan-every',
+        type=int,
+        default=10,
+        help='incremental ve uygulama hedefleri için tam tarama aralığı (0 = her frame tam tarama; varsayılan: 10)'
+    )
+    suite_parser.add_argument(
+        '--precropped',
+        action='store_true',
+        help='analyze_image ölçümünde kesit modunu kullan'
+    )
+    suite_parser.add_argument(
+        '--output',
+        help='Sonuçların yazılacağı JSON dosyası (commit\'ler arası karşılaştırma için)'
+    )
+    suite_parser.add_argument(
+        '--compare',
+        help='Önceki bir --output dosyası; fps ve p95 farklarını yazdırır'
+    )
+    suite_parser.set_defaults(func=bench_suite)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Thread'li Kamera Okuyucu
+Kamerayı arka planda sürekli boşaltır ve işleme döngüsüne her zaman en yeni
+frame'i verir; işlenemeden eskiyen frame'ler atlanır ve sayılır. Video
+dosyaları için de frame atlamadan önceden çözen bir okuyucu içerir.
+"""
+
+import queue
+import threading
+import cv2
+
+
+class CameraStream:
+    def __init__(self, source=0):
+        """
+        Kamerayı aç ve okuma thread'ini başlat
+
+        Args:
+            source: cv2.VideoCapture kaynağı (cihaz numarası veya adres)
+        """
+        self.cap = cv2.VideoCapture(source)
+        self.condition = threading.Condition()
+        self.frame = None
+        self.frame_id = 0        # Kameradan okunan son frame'in numarası
+        self.last_read_id = 0    # İşleme döngüsüne verilen son frame'in numarası
+        self.ended = False
+
+        # İstatistikler
+        self.captured = 0
+        self.dropped = 0
+        self.last_skipped = 0    # Son read() çağrısından önce atlanan frame sayısı
+
+        self.running = self.cap.isOpened()
+        self.thread = None
+        if self.running:
+            self.thread = threading.Thread(target=self._run, name="camera-reader", daemon=True)
+            self.thread.start()
+
+    def isOpened(self):
+        """Kamera açık ve okunuyor mu?"""
+        return self.cap.isOpened() and not self.ended
+
+    def get(self, prop_id):
+        """cv2.VideoCapture özelliğini oku"""
+        return self.cap.get(prop_id)
+
+    def read(self, timeout=2.0):
+        """
+        En yeni frame'i döndür (cv2.VideoCapture.read ile aynı arayüz)
+
+        Daha önce verilmiş frame tekrar verilmez; yeni frame gelene kadar beklenir.
+
+        Args:
+            timeout: Yeni frame için en fazla bekleme süresi (saniye)
+
+        Returns:
+            (başarılı mı, frame)
+        """
+        with self.condition:
+            has_new = self.condition.wait_for(
+                lambda: self.frame_id > self.last_read_id or self.ended,
+                timeout
+            )
+            if not has_new or self.frame_id == self.last_read_id:
+                return False, None
+
+            self.last_skipped = self.frame_id - self.last_read_id - 1
+            self.last_read_id = self.frame_id
+            return True, self.frame
+
+    def release(self):
+        """Okuma thread'ini durdur ve kamerayı kapat"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+        self.cap.release()
+
+    def _run(self):
+        while self.running:
+            ret, frame = self.cap.read()
+
+            with self.condition:
+                if not ret:
+                    self.ended = True
+                    self.condition.notify_all()
+                    break
+
+                # Önceki frame işlenemeden yenisi geldiyse atlanmış sayılır
+                if self.frame_id > self.last_read_id:
+                    self.dropped += 1
+                self.frame = frame
+                self.frame_id += 1
+                self.captured += 1
+                self.condition.notify_all()
+
+
+class VideoFileStream:
+    def __init__(self, path, prefetch=8):
+        """
+        Video dosyasını arka planda çöz ve frame'leri sırayla ver
+
+        Kameradan farklı olarak hiçbir frame atlanmaz; dosya, işleme döngüsünün
+        yetişebildiği hızda (gerçek zamandan bağımsız) okunur. Çözme işi ayrı
+        thread'de yapıldığı için işleme ile üst üste biner.
+
+        Args:
+            path: Video dosyasının yolu
+            prefetch: Önceden çözülüp bekletilecek en fazla frame sayısı
+        """
+        self.cap = cv2.VideoCapture(path)
+        self.frames = queue.Queue(maxsize=prefetch)
+        self.ended = False
+        self.position_ms = 0.0   # Son verilen frame'in kaynak videodaki zamanı
+
+        # CameraStream ile aynı istatistikler (dosyada frame atlanmaz)
+        self.captured = 0
+        self.dropped = 0
+        self.last_skipped = 0
+
+        self.running = self.cap.isOpened()
+        self.thread = None
+        if self.running:
+            self.thread = threading.Thread(target=self._run, name="video-reader", daemon=True)
+            self.thread.start()
+
+    def isOpened(self):
+        """Dosya açık ve okunacak frame kaldı mı?"""
+        return self.cap.isOpened() and not self.ended
+
+    def get(self, prop_id):
+        """cv2.VideoCapture özelliğini oku"""
+        return self.cap.get(prop_id)
+
+    def frame_count(self):
+        """Dosyadaki toplam frame sayısı (bilinmiyorsa 0)"""
+        return max(int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+
+    def read(self, timeout=10.0):
+        """
+        Sıradaki frame'i döndür (cv2.VideoCapture.read ile aynı arayüz)
+
+        Args:
+            timeout: Frame çözülene kadar en fazla bekleme süresi (saniye)
+
+        Returns:
+            (başarılı mı, frame); dosya bittiyse (False, None)
+        """
+        if self.ended:
+            return False, None
+        try:
+            item = self.frames.get(timeout=timeout)
+        except queue.Empty:
+            return False, None
+        if item is None:
+            self.ended = True
+            return False, None
+        self.position_ms, frame = item
+        return True, frame
+
+    def release(self):
+        """Çözme thread'ini durdur ve dosyayı kapat"""
+        self.running = False
+        if self.thread is not None:
+            # Dolu kuyrukta bekleyen okuyucuyu serbest bırak
+            while self.thread.is_alive():
+                try:
+                    self.frames.get_nowait()
+                except queue.Empty:
+                    pass
+                self.thread.join(timeout=0.1)
+        self.cap.release()
+
+    def _run(self):
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            position_ms = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+            self.captured += 1
+            while self.running:
+                try:
+                    self.frames.put((position_ms, frame), timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+        # Dosya sonu işareti
+        while self.running:
+            try:
+                self.frames.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                pass
@@ -6,15 +6,38 @@ Bu program webcam kullanarak gerçek zamanlı yüz tanıma ve duygu analizi yapa
 """
 
 import cv2
-from deepface import DeepFace
 import numpy as np
+from emotion_model import EmotionModel
+from camera_stream import CameraStream
+from face_detection import CascadeFaceDetector, IncrementalFaceDetector, available_backends
 
 class EmotionDetector:
-    def __init__(self):
-        """Duygu algılama sınıfını başlat"""
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
+    def __init__(self, precropped=False, detect_width=None,
+                 full_scan_interval=0, detector='haar'):
+        """
+        Duygu algılama sınıfını başlat
+        
+        Args:
+            precropped: Haar kesitlerini DeepFace'in yeniden tespitine sokmadan sınıflandır
+            detect_width: Yüz taraması bu genişliğe küçültülmüş görüntüde yapılır (None = tam çözünürlük)
+            full_scan_interval: Verilirse tam frame yalnızca bu kadar frame'de bir taranır, arada bilinen yüzlerin çevresine bakılır
+            detector: Yüz tespit yöntemi: 'haar', 'lbp' veya 'haar-profile'
+        """
+        # Yüz tespit yöntemi (tarama gerekirse detect_width'e küçültülmüş görüntüde yapılır)
+        self.face_detector = CascadeFaceDetector(detector, detect_width=detect_width)
+        
+        # Artımlı tespit: çoğu frame'de yalnızca bilinen yüzlerin çevresi taranır
+        self.roi_detector = None
+        if full_scan_interval:
+            self.roi_detector = IncrementalFaceDetector(
+                self.face_detector.detect,
+                full_scan_interval=full_scan_interval
+            )
+        self.emotion_model = EmotionModel(precropped=precropped)
+        
+        # Modeli baştan yükle ve ısıt (ilk frame ilk çağrı maliyetini ödemesin)
+        load_time, warmup_time = self.emotion_model.warmup()
+        print(f"Duygu modeli yüklendi: {load_time:.2f} sn, ısınma çıkarımı: {warmup_time:.2f} sn")
         
         # Duygu renkleri (BGR formatında)
         self.emotion_colors = {
@@ -51,74 +74,22 @@ class EmotionDetector:
         # Gri tonlamaya çevir (yüz tespiti için)
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
-        # Yüzleri tespit et
-        faces = self.face_cascade.detectMultiScale(
-            gray, 
-            scaleFactor=1.1, 
-            minNeighbors=5, 
-            minSize=(30, 30)
-        )
+        # Yüzleri tespit et (kutular tam çözünürlük koordinatlarında döner)
+        if self.roi_detector is not None:
+            faces = self.roi_detector.detect(gray)
+        else:
+            faces = self.face_detector.detect(gray)
+        
+        # Tüm yüz bölgelerini kes (çizimden önce) ve tek çağrıda analiz et
+        face_rois = [frame[y:y+h, x:x+w] for (x, y, w, h) in faces]
+        try:
+            results = self.emotion_model.analyze_batch(face_rois)
+        except Exception:
+            results = [None] * len(face_rois)
         
         # Her yüz için
-        for (x, y, w, h) in faces:
-            # Yüz bölgesini kes
-            face_roi = frame[y:y+h, x:x+w]
-            
-            try:
-                # DeepFace ile duygu analizi yap
-                result = DeepFace.analyze(
-                    face_roi, 
-                    actions=['emotion'],
-                    enforce_detection=False,
-                    silent=True
-                )
-                
-                # Sonuç liste ise ilk elemanı al
-                if isinstance(result, list):
-                    result = result[0]
-                
-                # Baskın duyguyu al
-                emotion = result['dominant_emotion']
-                
-                # Renk seç
-                color = self.emotion_colors.get(emotion, (255, 255, 255))
-                
-                # Türkçe duygu adı
-                emotion_tr = self.emotion_tr.get(emotion, emotion)
-                
-                # Yüzün etrafına dikdörtgen çiz
-                cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
-                
-                # Duygu etiketini yaz
-                label = f"{emotion_tr}"
-                cv2.putText(
-                    frame, 
-                    label, 
-                    (x, y-10), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 
-                    0.9, 
-                    color, 
-                    2
-                )
-                
-                # Duygu yüzdelerini göster (küçük yazıyla)
-                y_offset = y + h + 20
-                for emo, score in result['emotion'].items():
-                    if score > 5:  # Sadece %5'ten yüksek olanları göster
-                        emo_tr = self.emotion_tr.get(emo, emo)
-                        text = f"{emo_tr}: {score:.1f}%"
-                        cv2.putText(
-                            frame, 
-                            text, 
-                            (x, y_offset), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 
-                            0.4, 
-                            color, 
-                            1
-                        )
-                        y_offset += 15
-                        
-            except Exception as e:
+        for (x, y, w, h), result in zip(faces, results):
+            if result is None:
                 # Hata durumunda sadece yüzü işaretle
                 cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 255, 255), 2)
                 cv2.putText(
@@ -130,13 +101,55 @@ class EmotionDetector:
                     (255, 255, 255), 
                     1
                 )
+                continue
+            
+            # Baskın duyguyu al
+            emotion = result['dominant_emotion']
+            
+            # Renk seç
+            color = self.emotion_colors.get(emotion, (255, 255, 255))
+            
+            # Türkçe duygu adı
+            emotion_tr = self.emotion_tr.get(emotion, emotion)
+            
+            # Yüzün etrafına dikdörtgen çiz
+            cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
+            
+            # Duygu etiketini yaz
+            label = f"{emotion_tr}"
+            cv2.putText(
+                frame, 
+                label, 
+                (x, y-10), 
+                cv2.FONT_HERSHEY_SIMPLEX, 
+                0.9, 
+                color, 
+                2
+            )
+            
+            # Duygu yüzdelerini göster (küçük yazıyla)
+            y_offset = y + h + 20
+            for emo, score in result['emotion'].items():
+                if score > 5:  # Sadece %5'ten yüksek olanları göster
+                    emo_tr = self.emotion_tr.get(emo, emo)
+                    text = f"{emo_tr}: {score:.1f}%"
+                    cv2.putText(
+                        frame, 
+                        text, 
+                        (x, y_offset), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 
+                        0.4, 
+                        color, 
+                        1
+                    )
+                    y_offset += 15
         
         return frame
     
     def run(self):
         """Webcam'den görüntü al ve duygu analizi yap"""
-        # Webcam'i başlat
-        cap = cv2.VideoCapture(0)
+        # Webcam'i başlat (arka planda okunur, her zaman en yeni frame işlenir)
+        cap = CameraStream(0)
         
         if not cap.isOpened():
             print("Hata: Kamera açılamadı!")
@@ -178,12 +191,39 @@ class EmotionDetector:
         # Temizlik
         cap.release()
         cv2.destroyAllWindows()
-        print("\nProgram sonlandırıldı.")
+        print(f"\nAtlanan frame: {cap.dropped} / {cap.captured}")
+        det_stats = self.face_detector.stats()
+        if self.roi_detector is not None:
+            # Frame başına maliyet (bir frame'in tüm pencere taramaları birlikte)
+            det_stats.update(self.roi_detector.stats())
+        print(
+            f"Yüz tespiti ({det_stats['backend']}): ort. {det_stats['mean_ms']:.1f} ms, "
+            f"p99 {det_stats['p99_ms']:.1f} ms"
+        )
+        if self.roi_detector is not None:
+            scan_stats = self.roi_detector.stats()
+            print(
+                f"Tam tarama: {scan_stats['full_scans']}, pencere taraması: {scan_stats['roi_scans']}, "
+                f"taranmayan boş frame: {scan_stats['idle_frames']}, "
+                f"frame başına taranan alan: %{scan_stats['mean_scanned_area'] * 100:.0f}"
+            )
+        print("Program sonlandırıldı.")
 
 
 def main():
     """Ana program"""
-    detector = EmotionDetector()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Webcam ile yüz tanıma ve duygu analizi')
+    parser.add_argument(
+        '--detector',
+        choices=available_backends(),
+        default='haar',
+        help='Yüz tespit yöntemi; lbp, lbpcascade_frontalface_improved.xml cascades/ klasörüne konunca seçilebilir (varsayılan: haar)'
+    )
+    args = parser.parse_args()
+    
+    detector = EmotionDetector(detector=args.detector)
     detector.run()
 
 
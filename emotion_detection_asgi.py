@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yüz Tanıma ve Duygu Analizi - ASGI Sunucusu
+Web arayüzünün rotalarını asyncio ile sunar. Yayın izleyicileri thread tutmaz,
+yeni frame'i bekleyen coroutine'lerdir; engelleyen OpenCV ve model işleri
+thread havuzunda çalışır. uvicorn ile çalıştırılır.
+"""
+
+import asyncio
+import io
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.formparser import parse_form_data
+
+import emotion_detection_web as web
+from batch_pool import PoolFullError, PoolTimeoutError
+
+
+class AsyncFrameFeed:
+    def __init__(self, broadcaster):
+        """
+        FrameBroadcaster yayınlarını asyncio döngüsüne taşıyan köprü
+
+        Args:
+            broadcaster: Frame'leri üreten FrameBroadcaster
+        """
+        self.broadcaster = broadcaster
+        self.loop = None
+        self.event = None
+
+    def attach(self, loop):
+        """Döngüye bağlan ve yayın dinleyicisini kaydet"""
+        self.loop = loop
+        self.event = asyncio.Event()
+        self.broadcaster.add_listener(self._on_publish)
+
+    def _on_publish(self, frame_id):
+        # Üretici thread'den çağrılır; bekleyenler döngü içinde uyandırılır
+        self.loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        event, self.event = self.event, asyncio.Event()
+        event.set()
+
+    async def next_frame(self, client, timeout=5.0):
+        """
+        İzleyiciye henüz görmediği en yeni frame'i ver (thread bloklamadan)
+
+        Args:
+            client: broadcaster.subscribe() ile alınan izleyici
+            timeout: En fazla bekleme süresi (saniye)
+
+        Returns:
+            Frame; süre dolarsa None
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            frame_id, frame = self.broadcaster.latest()
+            if frame_id > client['last_id']:
+                if client['last_id']:
+                    client['skipped'] += frame_id - client['last_id'] - 1
+                client['last_id'] = frame_id
+                return frame
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self.event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+
+
+feed = AsyncFrameFeed(web.broadcaster)
+executor = None  # Engelleyen işler için thread havuzu (main() içinde kurulur)
+
+
+async def video_chunks():
+    client = web.broadcaster.subscribe('video')
+    try:
+        while True:
+            payload = await feed.next_frame(client)
+            if payload is None:
+                break
+            chunk = payload['video']
+            if chunk is None:
+                # İzleyici bu frame kodlandıktan sonra bağlandı
+                continue
+            web.broadcaster.record_sent(client, len(chunk))
+            yield chunk
+    finally:
+        web.broadcaster.unsubscribe(client)
+
+
+async def event_chunks():
+    client = web.broadcaster.subscribe('events')
+    try:
+        while True:
+            payload = await feed.next_frame(client)
+            if payload is None:
+                yield b": keepalive\n\n"
+                continue
+            chunk = payload['event']
+            web.broadcaster.record_sent(client, len(chunk))
+            yield chunk
+    finally:
+        web.broadcaster.unsubscribe(client)
+
+
+async def send_response(send, status, body, content_type):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', content_type.encode('latin-1')),
+            (b'content-length', str(len(body)).encode('latin-1'))
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send, data, status=200):
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    await send_response(send, status, body, 'application/json')
+
+
+async def send_stream(send, receive, chunks, content_type):
+    """Parçaları istemci bağlantıyı kapatana kadar akıt"""
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', content_type.encode('latin-1')),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no')
+        ]
+    })
+
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+                return
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        async for chunk in chunks:
+            if disconnected.is_set():
+                break
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+    finally:
+        watcher.cancel()
+        await chunks.aclose()
+        # Yanıtı düzgün kapat (istemci çoktan ayrıldıysa sunucu hata verebilir)
+        try:
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        except OSError:
+            pass
+
+
+async def read_body(receive, limit):
+    """İstek gövdesini oku (limit aşılırsa None)"""
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body.extend(message.get('body', b''))
+        if len(body) > limit:
+            return None
+        if not message.get('more_body'):
+            return bytes(body)
+
+
+def parse_uploads(body, content_type):
+    """Çok parçalı form ya da image/* gövdesinden (ad, bayt) listesi çıkar"""
+    if content_type.startswith('multipart/form-data'):
+        environ = {
+            'wsgi.input': io.BytesIO(body),
+            'CONTENT_TYPE': content_type,
+            'CONTENT_LENGTH': str(len(body)),
+            'REQUEST_METHOD': 'POST'
+        }
+        _, _, files = parse_form_data(environ)
+        return web.collect_uploads(files)
+    if content_type.startswith('image/'):
+        return [('body', body)]
+    return []
+
+
+async def analyze(receive, send, headers):
+    body = await read_body(receive, web.app.config['MAX_CONTENT_LENGTH'])
+    if body is None:
+        await send_json(send, {'error': 'İstek gövdesi çok büyük'}, 413)
+        return
+
+    loop = asyncio.get_running_loop()
+    content_type = headers.get(b'content-type', b'').decode('latin-1')
+    uploads = await loop.run_in_executor(executor, parse_uploads, body, content_type)
+    if not uploads:
+        await send_json(send, {'error': web.NO_IMAGE_ERROR}, 400)
+        return
+
+    start = time.perf_counter()
+    try:
+        # Yüz tespiti ve sonuç beklemesi engelleyicidir, döngü dışında çalışır
+        images = await loop.run_in_executor(executor, web.analyze_uploads, uploads)
+    except PoolFullError as e:
+        await send_json(send, {'error': str(e)}, 503)
+        return
+    except PoolTimeoutError as e:
+        await send_json(send, {'error': str(e)}, 504)
+        return
+
+    await send_json(send, {
+        'images': images,
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 1)
+    })
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            feed.attach(asyncio.get_running_loop())
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            web.broadcaster.stop()
+            if web.upload_pool is not None:
+                web.upload_pool.stop()
+            if executor is not None:
+                executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI uygulaması: /, /video_feed, /events, /stats, /metrics ve /analyze"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    path = scope['path']
+    method = scope['method']
+    headers = dict(scope['headers'])
+
+    if path == '/' and method == 'GET':
+        await send_response(send, 200, web.index().encode('utf-8'), 'text/html; charset=utf-8')
+    elif path == '/video_feed' and method == 'GET':
+        await send_stream(send, receive, video_chunks(),
+                          'multipart/x-mixed-replace; boundary=frame')
+    elif path == '/events' and method == 'GET':
+        await send_stream(send, receive, event_chunks(), 'text/event-stream')
+    elif path == '/stats' and method == 'GET':
+        await send_json(send, web.collect_stats())
+    elif path == '/metrics' and method == 'GET':
+        await send_response(send, 200, web.metrics.render().encode('utf-8'),
+                            'text/plain; version=0.0.4; charset=utf-8')
+    elif path == '/analyze' and method == 'POST':
+        await analyze(receive, send, headers)
+    else:
+        await send_json(send, {'error': 'Bulunamadı'}, 404)
+
+
+def main():
+    global executor
+
+    parser = web.create_parser('Web arayüzü ile duygu analizi (asyncio / ASGI)')
+    parser.add_argument(
+        '--executor-workers',
+        type=int,
+        default=8,
+        help='Engelleyen işler (yükleme analizi) için thread sayısı (varsayılan: 8)'
+    )
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("Hata: ASGI modu için uvicorn gerekli: pip install uvicorn")
+        sys.exit(1)
+
+    executor = ThreadPoolExecutor(max_workers=args.executor_workers,
+                                  thread_name_prefix="asgi-blocking")
+    web.configure(args)
+    web.print_banner("ASGI Sunucusu", args.port)
+
+    uvicorn.run(app, host='0.0.0.0', port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
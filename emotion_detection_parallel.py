@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yüz Tanıma ve Duygu Analizi - Paralel Video İşleme
+Kayıtlı bir videoyu zaman bölümlerine ayırır ve bölümleri süreç havuzunda
+işler; her işçi süreç kendi cascade'ini ve modelini yükler. İşaretlenmiş
+bölümler ve frame kayıtları kaynak sırasıyla birleştirilir. ffmpeg kuruluysa
+bölüm videoları yeniden kodlanmadan art arda eklenir.
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+worker_detector = None  # Her işçi sürecin kendi EmotionDetector'ı (init_worker kurar)
+
+
+def split_segments(total_frames, segments):
+    """
+    Frame aralığını eşit uzunlukta bölümlere ayır
+
+    Args:
+        total_frames: Videodaki frame sayısı
+        segments: İstenen bölüm sayısı
+
+    Returns:
+        (başlangıç, bitiş) frame aralıkları, bitiş hariç
+    """
+    segments = max(1, min(segments, total_frames))
+    bounds = [total_frames * i // segments for i in range(segments + 1)]
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def init_worker(options, threads):
+    """
+    İşçi süreci hazırla: thread sınırı, cascade ve model bir kez yüklenir
+
+    Args:
+        options: EmotionDetector seçenekleri (ör. precropped, detect_width, detector,
+            full_scan_interval, motion_threshold, profile)
+        threads: İşçi başına OpenCV/TensorFlow thread sayısı
+    """
+    global worker_detector
+
+    # İşçiler birbirinin çekirdeklerini kullanmasın
+    cv2.setNumThreads(threads)
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+
+    from emotion_detection_webcam import EmotionDetector
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        worker_detector = EmotionDetector(save_video=False, **options)
+
+
+def open_at(path, start):
+    """
+    Videoyu aç ve start numaralı frame'e konumlan
+
+    Konumlama tutmazsa (bazı kodlayıcılar ve anahtar frame'i seyrek dosyalar)
+    video baştan frame frame atlanarak ilerlenir. Bu durumda her bölüm kendi
+    başlangıcına kadar okunduğundan toplam okuma bölüm sayısıyla karesel büyür;
+    böyle dosyalar önce ffmpeg ile konumlanabilir bir biçime çevrilmeli ya da
+    az bölümle (--segments) işlenmelidir.
+    """
+    cap = cv2.VideoCapture(path)
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != start:
+            print(f"Uyarı: '{path}' içinde {start}. frame'e konumlanılamadı, baştan okunuyor")
+            cap.release()
+            cap = cv2.VideoCapture(path)
+            for _ in range(start):
+                if not cap.grab():
+                    break
+    return cap
+
+
+def process_segment(task):
+    """
+    Bir bölümü işle (işçi süreçte çalışır)
+
+    Args:
+        task: (bölüm no, video yolu, başlangıç, bitiş, fps, bölüm video dosyası ya da None,
+            bölüm videosunun kodlaması)
+
+    Returns:
+        Bölüm no, işlenen frame sayısı, frame kayıtları, işlem süresi; ölçüm
+        açıksa frame başına aşama süreleri, hareket kapısı açıksa kapı sayaçları
+    """
+    index, path, start, end, fps, segment_path, codec = task
+    start_time = time.perf_counter()
+    cap = open_at(path, start)
+
+    # Bölümler birbirinden bağımsızdır; önceki bölümün yüzleri ve kapı frame'i taşınmaz
+    worker_detector.reset_state()
+    gate = worker_detector.motion_gate
+    gate_before = gate.stats() if gate is not None else None
+    profiler = worker_detector.profiler
+
+    writer = None
+    records = []
+    stages = []
+    for frame_index in range(start, end):
+        profiler.begin()
+        ret, frame = cap.read()
+        profiler.lap('read')
+        if not ret:
+            break
+
+        processed_frame, emotions, analyzed = worker_detector.process_frame(frame, frame_index)
+
+        if segment_path:
+            if writer is None:
+                height, width = processed_frame.shape[:2]
+                writer = cv2.VideoWriter(segment_path, cv2.VideoWriter_fourcc(*codec),
+                                         fps, (width, height))
+            writer.write(processed_frame)
+            profiler.lap('write')
+        profiler.end_frame()
+        if profiler.enabled:
+            stages.append(profiler.last_frame)
+
+        records.append({
+            'frame': frame_index,
+            'time': round(frame_index / fps, 3),
+            'analyzed': analyzed,
+            'faces': worker_detector.last_faces
+        })
+
+    cap.release()
+    if writer is not None:
+        writer.release()
+
+    result = {
+        'index': index,
+        'frames': len(records),
+        'records': records,
+        'stages': stages,
+        'elapsed': time.perf_counter() - start_time,
+        'pid': os.getpid()
+    }
+    if gate is not None:
+        gate_after = gate.stats()
+        result['gate'] = {key: gate_after[key] - gate_before[key]
+                          for key in ('frames', 'skipped', 'refreshes')}
+    return result
+
+
+def append_video(writer, segment_path):
+    """Bölüm videosunun frame'lerini çözüp çıktı videosuna kodlayarak ekle"""
+    cap = cv2.VideoCapture(segment_path)
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        writer.write(frame)
+    cap.release()
+
+
+def concat_videos(ffmpeg, segment_paths, output_path, workdir):
+    """
+    Bölüm videolarını yeniden kodlamadan art arda ekle (ffmpeg concat demuxer)
+
+    Args:
+        ffmpeg: ffmpeg programının yolu
+        segment_paths: Sırasıyla bölüm video dosyaları (aynı kodlama ve boyutta)
+        output_path: Çıktı videosu
+        workdir: Bölüm listesinin yazılacağı dizin
+
+    Returns:
+        Birleştirme başarılıysa True
+    """
+    list_path = os.path.join(workdir, 'segments.txt')
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for path in segment_paths:
+            f.write(f"file '{os.path.abspath(path)}'\n")
+    result = subprocess.run(
+        [ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+         '-i', list_path, '-c', 'copy', output_path],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(f"Uyarı: ffmpeg ile birleştirme başarısız: {result.stderr.strip()}")
+        return False
+    return True
+
+
+def process_video(input_path, workers=None, segments=None, output_path=None, records_path=None,
+                  options=None, threads=1, verbose=True, log=None, duration=None, profiler=None):
+    """
+    Videoyu bölümlere ayırıp süreç havuzunda işle
+
+    Args:
+        input_path: İşlenecek video dosyası
+        workers: İşçi süreç sayısı (None = çekirdek sayısı)
+        segments: Bölüm sayısı (None = işçi başına 4 bölüm, yük dengesi için)
+        output_path: İşaretlenmiş videonun yazılacağı dosya (None = video yazılmaz)
+        records_path: Frame kayıtlarının yazılacağı JSONL dosyası (None = yazılmaz)
+        options: EmotionDetector seçenekleri (ör. precropped, detect_width, detector,
+            full_scan_interval, motion_threshold, profile)
+        threads: İşçi başına OpenCV/TensorFlow thread sayısı
+        verbose: Bölüm tamamlandıkça ilerleme yaz
+        log: Analiz edilen frame'lerin yüz başına satırlarının sırayla yazılacağı EmotionLog
+            (None = yazılmaz)
+        duration: Verilirse videonun yalnızca ilk bu kadar saniyesi işlenir
+        profiler: İşçilerin ölçtüğü aşama sürelerinin toplanacağı StageProfiler
+            (options içinde profile açıkken)
+
+    Returns:
+        Frame sayısı, süre, fps, işçi ve bölüm sayıları; hareket kapısı açıksa
+        toplam kapı sayaçları ('gate')
+    """
+    cap = cv2.VideoCapture(input_path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"'{input_path}' video dosyası açılamadı!")
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 20
+    frame_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    cap.release()
+    if total_frames <= 0:
+        raise ValueError(f"'{input_path}' dosyasının frame sayısı okunamadı!")
+    if duration:
+        total_frames = min(total_frames, max(1, int(duration * fps)))
+
+    workers = workers or os.cpu_count() or 1
+    ranges = split_segments(total_frames, segments or workers * 4)
+
+    # ffmpeg varsa bölümler çıktının kodlamasıyla (XVID) yazılır ve sonda yeniden
+    # kodlanmadan birleştirilir. Yoksa bölümler kayıpsız (FFV1) yazılır ve geldikçe
+    # çözülüp çıktıya bir kez kodlanır; bu adım tek süreçte ve frame sayısıyla orantılıdır.
+    ffmpeg = shutil.which('ffmpeg') if output_path else None
+    segment_codec = 'XVID' if ffmpeg else 'FFV1'
+    workdir = tempfile.mkdtemp(prefix='emotion_segments_') if output_path else None
+    tasks = [
+        (index, input_path, start, end, fps,
+         os.path.join(workdir, f"segment_{index:05d}.avi") if workdir else None, segment_codec)
+        for index, (start, end) in enumerate(ranges)
+    ]
+
+    writer = None
+    if output_path and not ffmpeg:
+        writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'XVID'), fps, frame_size)
+    segment_files = []
+    records_file = open(records_path, 'w', encoding='utf-8') if records_path else None
+
+    start_time = time.perf_counter()
+    frames = 0
+    gate = None
+    context = multiprocessing.get_context('spawn')
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=init_worker,
+                                 initargs=(options or {}, threads)) as executor:
+            # map sonuçları bölüm sırasıyla verir; önceki bölümler birleştirilirken
+            # sonrakiler işlenmeye devam eder
+            for task, result in zip(tasks, executor.map(process_segment, tasks)):
+                # Hiç frame okunamayan bölüm (ör. konumlanma hatası) dosya yazmaz
+                if output_path and os.path.exists(task[5]):
+                    if ffmpeg:
+                        segment_files.append(task[5])
+                    else:
+                        append_video(writer, task[5])
+                        os.remove(task[5])
+                if records_file is not None:
+                    for record in result['records']:
+                        records_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                if log is not None:
+                    for record in result['records']:
+                        if record['analyzed'] and record['faces']:
+                            log.write_frame(record['frame'], record['time'], record['faces'], input_path)
+                frames += result['frames']
+                if profiler is not None:
+                    for stages in result['stages']:
+                        profiler.add_frame(stages)
+                if 'gate' in result:
+                    gate = gate or {'frames': 0, 'skipped': 0, 'refreshes': 0}
+                    for key, value in result['gate'].items():
+                        gate[key] += value
+
+                if verbose:
+                    elapsed = time.perf_counter() - start_time
+                    print(f"Bölüm {result['index'] + 1}/{len(tasks)}: {result['frames']} frame, "
+                          f"{result['elapsed']:.1f} sn (süreç {result['pid']}), "
+                          f"toplam {frames}/{total_frames} frame, {frames / elapsed:.1f} fps")
+
+        if segment_files and not concat_videos(ffmpeg, segment_files, output_path, workdir):
+            # Kopyalama olmadıysa bölümler çözülüp yeniden kodlanır
+            writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'XVID'), fps, frame_size)
+            for segment_file in segment_files:
+                append_video(writer, segment_file)
+    finally:
+        if writer is not None:
+            writer.release()
+        if records_file is not None:
+            records_file.close()
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - start_time
+    summary = {
+        'frames': frames,
+        'elapsed': elapsed,
+        'fps': frames / elapsed if elapsed else 0.0,
+        'workers': workers,
+        'segments': len(tasks)
+    }
+    if gate is not None:
+        summary['gate'] = gate
+    return summary
@@ -6,26 +6,83 @@ Webcam görüntüsünü anlık olarak ekranda gösterir ve duygu analizi yapar.
 """
 
 import cv2
-from deepface import DeepFace
 import numpy as np
 import time
+from emotion_model import EmotionModel
+from face_tracker import FaceTracker
+from analysis_scheduler import AnalysisScheduler, CropChangeFilter, FrameTimeStats
+from inference_worker import InferenceWorker
+from camera_stream import CameraStream
+from face_detection import CascadeFaceDetector, IncrementalFaceDetector, available_backends
+from stage_profiler import StageProfiler
 
 class EmotionDetector:
-    def __init__(self, analyze_interval=30):
+    def __init__(self, analyze_interval=30, precropped=False, result_ttl=None,
+                 max_per_frame=1, async_inference=False, detect_width=None,
+                 full_scan_interval=0, detector='haar', profile=False, profile_report=None,
+                 show_hud=False, change_threshold=0, change_max_age=300):
         """
         Duygu algılama sınıfını başlat
         
         Args:
             analyze_interval: Kaç frame'de bir duygu analizi yapılacak (performans için)
+            precropped: Haar kesitlerini DeepFace'in yeniden tespitine sokmadan sınıflandır
+            result_ttl: Bir kişinin duygu sonucu kaç frame geçerli (varsayılan: analyze_interval)
+            max_per_frame: Bir frame'de en fazla kaç yüz analiz edilir (analizler aralığa yayılır)
+            async_inference: Duygu modelini arka plan thread'inde çalıştır (gösterim beklemez)
+            detect_width: Yüz taraması bu genişliğe küçültülmüş görüntüde yapılır (None = tam çözünürlük)
+            full_scan_interval: Verilirse tam frame yalnızca bu kadar frame'de bir taranır, arada bilinen yüzlerin çevresine bakılır
+            detector: Yüz tespit yöntemi: 'haar', 'lbp' veya 'haar-profile'
+            profile: Frame aşamalarının sürelerini ölç (çıkışta özet ve JSON rapor)
+            profile_report: Ölçüm raporu dosyası (None = profile_TARIH_SAAT.json)
+            show_hud: Ölçüm açıkken aşama sürelerini görüntü üzerinde göster
+            change_threshold: Verilirse yüz görüntüsü bu eşikten az değiştiğinde önceki sonuç kullanılır (0 = kapalı)
+            change_max_age: Değişmeyen yüz en geç bu kadar frame sonra yeniden analiz edilir
         """
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
+        # Yüz tespit yöntemi (tarama gerekirse detect_width'e küçültülmüş görüntüde yapılır)
+        self.face_detector = CascadeFaceDetector(detector, detect_width=detect_width)
+        
+        # Artımlı tespit: çoğu frame'de yalnızca bilinen yüzlerin çevresi taranır
+        self.roi_detector = None
+        if full_scan_interval:
+            self.roi_detector = IncrementalFaceDetector(
+                self.face_detector.detect,
+                full_scan_interval=full_scan_interval
+            )
         self.analyze_interval = analyze_interval
         self.frame_count = 0
+        self.result_lag = 0
+        self.emotion_model = EmotionModel(precropped=precropped)
+        
+        # Modeli baştan yükle ve ısıt (ilk frame ilk çağrı maliyetini ödemesin)
+        load_time, warmup_time = self.emotion_model.warmup()
+        print(f"Duygu modeli yüklendi: {load_time:.2f} sn, ısınma çıkarımı: {warmup_time:.2f} sn")
+        
+        # Yüz takipçisi: analiz sonuçları kişiye bağlı saklanır
+        self.tracker = FaceTracker(
+            result_ttl=result_ttl or analyze_interval,
+            baseline_interval=analyze_interval
+        )
+        
+        # Analizleri tek frame'de patlatmak yerine aralığa yay
+        self.scheduler = AnalysisScheduler(self.tracker, max_per_frame=max_per_frame)
+        self.frame_times = FrameTimeStats()
+        
+        # Kıpırdamayan yüzlerin yeniden analizini atla
+        self.change_filter = None
+        if change_threshold:
+            self.change_filter = CropChangeFilter(change_threshold, max_age=change_max_age)
+        
+        # Aşama süreleri (--profile); kapalıyken ölçüm çağrıları hemen döner
+        self.profiler = StageProfiler(enabled=profile)
+        self.profile_report = profile_report
+        self.show_hud = show_hud
         
-        # Son analiz sonuçlarını sakla
-        self.last_emotions = {}
+        # Arka plan çıkarım işçisi (sonuçlar hazır oldukça ekrana yansır)
+        self.worker = None
+        if async_inference:
+            self.worker = InferenceWorker(self.emotion_model)
+            self.worker.start()
         
         # Duygu renkleri (BGR formatında)
         self.emotion_colors = {
@@ -49,6 +106,30 @@ class EmotionDetector:
             'neutral': 'Notr'
         }
     
+    def store_result(self, track, result, frame_index):
+        """
+        Analiz sonucunu kişinin takibine yaz
+        
+        Args:
+            track: Sonucun ait olduğu Track
+            result: EmotionModel sonucu (başarısızsa None)
+            frame_index: Sonucun hesaplandığı frame numarası
+        """
+        if result is not None:
+            # Son analiz sonucunu sakla
+            track.emotion = {
+                'dominant': result['dominant_emotion'],
+                'scores': result['emotion'],
+                'frame': frame_index
+            }
+        elif track.emotion is None:
+            # Hata durumunda
+            track.emotion = {
+                'dominant': 'neutral',
+                'scores': {},
+                'frame': frame_index
+            }
+    
     def detect_emotions(self, frame):
         """
         Görüntüdeki yüzleri tespit et ve duygularını analiz et
@@ -61,56 +142,80 @@ class EmotionDetector:
         """
         # Gri tonlamaya çevir (yüz tespiti için)
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.profiler.lap('cvtColor')
         
-        # Yüzleri tespit et
-        faces = self.face_cascade.detectMultiScale(
-            gray, 
-            scaleFactor=1.1, 
-            minNeighbors=5, 
-            minSize=(30, 30)
-        )
+        # Yüzleri tespit et (kutular tam çözünürlük koordinatlarında döner)
+        if self.roi_detector is not None:
+            faces = self.roi_detector.detect(gray)
+        else:
+            faces = self.face_detector.detect(gray)
+        self.profiler.lap('detect')
         
-        # Her yüz için
-        for face_idx, (x, y, w, h) in enumerate(faces):
-            face_key = f"face_{face_idx}"
+        # Yüzleri kalıcı takip numaralarına eşleştir
+        tracks = self.tracker.update(faces, self.frame_count)
+        
+        # Yeni veya sonucu süresi dolmuş yüzlerden bu frame'in bütçesi kadarını analiz et
+        pending = self.scheduler.select(tracks, self.frame_count)
+        
+        # Görüntüsü değişmeyen yüzlerin önceki sonucu geçerli sayılır
+        if self.change_filter is not None and pending:
+            pending = self.change_filter.filter(pending, frame, self.frame_count)
+        self.profiler.lap('track')
+        
+        if self.worker is not None:
+            # Arka planda biten analizleri ilgili kişilere uygula
+            for frame_index, track_id, result in self.worker.collect():
+                track = self.tracker.get(track_id)
+                if track is not None:
+                    self.store_result(track, result, frame_index)
             
-            # Performans için sadece belirli aralıklarla analiz yap
-            should_analyze = (self.frame_count % self.analyze_interval == 0)
+            if pending:
+                # Kesitler kopyalanır çünkü frame birazdan üzerine çizilecek
+                jobs = []
+                for track in pending:
+                    x, y, w, h = track.box
+                    jobs.append((track.track_id, frame[y:y+h, x:x+w].copy()))
+                self.profiler.lap('crop')
+                if self.worker.submit(self.frame_count, jobs):
+                    for track in pending:
+                        track.analyzed_frame = self.frame_count
+                        if self.change_filter is not None:
+                            self.change_filter.record(track, frame, self.frame_count)
+                    self.tracker.record_analyses(len(pending))
+            # Arka plan modunda yalnızca sonuç toplama ve kuyruğa verme süresi
+            self.profiler.lap('inference')
+        
+        elif pending:
+            # Yüz bölgelerini kes ve tek çağrıda analiz et
+            face_rois = [frame[y:y+h, x:x+w] for (x, y, w, h) in (t.box for t in pending)]
+            self.profiler.lap('crop')
+            try:
+                results = self.emotion_model.analyze_batch(face_rois)
+            except Exception:
+                results = [None] * len(face_rois)
             
-            if should_analyze:
-                # Yüz bölgesini kes
-                face_roi = frame[y:y+h, x:x+w]
-                
-                try:
-                    # DeepFace ile duygu analizi yap
-                    result = DeepFace.analyze(
-                        face_roi, 
-                        actions=['emotion'],
-                        enforce_detection=False,
-                        silent=True
-                    )
-                    
-                    # Sonuç liste ise ilk elemanı al
-                    if isinstance(result, list):
-                        result = result[0]
-                    
-                    # Son analiz sonucunu sakla
-                    self.last_emotions[face_key] = {
-                        'dominant': result['dominant_emotion'],
-                        'scores': result['emotion']
-                    }
-                    
-                except Exception as e:
-                    # Hata durumunda
-                    if face_key not in self.last_emotions:
-                        self.last_emotions[face_key] = {
-                            'dominant': 'neutral',
-                            'scores': {}
-                        }
+            for track, result in zip(pending, results):
+                track.analyzed_frame = self.frame_count
+                self.store_result(track, result, self.frame_count)
+                if self.change_filter is not None:
+                    self.change_filter.record(track, frame, self.frame_count)
+            
+            self.tracker.record_analyses(len(pending))
+            self.profiler.lap('inference')
+        
+        # Ekrandaki en eski sonucun kaç frame önce hesaplandığı
+        self.result_lag = max(
+            (self.frame_count - t.emotion['frame'] for t in tracks if t.emotion),
+            default=0
+        )
+        
+        # Her yüz için
+        for track in tracks:
+            x, y, w, h = track.box
             
             # Mevcut veya son bilinen duyguyu göster
-            if face_key in self.last_emotions:
-                emotion_data = self.last_emotions[face_key]
+            if track.emotion is not None:
+                emotion_data = track.emotion
                 emotion = emotion_data['dominant']
                 scores = emotion_data['scores']
                 
@@ -123,8 +228,8 @@ class EmotionDetector:
                 # Yüzün etrafına dikdörtgen çiz
                 cv2.rectangle(frame, (x, y), (x+w, y+h), color, 3)
                 
-                # Duygu etiketini yaz
-                label = f"{emotion_tr}"
+                # Duygu etiketini yaz (takip numarası ile)
+                label = f"#{track.track_id} {emotion_tr}"
                 cv2.putText(
                     frame, 
                     label, 
@@ -170,12 +275,13 @@ class EmotionDetector:
                     2
                 )
         
+        self.profiler.lap('overlay')
         return frame
     
     def run(self):
         """Webcam'den görüntü al ve gerçek zamanlı duygu analizi yap"""
-        # Webcam'i başlat
-        cap = cv2.VideoCapture(0)
+        # Webcam'i başlat (arka planda okunur, her zaman en yeni frame işlenir)
+        cap = CameraStream(0)
         
         if not cap.isOpened():
             print("Hata: Kamera açılamadı!")
@@ -200,12 +306,16 @@ class EmotionDetector:
         
         while True:
             # Frame oku
+            self.profiler.begin()
             ret, frame = cap.read()
+            self.profiler.lap('read')
             
             if not ret:
                 print("Hata: Frame okunamadı!")
                 break
             
+            frame_start = time.perf_counter()
+            
             # FPS hesapla
             fps_frame_count += 1
             if fps_frame_count >= 30:
@@ -218,13 +328,14 @@ class EmotionDetector:
             processed_frame = self.detect_emotions(frame)
             
             # Bilgi paneli oluştur
-            info_height = 80
+            info_height = 110
             info_panel = np.zeros((info_height, frame.shape[1], 3), dtype=np.uint8)
             
             # FPS ve frame sayısı
             cv2.putText(
                 info_panel,
-                f"FPS: {fps:.1f}  |  Frame: {self.frame_count}",
+                f"FPS: {fps:.1f}  |  Frame: {self.frame_count}  |  "
+                f"p99: {self.frame_times.percentile(99):.0f} ms",
                 (10, 30),
                 cv2.FONT_HERSHEY_SIMPLEX,
                 0.7,
@@ -232,11 +343,23 @@ class EmotionDetector:
                 2
             )
             
+            # Analiz sonuçlarının tazeliği
+            queue_text = f"  |  Kuyruk: {self.worker.pending()}" if self.worker else ""
+            cv2.putText(
+                info_panel,
+                f"Sonuc gecikmesi: {self.result_lag} frame{queue_text}",
+                (10, 60),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.6,
+                (200, 200, 200),
+                1
+            )
+            
             # Kullanım talimatı
             cv2.putText(
                 info_panel,
                 "Cikmak icin 'q' veya ESC tusuna basin",
-                (10, 60),
+                (10, 90),
                 cv2.FONT_HERSHEY_SIMPLEX,
                 0.6,
                 (200, 200, 200),
@@ -245,6 +368,9 @@ class EmotionDetector:
             
             # Bilgi panelini frame'e ekle
             combined = np.vstack([info_panel, processed_frame])
+            if self.show_hud:
+                self.profiler.draw_hud(combined, (combined.shape[1] - 180, info_height + 10))
+            self.profiler.lap('overlay')
             
             # Sonucu göster
             cv2.imshow(window_name, combined)
@@ -253,15 +379,56 @@ class EmotionDetector:
             
             # Klavye kontrolü
             key = cv2.waitKey(1) & 0xFF
+            self.frame_times.add(time.perf_counter() - frame_start)
+            self.profiler.lap('display')
+            self.profiler.end_frame()
             if key == ord('q') or key == 27:  # 'q' veya ESC
                 break
         
         # Temizlik
+        if self.worker is not None:
+            self.worker.stop()
         cap.release()
         cv2.destroyAllWindows()
         print()
         print("=" * 60)
         print(f"Program sonlandırıldı. Toplam {self.frame_count} frame işlendi.")
+        print(f"Atlanan eski frame: {cap.dropped} / {cap.captured}")
+        det_stats = self.face_detector.stats()
+        if self.roi_detector is not None:
+            # Frame başına maliyet (bir frame'in tüm pencere taramaları birlikte)
+            det_stats.update(self.roi_detector.stats())
+        print(
+            f"Yüz tespiti ({det_stats['backend']}): ort. {det_stats['mean_ms']:.1f} ms, "
+            f"p99 {det_stats['p99_ms']:.1f} ms"
+        )
+        if self.roi_detector is not None:
+            scan_stats = self.roi_detector.stats()
+            print(
+                f"Tam tarama: {scan_stats['full_scans']}, pencere taraması: {scan_stats['roi_scans']}, "
+                f"taranmayan boş frame: {scan_stats['idle_frames']}, "
+                f"frame başına taranan alan: %{scan_stats['mean_scanned_area'] * 100:.0f}"
+            )
+        stats = self.tracker.stats()
+        print(
+            f"Duygu analizi: {stats['analyses']} (eski şema: {stats['baseline_analyses']}), "
+            f"saniyede {stats['saved_per_second']:.1f} analiz tasarrufu"
+        )
+        if self.change_filter is not None:
+            change_stats = self.change_filter.stats()
+            print(
+                f"Değişmeyen yüz: {change_stats['reused']} sonuç yeniden kullanıldı / "
+                f"{change_stats['checks']} karşılaştırma (%{change_stats['hit_rate'] * 100:.1f})"
+            )
+        frame_stats = self.frame_times.summary()
+        print(
+            f"Frame süresi: p50 {frame_stats['p50_ms']:.1f} ms, "
+            f"p99 {frame_stats['p99_ms']:.1f} ms, en yüksek {frame_stats['max_ms']:.1f} ms"
+        )
+        self.profiler.print_summary()
+        report_path = self.profiler.save_report(self.profile_report)
+        if report_path:
+            print(f"Ölçüm raporu kaydedildi: {report_path}")
         print("=" * 60)
 
 
@@ -278,10 +445,91 @@ def main():
         default=30,
         help='Kaç frame\'de bir duygu analizi yapılacak (varsayılan: 30)'
     )
+    parser.add_argument(
+        '--ttl',
+        type=int,
+        default=None,
+        help='Bir kişinin duygu sonucu kaç frame geçerli (varsayılan: --interval)'
+    )
+    parser.add_argument(
+        '--budget',
+        type=int,
+        default=1,
+        help='Bir frame\'de en fazla kaç yüz analiz edilecek (varsayılan: 1)'
+    )
+    parser.add_argument(
+        '--sync',
+        action='store_true',
+        help='Duygu analizini gösterim döngüsü içinde (bekleyerek) yap'
+    )
+    parser.add_argument(
+        '--detect-width',
+        type=int,
+        default=None,
+        help='Yüz taraması için frame\'in küçültüleceği genişlik, ör. 640 (varsayılan: tam çözünürlük)'
+    )
+    parser.add_argument(
+        '--detector',
+        choices=available_backends(),
+        default='haar',
+        help='Yüz tespit yöntemi; lbp, lbpcascade_frontalface_improved.xml cascades/ klasörüne konunca seçilebilir (varsayılan: haar)'
+    )
+    parser.add_argument(
+        '--full-scan-every',
+        type=int,
+        default=0,
+        help='Tam frame taramasını N frame\'de bir yap, arada yalnızca bilinen yüzlerin çevresini tara (varsayılan: 0 = her frame tam tarama)'
+    )
+    parser.add_argument(
+        '--precropped',
+        action='store_true',
+        help='Yüz kesitlerini yeniden tespit etmeden doğrudan sınıflandır'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Frame aşamalarının sürelerini ölç; çıkışta p50/p95/p99 özeti yaz ve JSON rapor kaydet'
+    )
+    parser.add_argument(
+        '--profile-report',
+        default=None,
+        help='Ölçüm raporu dosyası (varsayılan: profile_TARIH_SAAT.json)'
+    )
+    parser.add_argument(
+        '--hud',
+        action='store_true',
+        help='--profile ile birlikte aşama sürelerini görüntü üzerinde göster'
+    )
+    parser.add_argument(
+        '--change-threshold',
+        type=float,
+        default=0,
+        help='Yüz görüntüsü bu eşikten az değiştiyse (ortalama piksel farkı, ör. 2.5) önceki duygu sonucunu kullan (varsayılan: 0 = kapalı)'
+    )
+    parser.add_argument(
+        '--change-max-age',
+        type=int,
+        default=300,
+        help='Değişmeyen yüzü en geç kaç frame sonra yeniden analiz et (varsayılan: 300)'
+    )
     
     args = parser.parse_args()
     
-    detector = EmotionDetector(analyze_interval=args.interval)
+    detector = EmotionDetector(
+        analyze_interval=args.interval,
+        precropped=args.precropped,
+        result_ttl=args.ttl,
+        max_per_frame=args.budget,
+        async_inference=not args.sync,
+        detect_width=args.detect_width,
+        full_scan_interval=args.full_scan_every,
+        detector=args.detector,
+        profile=args.profile,
+        profile_report=args.profile_report,
+        show_hud=args.hud,
+        change_threshold=args.change_threshold,
+        change_max_age=args.change_max_age
+    )
     detector.run()
 
 
@@ -5,23 +5,70 @@ Yüz Tanıma ve Duygu Analizi - Web Arayüzü
 Tarayıcıda gerçek zamanlı webcam görüntüsü ile duygu analizi
 """
 
-from flask import Flask, render_template, Response, jsonify
+from flask import Flask, render_template, Response, jsonify, request
 import cv2
-from deepface import DeepFace
 import numpy as np
 import time
 import json
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from emotion_model import EmotionModel
+from face_tracker import FaceTracker
+from analysis_scheduler import AnalysisScheduler, CropChangeFilter, FrameTimeStats
+from camera_stream import CameraStream
+from frame_broadcaster import FrameBroadcaster
+from batch_pool import MicroBatchPool, PoolFullError, PoolTimeoutError
+from face_detection import CascadeFaceDetector, IncrementalFaceDetector, available_backends
+from metrics import MetricsRegistry
 
 app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024  # Yükleme başına en fazla 32 MB
+
+# /metrics için Prometheus metrikleri (kayıt maliyeti gözlem başına bir kilit + ikili arama)
+metrics = MetricsRegistry()
+stage_seconds = metrics.histogram(
+    'emotion_stage_seconds',
+    'Frame işleme aşamalarının süresi (capture, grayscale, detect, inference, draw, encode)',
+    labelnames=('stage',)
+)
+frames_total = metrics.counter('emotion_frames_total', 'İşlenen kamera frame sayısı')
+faces_total = metrics.counter('emotion_faces_total', 'Tespit edilen yüz sayısı')
+analyses_total = metrics.counter(
+    'emotion_analyses_total', 'Modele gönderilen yüz sayısı', labelnames=('source',)
+)
+errors_total = metrics.counter(
+    'emotion_errors_total', 'Analiz edilemeyen yüzler ve okunamayan frame/görüntüler',
+    labelnames=('stage',)
+)
 
 class EmotionDetector:
-    def __init__(self):
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
+    def __init__(self, precropped=False, detect_width=None, full_scan_interval=0,
+                 detector='haar', change_threshold=0, change_max_age=300):
+        # Yüz tespit yöntemi; tarama detect_width genişliğinde yapılır (None = tam çözünürlük)
+        self.face_detector = CascadeFaceDetector(detector, detect_width=detect_width)
+        # full_scan_interval verilirse arada yalnızca bilinen yüzlerin çevresi taranır
+        self.roi_detector = None
+        if full_scan_interval:
+            self.roi_detector = IncrementalFaceDetector(
+                self.face_detector.detect, full_scan_interval=full_scan_interval
+            )
         self.frame_count = 0
-        self.last_emotions = {}
         self.analyze_interval = 15  # Her 15 frame'de bir analiz
+        # Analiz sonuçları takip numarasına (kişiye) bağlı saklanır
+        self.tracker = FaceTracker(result_ttl=self.analyze_interval)
+        # Analizler aralığa yayılır (frame başına en fazla 1 yüz + gerekirse fazlası)
+        self.scheduler = AnalysisScheduler(self.tracker, max_per_frame=1)
+        self.frame_times = FrameTimeStats()
+        # change_threshold verilirse görüntüsü değişmeyen yüzlerin önceki sonucu kullanılır
+        self.change_filter = None
+        if change_threshold:
+            self.change_filter = CropChangeFilter(change_threshold, max_age=change_max_age)
+        self.last_faces = []  # Son frame'in kutuları ve duyguları (sonuç akışı için)
+        self.emotion_model = EmotionModel(precropped=precropped)
+        
+        # Modeli baştan yükle ve ısıt (ilk frame ilk çağrı maliyetini ödemesin)
+        load_time, warmup_time = self.emotion_model.warmup()
+        print(f"Duygu modeli yüklendi: {load_time:.2f} sn, ısınma çıkarımı: {warmup_time:.2f} sn")
         
         # Duygu renkleri (BGR formatında)
         self.emotion_colors = {
@@ -46,40 +93,57 @@ class EmotionDetector:
         }
     
     def detect_emotions(self, frame):
+        stage_start = time.perf_counter()
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(
-            gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
-        )
+        now = time.perf_counter()
+        stage_seconds.observe(now - stage_start, ('grayscale',))
+        
+        stage_start = now
+        if self.roi_detector is not None:
+            faces = self.roi_detector.detect(gray)
+        else:
+            faces = self.face_detector.detect(gray)
+        now = time.perf_counter()
+        stage_seconds.observe(now - stage_start, ('detect',))
+        faces_total.inc(len(faces))
         
-        for face_idx, (x, y, w, h) in enumerate(faces):
-            face_key = f"face_{face_idx}"
-            should_analyze = (self.frame_count % self.analyze_interval == 0)
+        tracks = self.tracker.update(faces, self.frame_count)
+        pending = self.scheduler.select(tracks, self.frame_count)
+        if self.change_filter is not None and pending:
+            pending = self.change_filter.filter(pending, frame, self.frame_count)
+        if pending:
+            stage_start = time.perf_counter()
+            face_rois = [frame[y:y+h, x:x+w] for (x, y, w, h) in (t.box for t in pending)]
+            try:
+                results = self.emotion_model.analyze_batch(face_rois)
+            except Exception:
+                results = [None] * len(face_rois)
+            stage_seconds.observe(time.perf_counter() - stage_start, ('inference',))
+            analyses_total.inc(len(pending), ('camera',))
+            errors_total.inc(sum(1 for result in results if result is None), ('inference',))
             
-            if should_analyze:
-                face_roi = frame[y:y+h, x:x+w]
-                try:
-                    result = DeepFace.analyze(
-                        face_roi, 
-                        actions=['emotion'],
-                        enforce_detection=False,
-                        silent=True
-                    )
-                    if isinstance(result, list):
-                        result = result[0]
-                    
-                    self.last_emotions[face_key] = {
+            for track, result in zip(pending, results):
+                track.analyzed_frame = self.frame_count
+                if self.change_filter is not None:
+                    self.change_filter.record(track, frame, self.frame_count)
+                if result is not None:
+                    track.emotion = {
                         'dominant': result['dominant_emotion'],
                         'scores': result['emotion']
                     }
-                except:
-                    if face_key not in self.last_emotions:
-                        self.last_emotions[face_key] = {
-                            'dominant': 'neutral',
-                            'scores': {}
-                        }
+                elif track.emotion is None:
+                    track.emotion = {
+                        'dominant': 'neutral',
+                        'scores': {}
+                    }
+            self.tracker.record_analyses(len(pending))
+        
+        stage_start = time.perf_counter()
+        for track in tracks:
+            x, y, w, h = track.box
             
-            if face_key in self.last_emotions:
-                emotion_data = self.last_emotions[face_key]
+            if track.emotion is not None:
+                emotion_data = track.emotion
                 emotion = emotion_data['dominant']
                 scores = emotion_data['scores']
                 
@@ -87,7 +151,7 @@ class EmotionDetector:
                 emotion_tr = self.emotion_tr.get(emotion, emotion)
                 
                 cv2.rectangle(frame, (x, y), (x+w, y+h), color, 3)
-                cv2.putText(frame, emotion_tr, (x, y-10), 
+                cv2.putText(frame, f"#{track.track_id} {emotion_tr}", (x, y-10), 
                            cv2.FONT_HERSHEY_SIMPLEX, 1.2, color, 3)
                 
                 if scores:
@@ -105,32 +169,120 @@ class EmotionDetector:
                 cv2.putText(frame, "Analiz ediliyor...", (x, y-10), 
                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         
+        stage_seconds.observe(time.perf_counter() - stage_start, ('draw',))
+        
+        self.last_faces = [
+            {
+                'id': track.track_id,
+                'box': [int(v) for v in track.box],
+                'emotion': track.emotion['dominant'] if track.emotion else None,
+                'scores': {
+                    emo: round(float(score), 1)
+                    for emo, score in (track.emotion['scores'] if track.emotion else {}).items()
+                }
+            }
+            for track in tracks
+        ]
+        
         return frame
 
-detector = EmotionDetector()
+detector = None  # main() içinde seçilen tespit yöntemiyle oluşturulur
 camera = None
+camera_source = 0   # Kamera numarası veya video dosyası (yük testi için)
+jpeg_quality = 95   # Yayın JPEG kalitesi (0-100)
+output_scale = 1.0  # Yayın çözünürlüğü ölçeği (analiz tam çözünürlükte yapılır)
+
+# Yüklenen görüntüler için ayrı yüz tespiti ve mikro toplu analiz havuzu (main() içinde kurulur)
+upload_detector = None
+upload_detector_lock = threading.Lock()  # Cascade tespiti thread'ler arasında paylaşılmaz
+upload_pool = None
+upload_timeout = 30.0  # Bir isteğin tüm yüzlerinin sonuçları için en fazla bekleme (saniye)
 
 def get_camera():
     global camera
     if camera is None or not camera.isOpened():
-        camera = cv2.VideoCapture(0)
+        if camera is not None:
+            camera.release()
+        camera = CameraStream(camera_source)
     return camera
 
+def process_next_frame():
+    """Kameradan bir frame oku ve analiz et (yalnızca yayın thread'inde çalışır)"""
+    camera = get_camera()
+    stage_start = time.perf_counter()
+    success, frame = camera.read()
+    if not success:
+        errors_total.inc(1, ('capture',))
+        return False, None
+    stage_seconds.observe(time.perf_counter() - stage_start, ('capture',))
+    
+    frame_start = time.perf_counter()
+    frames_total.inc()
+    detector.frame_count += 1
+    processed_frame = detector.detect_emotions(frame)
+    detector.frame_times.add(time.perf_counter() - frame_start)
+    
+    # Video ve sonuç mesajı bir kez hazırlanır; video izleyicisi yoksa JPEG kodlanmaz
+    return True, {
+        'video': encode_frame(processed_frame) if broadcaster.viewer_count('video') else None,
+        'event': encode_event(detector.frame_count, detector.last_faces)
+    }
+
+def encode_frame(frame):
+    """İşlenmiş frame'i yayın ölçeğine küçült ve bir kez JPEG'e çevir"""
+    stage_start = time.perf_counter()
+    if output_scale != 1.0:
+        frame = cv2.resize(frame, None, fx=output_scale, fy=output_scale,
+                           interpolation=cv2.INTER_AREA)
+    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+    stage_seconds.observe(time.perf_counter() - stage_start, ('encode',))
+    return (b'--frame\r\n'
+            b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+
+def encode_event(frame_id, faces):
+    """Frame sonuçlarını bir kez Server-Sent Events mesajına çevir"""
+    message = {
+        'frame': frame_id,
+        'timestamp': round(time.time(), 3),
+        'faces': faces
+    }
+    data = json.dumps(message, separators=(',', ':'), ensure_ascii=False)
+    return f"id: {frame_id}\ndata: {data}\n\n".encode('utf-8')
+
+# Tüm izleyiciler aynı kodlanmış yayını paylaşır (izleyici başına analiz/kodlama yapılmaz)
+broadcaster = FrameBroadcaster(process_next_frame)
+
 def generate_frames():
-    while True:
-        camera = get_camera()
-        success, frame = camera.read()
-        if not success:
-            break
-        
-        detector.frame_count += 1
-        processed_frame = detector.detect_emotions(frame)
-        
-        ret, buffer = cv2.imencode('.jpg', processed_frame)
-        frame = buffer.tobytes()
-        
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+    client = broadcaster.subscribe('video')
+    try:
+        while True:
+            # Yavaş izleyici birikmiş frame'leri değil, her zaman en yenisini alır
+            payload = broadcaster.next_frame(client)
+            if payload is None:
+                break
+            chunk = payload['video']
+            if chunk is None:
+                # İzleyici bu frame kodlandıktan sonra bağlandı
+                continue
+            broadcaster.record_sent(client, len(chunk))
+            yield chunk
+    finally:
+        broadcaster.unsubscribe(client)
+
+def generate_events():
+    client = broadcaster.subscribe('events')
+    try:
+        while True:
+            payload = broadcaster.next_frame(client)
+            if payload is None:
+                # Frame gelmiyorsa bağlantıyı açık tutmak için yorum satırı gönder
+                yield b": keepalive\n\n"
+                continue
+            chunk = payload['event']
+            broadcaster.record_sent(client, len(chunk))
+            yield chunk
+    finally:
+        broadcaster.unsubscribe(client)
 
 @app.route('/')
 def index():
@@ -307,26 +459,295 @@ def video_feed():
     return Response(generate_frames(),
                     mimetype='multipart/x-mixed-replace; boundary=frame')
 
-def main():
+@app.route('/events')
+def events():
+    """Yalnızca kutular ve duygu skorları: frame başına bir JSON mesajı (SSE)"""
+    return Response(generate_events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def analyze_uploads(uploads):
+    """
+    Yüklenen görüntülerdeki yüzleri tespit et ve havuzda toplu analiz et
+    
+    Args:
+        uploads: (ad, görüntü baytları) listesi
+        
+    Returns:
+        Her görüntü için yüz kutuları ve duygu sonuçları
+        (kuyruk doluysa PoolFullError, upload_timeout içinde bitmezse PoolTimeoutError)
+    """
+    images = []
+    jobs = []
+    for name, data in uploads:
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR) if data else None
+        if image is None:
+            errors_total.inc(1, ('upload_decode',))
+            images.append({'name': name, 'error': 'Görüntü çözülemedi'})
+            continue
+        
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        with upload_detector_lock:
+            faces = upload_detector.detect(gray)
+        entry = {'name': name, 'width': image.shape[1], 'height': image.shape[0], 'faces': []}
+        images.append(entry)
+        for (x, y, w, h) in faces:
+            jobs.append((entry, (int(x), int(y), int(w), int(h)), image[y:y+h, x:x+w]))
+    
+    # Tüm görüntülerin yüzleri birlikte kuyruğa girer, diğer isteklerle aynı toplu işe düşebilir
+    futures = upload_pool.submit([face_roi for _, _, face_roi in jobs])
+    analyses_total.inc(len(futures), ('upload',))
+    deadline = time.perf_counter() + upload_timeout
+    for (entry, box, _), future in zip(jobs, futures):
+        try:
+            result = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+        except FutureTimeoutError:
+            # Henüz başlamamış yüzler kuyrukta boşuna işlenmesin
+            for pending in futures:
+                pending.cancel()
+            errors_total.inc(1, ('upload_timeout',))
+            raise PoolTimeoutError("Analiz zaman aşımına uğradı")
+        except Exception:
+            # İşçide beklenmeyen hata: yüz analiz edilemedi sayılır
+            result = None
+        if result is None:
+            errors_total.inc(1, ('upload_inference',))
+        entry['faces'].append({
+            'box': list(box),
+            'emotion': result['dominant_emotion'] if result else None,
+            'scores': {
+                emo: round(float(score), 2)
+                for emo, score in (result['emotion'] if result else {}).items()
+            }
+        })
+    return images
+
+NO_IMAGE_ERROR = "Görüntü bulunamadı ('images' alanı veya image/* gövdesi bekleniyor)"
+
+def collect_uploads(files):
+    """Çok parçalı formdaki 'images' (veya 'image') dosyalarını (ad, bayt) listesine çevir"""
+    files = files.getlist('images') + files.getlist('image')
+    return [(f.filename or f'image_{i}', f.read()) for i, f in enumerate(files, 1)]
+
+@app.route('/analyze', methods=['POST'])
+def analyze():
+    """Bir veya birden fazla görüntüde yüz başına duygu analizi (JSON)"""
+    uploads = collect_uploads(request.files)
+    if not uploads and request.content_type and request.content_type.startswith('image/'):
+        uploads = [('body', request.get_data())]
+    if not uploads:
+        return jsonify({'error': NO_IMAGE_ERROR}), 400
+    
+    start = time.perf_counter()
+    try:
+        images = analyze_uploads(uploads)
+    except PoolFullError as e:
+        return jsonify({'error': str(e)}), 503
+    except PoolTimeoutError as e:
+        return jsonify({'error': str(e)}), 504
+    
+    return jsonify({
+        'images': images,
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 1)
+    })
+
+def collect_stats():
+    """Takip, tespit, yayın, API ve kamera istatistikleri"""
+    stats = detector.tracker.stats()
+    stats['deferred_analyses'] = detector.scheduler.deferred
+    stats['frame_time'] = detector.frame_times.summary()
+    stats['detector'] = detector.face_detector.stats()
+    if detector.roi_detector is not None:
+        stats['detection'] = detector.roi_detector.stats()
+        # Tespit süresi çağrı başına değil frame başına raporlansın
+        stats['detector'].update({key: stats['detection'][key]
+                                  for key in ('frames', 'p50_ms', 'p99_ms', 'max_ms', 'mean_ms')})
+    if detector.change_filter is not None:
+        stats['unchanged_faces'] = detector.change_filter.stats()
+    stats['stream'] = {
+        'viewers': broadcaster.viewers,
+        'video_viewers': broadcaster.viewer_count('video'),
+        'event_subscribers': broadcaster.viewer_count('events'),
+        'published': broadcaster.published,
+        'failures': broadcaster.failures,
+        'last_error': broadcaster.last_error,
+        'jpeg_quality': jpeg_quality,
+        'output_scale': output_scale,
+        'clients': broadcaster.client_stats()
+    }
+    if upload_pool is not None:
+        stats['upload_api'] = upload_pool.stats()
+    if camera is not None:
+        stats['camera'] = {'captured': camera.captured, 'dropped': camera.dropped}
+    return stats
+
+@app.route('/stats')
+def stats():
+    return jsonify(collect_stats())
+
+metrics.callback(
+    'emotion_clients', 'Bağlı izleyici sayısı',
+    lambda: {(kind,): broadcaster.viewer_count(kind) for kind in ('video', 'events')},
+    labelnames=('kind',)
+)
+metrics.callback(
+    'emotion_camera_dropped_frames_total', 'İşlenemeden yenisiyle değişen kamera frame sayısı',
+    lambda: camera.dropped if camera is not None else None, kind='counter'
+)
+metrics.callback(
+    'emotion_reused_results_total', 'Yüz görüntüsü değişmediği için çıkarım yapılmadan kullanılan sonuç sayısı',
+    lambda: detector.change_filter.reused if detector is not None and detector.change_filter is not None else None,
+    kind='counter'
+)
+metrics.callback(
+    'emotion_upload_queue_depth', 'Yükleme API kuyruğunda bekleyen yüz sayısı',
+    lambda: upload_pool.requests.qsize() if upload_pool is not None else None
+)
+metrics.callback(
+    'emotion_upload_batches_total', 'Yükleme API model çağrısı sayısı',
+    lambda: upload_pool.batches if upload_pool is not None else None, kind='counter'
+)
+metrics.callback(
+    'emotion_upload_rejected_total', 'Kuyruk dolu olduğu için reddedilen yüz sayısı',
+    lambda: upload_pool.rejected if upload_pool is not None else None, kind='counter'
+)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metin biçiminde metrikler"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+def create_parser(description):
+    """Web sunucularının (thread'li ve ASGI) ortak komut satırı seçenekleri"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=5000,
+        help='Sunucu portu (varsayılan: 5000)'
+    )
+    parser.add_argument(
+        '--source',
+        default='0',
+        help='Kamera numarası veya video dosyası; video bitince baştan oynatılır (varsayılan: 0)'
+    )
+    parser.add_argument(
+        '--detector',
+        choices=available_backends(),
+        default='haar',
+        help='Yüz tespit yöntemi; lbp, lbpcascade_frontalface_improved.xml cascades/ klasörüne konunca seçilebilir (varsayılan: haar)'
+    )
+    parser.add_argument(
+        '--precropped',
+        action='store_true',
+        help='Yüz kesitlerini yeniden tespit etmeden doğrudan sınıflandır (kamera ve yükleme API\'si)'
+    )
+    parser.add_argument(
+        '--detect-width',
+        type=int,
+        default=None,
+        help='Yüz taraması için frame\'in küçültüleceği genişlik, ör. 640 (varsayılan: tam çözünürlük)'
+    )
+    parser.add_argument(
+        '--full-scan-every',
+        type=int,
+        default=0,
+        help='Tam frame taramasını N frame\'de bir yap, arada yalnızca bilinen yüzlerin çevresini tara (varsayılan: 0 = her frame tam tarama)'
+    )
+    parser.add_argument(
+        '--jpeg-quality',
+        type=int,
+        default=95,
+        help='Yayın JPEG kalitesi, 0-100 (varsayılan: 95)'
+    )
+    parser.add_argument(
+        '--output-scale',
+        type=float,
+        default=1.0,
+        help='Yayın çözünürlüğü ölçeği, ör. 0.5 (varsayılan: 1.0)'
+    )
+    parser.add_argument(
+        '--api-workers',
+        type=int,
+        default=1,
+        help='Görüntü yükleme API\'si için analiz işçisi sayısı (varsayılan: 1)'
+    )
+    parser.add_argument(
+        '--api-max-batch',
+        type=int,
+        default=16,
+        help='Bir model çağrısında toplanacak en fazla yüz (varsayılan: 16)'
+    )
+    parser.add_argument(
+        '--api-max-wait-ms',
+        type=float,
+        default=10.0,
+        help='Toplu işi doldurmak için en fazla bekleme süresi, ms (varsayılan: 10)'
+    )
+    parser.add_argument(
+        '--change-threshold',
+        type=float,
+        default=0,
+        help='Yüz görüntüsü bu eşikten az değiştiyse (ortalama piksel farkı, ör. 2.5) önceki duygu sonucunu kullan (varsayılan: 0 = kapalı)'
+    )
+    parser.add_argument(
+        '--change-max-age',
+        type=int,
+        default=300,
+        help='Değişmeyen yüzü en geç kaç frame sonra yeniden analiz et (varsayılan: 300)'
+    )
+    return parser
+
+def configure(args):
+    """Komut satırı seçeneklerine göre dedektörü, yayını ve API havuzunu kur"""
+    global detector, camera_source, jpeg_quality, output_scale, upload_detector, upload_pool
+    
+    camera_source = int(args.source) if args.source.isdigit() else args.source
+    jpeg_quality = args.jpeg_quality
+    output_scale = args.output_scale
+    detector = EmotionDetector(precropped=args.precropped, detect_width=args.detect_width,
+                               full_scan_interval=args.full_scan_every, detector=args.detector,
+                               change_threshold=args.change_threshold,
+                               change_max_age=args.change_max_age)
+    
+    # Havuz kameranın modelini paylaşır; kesit modu ona da uygulanır
+    upload_detector = CascadeFaceDetector(args.detector, detect_width=args.detect_width)
+    upload_pool = MicroBatchPool(
+        detector.emotion_model,
+        workers=args.api_workers,
+        max_batch=args.api_max_batch,
+        max_wait=args.api_max_wait_ms / 1000
+    )
+    upload_pool.start()
+
+def print_banner(title, port):
     print("\n" + "=" * 60)
-    print("🎭 Yüz Tanıma ve Duygu Analizi - Web Arayüzü")
+    print(f"🎭 Yüz Tanıma ve Duygu Analizi - {title}")
     print("=" * 60)
     print()
     print("Sunucu başlatılıyor...")
     print()
     print("Tarayıcınızda şu adresi açın:")
     print()
-    print("    👉 http://localhost:5000")
+    print(f"    👉 http://localhost:{port}")
     print()
     print("veya")
     print()
-    print("    👉 http://127.0.0.1:5000")
+    print(f"    👉 http://127.0.0.1:{port}")
+    print()
+    print(f"Görüntü analizi API'si: POST http://localhost:{port}/analyze ('images' alanında bir veya birden fazla dosya)")
     print()
     print("Durdurmak için Ctrl+C yapın")
     print("=" * 60)
     print()
+
+def main():
+    args = create_parser('Web arayüzü ile duygu analizi').parse_args()
+    configure(args)
+    print_banner("Web Arayüzü", args.port)
     
-    app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
+    app.run(host='0.0.0.0', port=args.port, debug=False, threaded=True)
 
 if __name__ == '__main__':
     main()
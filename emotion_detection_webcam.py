@@ -6,19 +6,78 @@ Headless sistemler için (GUI olmadan çalışır, video dosyasına kaydeder)
 """
 
 import cv2
-from deepface import DeepFace
 import numpy as np
+from emotion_model import EmotionModel
+from camera_stream import CameraStream, VideoFileStream
+from face_detection import CascadeFaceDetector, IncrementalFaceDetector, available_backends
+from stage_profiler import StageProfiler
+from motion_gate import MotionGate
+from emotion_log import EmotionLog, close_log
+from collections import Counter
 from datetime import datetime
 import os
+import sys
+import time
+
+
+def format_duration(seconds):
+    """Saniyeyi SS:DD:ss biçimine çevir"""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
 
 class EmotionDetector:
-    def __init__(self, save_video=True):
-        """Duygu algılama sınıfını başlat"""
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
+    def __init__(self, save_video=True, precropped=False, detect_width=None,
+                 full_scan_interval=0, detector='haar', profile=False, profile_report=None,
+                 show_hud=False, motion_threshold=0, motion_refresh=300, static_frames='annotate'):
+        """
+        Duygu algılama sınıfını başlat
+        
+        Args:
+            save_video: İşlenmiş videoyu dosyaya kaydet
+            precropped: Haar kesitlerini DeepFace'in yeniden tespitine sokmadan sınıflandır
+            detect_width: Yüz taraması bu genişliğe küçültülmüş görüntüde yapılır (None = tam çözünürlük)
+            full_scan_interval: Verilirse tam frame yalnızca bu kadar frame'de bir taranır, arada bilinen yüzlerin çevresine bakılır
+            detector: Yüz tespit yöntemi: 'haar', 'lbp' veya 'haar-profile'
+            profile: Frame aşamalarının sürelerini ölç (çıkışta özet ve JSON rapor)
+            profile_report: Ölçüm raporu dosyası (None = profile_TARIH_SAAT.json)
+            show_hud: Ölçüm açıkken aşama sürelerini kaydedilen videoya çiz
+            motion_threshold: Verilirse değişen piksel oranı (%) bunun altında kalan durağan frame'lerde tespit ve analiz atlanır (0 = kapalı)
+            motion_refresh: Hareket olmasa da en geç bu kadar frame'de bir analiz yap (0 = hiçbir zaman)
+            static_frames: Atlanan frame'lere son sonuçları çiz ('annotate') ya da ham yaz ('raw')
+        """
+        # Yüz tespit yöntemi (tarama gerekirse detect_width'e küçültülmüş görüntüde yapılır)
+        self.face_detector = CascadeFaceDetector(detector, detect_width=detect_width)
         self.save_video = save_video
         
+        # Artımlı tespit: çoğu frame'de yalnızca bilinen yüzlerin çevresi taranır
+        self.roi_detector = None
+        if full_scan_interval:
+            self.roi_detector = IncrementalFaceDetector(
+                self.face_detector.detect,
+                full_scan_interval=full_scan_interval
+            )
+        self.emotion_model = EmotionModel(precropped=precropped)
+        self.last_faces = []  # Son frame'in kutuları ve duygu skorları (frame kayıtları için)
+        
+        # Hareket kapısı: sahne durağanken tespit ve çıkarım yapılmaz
+        self.motion_gate = None
+        if motion_threshold:
+            self.motion_gate = MotionGate(
+                min_changed=motion_threshold / 100,
+                refresh_interval=motion_refresh
+            )
+        self.static_frames = static_frames
+        
+        # Aşama süreleri (--profile); kapalıyken ölçüm çağrıları hemen döner
+        self.profiler = StageProfiler(enabled=profile)
+        self.profile_report = profile_report
+        self.show_hud = show_hud
+        
+        # Modeli baştan yükle ve ısıt (ilk frame ilk çağrı maliyetini ödemesin)
+        load_time, warmup_time = self.emotion_model.warmup()
+        print(f"Duygu modeli yüklendi: {load_time:.2f} sn, ısınma çıkarımı: {warmup_time:.2f} sn")
+        
         # Duygu renkleri (BGR formatında)
         self.emotion_colors = {
             'happy': (0, 255, 0),      # Yeşil
@@ -53,78 +112,59 @@ class EmotionDetector:
         """
         # Gri tonlamaya çevir (yüz tespiti için)
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.profiler.lap('cvtColor')
         
-        # Yüzleri tespit et
-        faces = self.face_cascade.detectMultiScale(
-            gray, 
-            scaleFactor=1.1, 
-            minNeighbors=5, 
-            minSize=(30, 30)
-        )
+        # Yüzleri tespit et (kutular tam çözünürlük koordinatlarında döner)
+        if self.roi_detector is not None:
+            faces = self.roi_detector.detect(gray)
+        else:
+            faces = self.face_detector.detect(gray)
+        self.profiler.lap('detect')
+        
+        # Tüm yüz bölgelerini kes (çizimden önce) ve tek çağrıda analiz et
+        face_rois = [frame[y:y+h, x:x+w] for (x, y, w, h) in faces]
+        self.profiler.lap('crop')
+        try:
+            results = self.emotion_model.analyze_batch(face_rois)
+        except Exception:
+            results = [None] * len(face_rois)
+        self.profiler.lap('inference')
         
+        self.last_faces = [
+            {
+                'box': [int(x), int(y), int(w), int(h)],
+                'emotion': result['dominant_emotion'] if result else None,
+                'scores': {
+                    emo: round(float(score), 2)
+                    for emo, score in (result['emotion'] if result else {}).items()
+                }
+            }
+            for (x, y, w, h), result in zip(faces, results)
+        ]
+        
+        # Kutuları, duygu etiketlerini ve yüzdeleri çiz
+        emotions_detected = self.draw_faces(frame, self.last_faces)
+        
+        self.profiler.lap('overlay')
+        return frame, emotions_detected
+    
+    def draw_faces(self, frame, faces):
+        """
+        Yüz kutularını, duygu etiketlerini ve yüzdeleri frame'e çiz
+        
+        Args:
+            frame: Üzerine çizilecek görüntü
+            faces: last_faces biçiminde yüz listesi (box, emotion, scores)
+            
+        Returns:
+            Duygusu belirlenen yüzlerin baskın duyguları
+        """
         emotions_detected = []
         
         # Her yüz için
-        for (x, y, w, h) in faces:
-            # Yüz bölgesini kes
-            face_roi = frame[y:y+h, x:x+w]
-            
-            try:
-                # DeepFace ile duygu analizi yap
-                result = DeepFace.analyze(
-                    face_roi, 
-                    actions=['emotion'],
-                    enforce_detection=False,
-                    silent=True
-                )
-                
-                # Sonuç liste ise ilk elemanı al
-                if isinstance(result, list):
-                    result = result[0]
-                
-                # Baskın duyguyu al
-                emotion = result['dominant_emotion']
-                emotions_detected.append(emotion)
-                
-                # Renk seç
-                color = self.emotion_colors.get(emotion, (255, 255, 255))
-                
-                # Türkçe duygu adı
-                emotion_tr = self.emotion_tr.get(emotion, emotion)
-                
-                # Yüzün etrafına dikdörtgen çiz
-                cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
-                
-                # Duygu etiketini yaz
-                label = f"{emotion_tr}"
-                cv2.putText(
-                    frame, 
-                    label, 
-                    (x, y-10), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 
-                    0.9, 
-                    color, 
-                    2
-                )
-                
-                # Duygu yüzdelerini göster (küçük yazıyla)
-                y_offset = y + h + 20
-                for emo, score in result['emotion'].items():
-                    if score > 5:  # Sadece %5'ten yüksek olanları göster
-                        emo_tr = self.emotion_tr.get(emo, emo)
-                        text = f"{emo_tr}: {score:.1f}%"
-                        cv2.putText(
-                            frame, 
-                            text, 
-                            (x, y_offset), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 
-                            0.4, 
-                            color, 
-                            1
-                        )
-                        y_offset += 15
-                        
-            except Exception as e:
+        for face in faces:
+            x, y, w, h = face['box']
+            if face['emotion'] is None:
                 # Hata durumunda sadece yüzü işaretle
                 cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 255, 255), 2)
                 cv2.putText(
@@ -136,33 +176,153 @@ class EmotionDetector:
                     (255, 255, 255), 
                     1
                 )
+                continue
+            
+            # Baskın duyguyu al
+            emotion = face['emotion']
+            emotions_detected.append(emotion)
+            
+            # Renk seç
+            color = self.emotion_colors.get(emotion, (255, 255, 255))
+            
+            # Türkçe duygu adı
+            emotion_tr = self.emotion_tr.get(emotion, emotion)
+            
+            # Yüzün etrafına dikdörtgen çiz
+            cv2.rectangle(frame, (x, y), (x+w, y+h), color, 2)
+            
+            # Duygu etiketini yaz
+            label = f"{emotion_tr}"
+            cv2.putText(
+                frame, 
+                label, 
+                (x, y-10), 
+                cv2.FONT_HERSHEY_SIMPLEX, 
+                0.9, 
+                color, 
+                2
+            )
+            
+            # Duygu yüzdelerini göster (küçük yazıyla)
+            y_offset = y + h + 20
+            for emo, score in face['scores'].items():
+                if score > 5:  # Sadece %5'ten yüksek olanları göster
+                    emo_tr = self.emotion_tr.get(emo, emo)
+                    text = f"{emo_tr}: {score:.1f}%"
+                    cv2.putText(
+                        frame, 
+                        text, 
+                        (x, y_offset), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 
+                        0.4, 
+                        color, 
+                        1
+                    )
+                    y_offset += 15
         
-        return frame, emotions_detected
+        return emotions_detected
     
-    def run(self, duration=30):
+    def process_frame(self, frame, frame_index):
         """
-        Webcam'den görüntü al ve duygu analizi yap
+        Frame'i hareket kapısından geçir, gerekirse analiz et ve bilgileri çiz
         
         Args:
-            duration: Kayıt süresi (saniye), None ise sınırsız
+            frame: OpenCV görüntü frame'i
+            frame_index: Frame numarası (görüntüye yazılır)
+            
+        Returns:
+            İşlenmiş frame, duygular ve frame'in analiz edilip edilmediği
+        """
+        # Hareket yoksa tespit ve analizi atla
+        moved = self.motion_gate is None or self.motion_gate.check(frame)
+        if self.motion_gate is not None:
+            self.profiler.lap('motion')
+        
+        if moved:
+            # Duygu analizi yap
+            processed_frame, emotions = self.detect_emotions(frame)
+            
+            # Bilgi ekle
+            self.draw_info(processed_frame, frame_index, len(emotions))
+        elif self.static_frames == 'annotate':
+            # Sahne değişmedi: son sonuçları bu frame'e yeniden çiz
+            processed_frame = frame
+            emotions = self.draw_faces(processed_frame, self.last_faces)
+            self.draw_info(processed_frame, frame_index, len(emotions))
+        else:
+            processed_frame, emotions = frame, []
+        
+        if self.show_hud:
+            self.profiler.draw_hud(processed_frame, (processed_frame.shape[1] - 180, 10))
+        self.profiler.lap('overlay')
+        return processed_frame, emotions, moved
+    
+    def reset_state(self):
+        """Önceki frame'lerden kalan durumu unut (ör. videonun başka bir yerine atlanınca)"""
+        self.last_faces = []
+        if self.roi_detector is not None:
+            self.roi_detector.reset()
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
+    
+    def draw_info(self, frame, frame_index, face_count):
+        """Frame numarasını ve yüz sayısını sol üst köşeye yaz"""
+        cv2.putText(
+            frame,
+            f"Frame: {frame_index} | Yuzler: {face_count}",
+            (10, 30),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.7,
+            (255, 255, 255),
+            2
+        )
+    
+    def run(self, duration=30, input_path=None, progress_interval=5.0, log=None,
+            print_frames=False):
+        """
+        Webcam'den (ya da video dosyasından) görüntü al ve duygu analizi yap
+        
+        Args:
+            duration: Kayıt süresi (saniye), None ise sınırsız (dosyada tamamı)
+            input_path: Verilirse kamera yerine bu video dosyası işlenir
+            progress_interval: İlerleme ve duygu özetinin kaç saniyede bir yazılacağı (0 = yazılmaz)
+            log: Analiz edilen frame'lerin yüz başına yazılacağı EmotionLog (None = kayıt yok)
+            print_frames: Yüz bulunan her frame'in duygularını ayrıca konsola yaz
+            
+        Returns:
+            Kaynak açılıp duygu kaydı hatasız kapandıysa True
         """
-        # Webcam'i başlat
-        cap = cv2.VideoCapture(0)
+        if input_path:
+            # Dosya, işlemenin yetişebildiği hızda okunur; hiçbir frame atlanmaz
+            cap = VideoFileStream(input_path)
+        else:
+            # Webcam'i başlat (arka planda okunur, her zaman en yeni frame işlenir)
+            cap = CameraStream(0)
         
         if not cap.isOpened():
-            print("Hata: Kamera açılamadı!")
-            return
+            if input_path:
+                print(f"Hata: '{input_path}' video dosyası açılamadı!")
+            else:
+                print("Hata: Kamera açılamadı!")
+            if log is not None:
+                close_log(log)
+            return False
         
-        # Video özellikleri
+        # Video özellikleri (dosyada kaynağın FPS'i aynen korunur)
         frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fps = int(cap.get(cv2.CAP_PROP_FPS)) or 20
+        if input_path:
+            fps = cap.get(cv2.CAP_PROP_FPS) or 20
+        else:
+            fps = int(cap.get(cv2.CAP_PROP_FPS)) or 20
         
         # Video kaydedici
         video_writer = None
         if self.save_video:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_filename = f"emotion_analysis_{timestamp}.avi"
+            if input_path:
+                output_filename = os.path.splitext(os.path.basename(input_path))[0] + "_analyzed.avi"
             fourcc = cv2.VideoWriter_fourcc(*'XVID')
             video_writer = cv2.VideoWriter(
                 output_filename, 
@@ -175,49 +335,96 @@ class EmotionDetector:
         print("Duygu Analizi Sistemi Başlatıldı")
         if duration:
             print(f"Kayıt süresi: {duration} saniye")
+        
+        log_ok = True
+        frame_count = 0
+        timeline_frames = 0  # Atlananlar dahil kameranın ürettiği frame sayısı
+        max_frames = int(duration * fps) if duration else None
+        
+        # Dosyada ilerleme ve kalan süre için toplam frame sayısı
+        total_frames = 0
+        if input_path:
+            total_frames = cap.frame_count()
+            if max_frames:
+                total_frames = min(total_frames, max_frames) if total_frames else max_frames
+            print(f"Kaynak: {input_path} ({frame_width}x{frame_height}, {fps:.2f} FPS, "
+                  f"{total_frames or '?'} frame)")
         print("Durdurmak için Ctrl+C yapın")
         print("-" * 50)
         
-        frame_count = 0
-        max_frames = duration * fps if duration else None
+        start_time = time.perf_counter()
+        next_progress = start_time + progress_interval if progress_interval else None
+        source = input_path or 'camera'
+        period_emotions = Counter()  # Son özetten bu yana tespit edilen duygular
         
         try:
             while True:
                 # Frame oku
+                self.profiler.begin()
                 ret, frame = cap.read()
+                self.profiler.lap('read')
                 
                 if not ret:
-                    print("Hata: Frame okunamadı!")
+                    if input_path:
+                        print("\nVideo dosyasının sonuna gelindi.")
+                    else:
+                        print("Hata: Frame okunamadı!")
                     break
                 
-                # Duygu analizi yap
-                processed_frame, emotions = self.detect_emotions(frame)
+                # Duygu analizi yap (hareket yoksa atlanır)
+                processed_frame, emotions, moved = self.process_frame(frame, frame_count)
                 
-                # Bilgi ekle
-                info_text = f"Frame: {frame_count} | Yuzler: {len(emotions)}"
-                cv2.putText(
-                    processed_frame,
-                    info_text,
-                    (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    (255, 255, 255),
-                    2
-                )
-                
-                # Duygular tespit edildiyse yazdır
-                if emotions:
-                    emotions_str = ", ".join([self.emotion_tr.get(e, e) for e in emotions])
-                    print(f"Frame {frame_count}: {emotions_str}")
+                if moved:
+                    # Kaynak videodaki (kamerada başlangıçtan bu yana) zaman
+                    if input_path:
+                        seconds = cap.position_ms / 1000
+                    else:
+                        seconds = time.perf_counter() - start_time
+                    if log is not None and self.last_faces:
+                        log.write_frame(frame_count, seconds, self.last_faces, source)
+                    period_emotions.update(emotions)
+                    
+                    # İstenirse yeni tespit edilen duyguları frame frame yazdır
+                    if print_frames and emotions:
+                        emotions_str = ", ".join([self.emotion_tr.get(e, e) for e in emotions])
+                        print(f"Frame {frame_count} ({seconds:.2f} sn): {emotions_str}")
                 
-                # Video dosyasına kaydet
+                # Video dosyasına kaydet; atlanan frame'lerin yerine de aynı
+                # frame yazılır ki video gerçek zamanlı oynasın
+                repeat = 1 + cap.last_skipped
                 if video_writer:
-                    video_writer.write(processed_frame)
+                    for _ in range(repeat):
+                        video_writer.write(processed_frame)
+                self.profiler.lap('write')
+                self.profiler.end_frame()
                 
                 frame_count += 1
+                timeline_frames += repeat
+                
+                # Düzenli aralıklarla ilerleme (dosyada kalan süre) ve duygu özeti
+                now = time.perf_counter()
+                if next_progress is not None and now >= next_progress:
+                    next_progress = now + progress_interval
+                    rate = frame_count / (now - start_time)
+                    progress = f"İlerleme: {frame_count}"
+                    if total_frames:
+                        remaining = max(total_frames - frame_count, 0) / rate
+                        progress += (f"/{total_frames} frame (%{frame_count / total_frames * 100:.1f}), "
+                                     f"{rate:.1f} fps, kalan ~{format_duration(remaining)}")
+                    else:
+                        progress += f" frame, {rate:.1f} fps"
+                    if self.motion_gate is not None:
+                        progress += f", durağan atlanan %{self.motion_gate.stats()['skip_rate'] * 100:.0f}"
+                    if period_emotions:
+                        progress += " | " + ", ".join(
+                            f"{self.emotion_tr.get(e, e)} {count}"
+                            for e, count in period_emotions.most_common()
+                        )
+                    print(progress)
+                    period_emotions.clear()
                 
                 # Süre kontrolü
-                if max_frames and frame_count >= max_frames:
+                if max_frames and timeline_frames >= max_frames:
                     print(f"\n{duration} saniye tamamlandı!")
                     break
                 
@@ -229,9 +436,121 @@ class EmotionDetector:
             cap.release()
             if video_writer:
                 video_writer.release()
+            elapsed = time.perf_counter() - start_time
             print(f"\nToplam {frame_count} frame işlendi.")
+            if input_path:
+                source_seconds = frame_count / fps
+                print(
+                    f"Kaynak süresi: {format_duration(source_seconds)}, işlem süresi: "
+                    f"{format_duration(elapsed)} ({frame_count / max(elapsed, 1e-6):.1f} fps, "
+                    f"gerçek zamanın {source_seconds / max(elapsed, 1e-6):.2f} katı)"
+                )
+            else:
+                print(f"Atlanan eski frame: {cap.dropped} / {cap.captured}")
+            det_stats = self.face_detector.stats()
+            if self.roi_detector is not None:
+                # Frame başına maliyet (bir frame'in tüm pencere taramaları birlikte)
+                det_stats.update(self.roi_detector.stats())
+            print(
+                f"Yüz tespiti ({det_stats['backend']}): ort. {det_stats['mean_ms']:.1f} ms, "
+                f"p99 {det_stats['p99_ms']:.1f} ms"
+            )
+            if self.roi_detector is not None:
+                scan_stats = self.roi_detector.stats()
+                print(
+                    f"Tam tarama: {scan_stats['full_scans']}, pencere taraması: {scan_stats['roi_scans']}, "
+                    f"taranmayan boş frame: {scan_stats['idle_frames']}, "
+                    f"frame başına taranan alan: %{scan_stats['mean_scanned_area'] * 100:.0f}"
+                )
+            if self.motion_gate is not None:
+                gate_stats = self.motion_gate.stats()
+                print(
+                    f"Hareket kapısı: {gate_stats['skipped']}/{gate_stats['frames']} durağan frame "
+                    f"atlandı (%{gate_stats['skip_rate'] * 100:.1f}), "
+                    f"yenileme analizi: {gate_stats['refreshes']}"
+                )
+            self.profiler.print_summary()
+            report_path = self.profiler.save_report(self.profile_report)
+            if report_path:
+                print(f"Ölçüm raporu kaydedildi: {report_path}")
+            if log is not None:
+                log_ok = close_log(log)
             if self.save_video:
                 print(f"Video kaydedildi: {output_filename}")
+        
+        return log_ok
+
+
+def open_log(args):
+    """--log verildiyse duygu kaydını aç (Parquet için pyarrow yoksa hata yazıp çık)"""
+    if not args.log:
+        return None
+    try:
+        return EmotionLog(
+            args.log,
+            rotate_bytes=int(args.log_rotate_mb * 1024 * 1024),
+            rotate_seconds=args.log_rotate_minutes * 60
+        )
+    except ImportError as e:
+        print(f"Hata: {e}")
+        sys.exit(1)
+
+
+def run_parallel(args):
+    """Video dosyasını süreç havuzunda bölüm bölüm işle; duygu kaydı hatasız kapandıysa True döndür"""
+    from emotion_detection_parallel import process_video
+    
+    name = os.path.splitext(os.path.basename(args.input))[0]
+    output_path = None if args.no_save else f"{name}_analyzed.avi"
+    records_path = f"{name}_frames.jsonl"
+    log = open_log(args)
+    # İşçilerin ölçtüğü aşama süreleri burada tek özette toplanır
+    profiler = StageProfiler(enabled=args.profile)
+    
+    print(f"Paralel işleme: {args.input}, {args.workers} işçi süreç")
+    if args.duration:
+        print(f"İşlenecek süre: {args.duration} saniye")
+    print("-" * 50)
+    summary = process_video(
+        args.input,
+        workers=args.workers,
+        segments=args.segments,
+        output_path=output_path,
+        records_path=records_path,
+        log=log,
+        duration=args.duration or None,
+        profiler=profiler,
+        verbose=args.summary_interval != 0,
+        options={
+            'precropped': args.precropped,
+            'detect_width': args.detect_width,
+            'detector': args.detector,
+            'full_scan_interval': args.full_scan_every,
+            'profile': args.profile,
+            'show_hud': args.hud,
+            'motion_threshold': args.motion_threshold,
+            'motion_refresh': args.motion_refresh,
+            'static_frames': args.static_frames
+        }
+    )
+    print(f"\nToplam {summary['frames']} frame, {summary['segments']} bölüm, "
+          f"{summary['elapsed']:.1f} sn ({summary['fps']:.1f} fps)")
+    if 'gate' in summary:
+        gate = summary['gate']
+        print(
+            f"Hareket kapısı: {gate['skipped']}/{gate['frames']} durağan frame atlandı "
+            f"(%{gate['skipped'] / max(gate['frames'], 1) * 100:.1f}), "
+            f"yenileme analizi: {gate['refreshes']}"
+        )
+    if output_path:
+        print(f"Video kaydedildi: {output_path}")
+    print(f"Frame kayıtları: {records_path}")
+    log_ok = close_log(log) if log is not None else True
+    profiler.print_summary()
+    report_path = profiler.save_report(args.profile_report)
+    if report_path:
+        print(f"Ölçüm raporu kaydedildi: {report_path}")
+    return log_ok
 
 
 def main():
@@ -242,22 +561,150 @@ def main():
     parser.add_argument(
         '--duration', 
         type=int, 
-        default=30,
-        help='Kayıt süresi (saniye), 0 = sınırsız (varsayılan: 30)'
+        default=None,
+        help='Kayıt süresi (saniye), 0 = sınırsız (varsayılan: kamerada 30, --input ile tüm dosya)'
+    )
+    parser.add_argument(
+        '--input',
+        default=None,
+        help='Kamera yerine bu video dosyasını gerçek zamandan hızlı işle, ör. kayit.mp4'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='--input ile videoyu bölümlere ayırıp bu kadar süreçte paralel işle; --duration verilmezse dosyanın tamamı işlenir (varsayılan: 1)'
+    )
+    parser.add_argument(
+        '--segments',
+        type=int,
+        default=None,
+        help='--workers ile videonun bölüneceği parça sayısı (varsayılan: işçi başına 4)'
+    )
+    parser.add_argument(
+        '--log',
+        default=None,
+        help='Analiz edilen her yüzü (frame, zaman, kutu, 7 duygu skoru) bu dosyaya yaz; biçim uzantıdan: .csv, .jsonl ya da .parquet (pyarrow gerekir)'
+    )
+    parser.add_argument(
+        '--log-rotate-mb',
+        type=float,
+        default=0,
+        help='--log dosyası bu boyutu aşınca numaralı yeni dosyaya geç (varsayılan: 0 = döndürme yok)'
+    )
+    parser.add_argument(
+        '--log-rotate-minutes',
+        type=float,
+        default=0,
+        help='--log dosyasını bu kadar dakikada bir yenisine geç (varsayılan: 0 = döndürme yok)'
+    )
+    parser.add_argument(
+        '--summary-interval',
+        type=float,
+        default=10,
+        help='İlerleme ve duygu özetinin kaç saniyede bir yazılacağı, 0 = yazma (varsayılan: 10)'
+    )
+    parser.add_argument(
+        '--print-frames',
+        action='store_true',
+        help='Yüz bulunan her frame\'in duygularını ayrıca konsola yaz'
     )
     parser.add_argument(
         '--no-save',
         action='store_true',
         help='Video kaydetme'
     )
+    parser.add_argument(
+        '--detect-width',
+        type=int,
+        default=None,
+        help='Yüz taraması için frame\'in küçültüleceği genişlik, ör. 640 (varsayılan: tam çözünürlük)'
+    )
+    parser.add_argument(
+        '--detector',
+        choices=available_backends(),
+        default='haar',
+        help='Yüz tespit yöntemi; lbp, lbpcascade_frontalface_improved.xml cascades/ klasörüne konunca seçilebilir (varsayılan: haar)'
+    )
+    parser.add_argument(
+        '--full-scan-every',
+        type=int,
+        default=0,
+        help='Tam frame taramasını N frame\'de bir yap, arada yalnızca bilinen yüzlerin çevresini tara (varsayılan: 0 = her frame tam tarama)'
+    )
+    parser.add_argument(
+        '--precropped',
+        action='store_true',
+        help='Yüz kesitlerini yeniden tespit etmeden doğrudan sınıflandır'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Frame aşamalarının sürelerini ölç; çıkışta p50/p95/p99 özeti yaz ve JSON rapor kaydet'
+    )
+    parser.add_argument(
+        '--profile-report',
+        default=None,
+        help='Ölçüm raporu dosyası (varsayılan: profile_TARIH_SAAT.json)'
+    )
+    parser.add_argument(
+        '--hud',
+        action='store_true',
+        help='--profile ile birlikte aşama sürelerini kaydedilen videoya çiz'
+    )
+    parser.add_argument(
+        '--motion-threshold',
+        type=float,
+        default=0,
+        help='Frame\'lerin en az yüzde kaçı değişmezse sahne durağan sayılıp tespit ve analiz atlansın, ör. 0.5 (varsayılan: 0 = her frame analiz edilir)'
+    )
+    parser.add_argument(
+        '--motion-refresh',
+        type=int,
+        default=300,
+        help='--motion-threshold ile hareket olmasa da en geç N frame\'de bir analiz yap, 0 = hiçbir zaman (varsayılan: 300)'
+    )
+    parser.add_argument(
+        '--static-frames',
+        choices=['annotate', 'raw'],
+        default='annotate',
+        help='Durağan frame\'lere son sonuçları çiz ya da ham kaydet (varsayılan: annotate)'
+    )
     
     args = parser.parse_args()
     
-    duration = None if args.duration == 0 else args.duration
+    if args.input and args.workers > 1:
+        if args.print_frames:
+            parser.error("--print-frames --workers ile kullanılamaz; frame sonuçları "
+                         "<video>_frames.jsonl dosyasına ya da --log ile yazılır")
+        if not run_parallel(args):
+            sys.exit(1)
+        return
+    
+    duration = args.duration
+    if duration is None:
+        duration = 0 if args.input else 30
+    duration = None if duration == 0 else duration
     save_video = not args.no_save
     
-    detector = EmotionDetector(save_video=save_video)
-    detector.run(duration=duration)
+    detector = EmotionDetector(
+        save_video=save_video,
+        precropped=args.precropped,
+        detect_width=args.detect_width,
+        full_scan_interval=args.full_scan_every,
+        detector=args.detector,
+        profile=args.profile,
+        profile_report=args.profile_report,
+        show_hud=args.hud,
+        motion_threshold=args.motion_threshold,
+        motion_refresh=args.motion_refresh,
+        static_frames=args.static_frames
+    )
+    log = open_log(args)
+    if not detector.run(duration=duration, input_path=args.input, progress_interval=args.summary_interval,
+                        log=log, print_frames=args.print_frames):
+        # Duygu kaydı yazılamadı
+        sys.exit(1)
 
 
 if __name__ == "__main__":
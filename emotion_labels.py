@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Duygu Etiketleri
+Duygu modelinin çıkış sırasına göre etiketler. Ayrı modüldedir; kayıt gibi
+modeli kullanmayan bileşenler DeepFace ve TensorFlow yüklemeden içe aktarabilir.
+"""
+
+# DeepFace Emotion modelinin çıkış sırası (deepface.extendedmodels.Emotion.labels)
+EMOTION_LABELS = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
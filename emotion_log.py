@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yapılandırılmış Duygu Kaydı
+Her yüz için frame numarası, zaman, kutu ve yedi duygu skorunu CSV, JSONL ya
+da Parquet dosyasına yazar. Yazma arka plan thread'inde toplu yapılır; işleme
+döngüsü diske beklemez. Dosyalar boyut ya da süreye göre döndürülebilir.
+"""
+
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from emotion_labels import EMOTION_LABELS
+
+# Kayıt sütunları (yüz başına bir satır)
+LOG_COLUMNS = ['source', 'frame', 'time', 'timestamp', 'face', 'x', 'y', 'w', 'h',
+               'emotion'] + EMOTION_LABELS
+
+LOG_FORMATS = ('csv', 'jsonl', 'parquet')
+
+
+def log_format(path):
+    """Dosya uzantısından kayıt biçimini belirle (.csv, .parquet; diğerleri JSONL)"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        return 'csv'
+    if ext in ('.parquet', '.pq'):
+        return 'parquet'
+    return 'jsonl'
+
+
+def close_log(log):
+    """
+    Kaydı kapat ve özetini yazdır; yazma hatası kapanışın geri kalanını kesmez
+
+    Args:
+        log: EmotionLog
+
+    Returns:
+        Tüm satırlar hatasız yazıldıysa True, yazma hatası olduysa False
+    """
+    try:
+        log.close()
+    except Exception:
+        pass  # Hata log.stats() içinde raporlanır
+    stats = log.stats()
+    print(f"Duygu kaydı: {stats['rows']} satır, {stats['batches']} toplu yazma, "
+          f"{len(stats['files'])} dosya ({log.path})")
+    if stats['dropped']:
+        print(f"Uyarı: {stats['dropped']} satır yazılamadan atıldı")
+    if stats['error'] is not None:
+        print(f"Hata: Duygu kaydı yazılamadı: {stats['error']}")
+        return False
+    return True
+
+
+class EmotionLog:
+    def __init__(self, path, rotate_bytes=0, rotate_seconds=0, batch_size=512,
+                 flush_interval=1.0, max_pending=100000):
+        """
+        Arka planda toplu yazan, döndürülebilir duygu kaydı
+
+        Döndürme açıkken dosyalar kayit_00001.csv, kayit_00002.csv... şeklinde
+        numaralanır; her CSV dosyası kendi başlık satırıyla başlar.
+
+        Args:
+            path: Kayıt dosyası; biçim uzantıdan belirlenir (.csv, .jsonl, .parquet)
+            rotate_bytes: Dosya bu boyutu aşınca yenisine geç (0 = döndürme yok)
+            rotate_seconds: Dosya bu kadar saniye açık kalınca yenisine geç (0 = döndürme yok)
+            batch_size: Bu kadar satır birikince hemen yaz
+            flush_interval: Satırlar en fazla bu kadar saniye bekletilir
+            max_pending: Bekleyen en fazla satır; yazma yetişemezse fazlası atılır
+        """
+        self.path = path
+        self.format = log_format(path)
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.pyarrow = None
+        if self.format == 'parquet':
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise ImportError("Parquet kaydı için pyarrow gerekli: pip install pyarrow "
+                                  "(ya da .csv/.jsonl uzantısı kullanın)")
+            self.pyarrow = pyarrow
+
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.file = None
+        self.writer = None          # csv.writer ya da pyarrow.parquet.ParquetWriter
+        self.opened_at = 0.0
+        self.file_index = 0
+        self.files = []
+
+        # İstatistikler
+        self.rows = 0
+        self.batches = 0
+        self.dropped = 0
+        self.error = None           # Yazma hatası; oluşursa kayıt durur, close() yeniden fırlatır
+
+        self.thread = threading.Thread(target=self.write_loop, name="emotion-log", daemon=True)
+        self.thread.start()
+
+    def write_frame(self, frame_index, seconds, faces, source=None):
+        """
+        Bir frame'in (ya da görüntünün) yüzlerini kuyruğa ekle; beklemeden döner
+
+        Args:
+            frame_index: Frame numarası (görüntülerde None)
+            seconds: Kaynaktaki zaman (saniye; görüntülerde None)
+            faces: last_faces biçiminde yüz listesi (box, emotion, scores)
+            source: Kaynak adı (ör. video ya da görüntü yolu)
+        """
+        if self.error is not None:
+            # Yazma durdu; kuyruğu boşuna doldurma
+            self.dropped += len(faces)
+            return
+        timestamp = datetime.now().isoformat(timespec='milliseconds')
+        for i, face in enumerate(faces, 1):
+            x, y, w, h = face['box']
+            row = {
+                'source': source,
+                'frame': frame_index,
+                'time': round(seconds, 3) if seconds is not None else None,
+                'timestamp': timestamp,
+                'face': i,
+                'x': x, 'y': y, 'w': w, 'h': h,
+                'emotion': face['emotion']
+            }
+            for emo in EMOTION_LABELS:
+                row[emo] = face['scores'].get(emo)
+            try:
+                self.pending.put_nowait(row)
+            except queue.Full:
+                self.dropped += 1
+
+    def write_loop(self):
+        """Arka plan thread'i: satırları toplayıp toplu yaz"""
+        running = True
+        while running:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    row = self.pending.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if row is None:
+                    running = False
+                    break
+                batch.append(row)
+            try:
+                if self.error is not None:
+                    # Hata sonrası kuyruk boşaltılmaya devam eder, satırlar atılır
+                    self.dropped += len(batch)
+                elif batch:
+                    self.write_batch(batch)
+                elif self.file is not None and self.rotation_due():
+                    # Satır gelmese de süresi dolan dosya kapatılsın
+                    self.close_file()
+            except Exception as e:
+                self.fail(e, len(batch))
+        try:
+            self.close_file()
+        except Exception as e:
+            self.fail(e, 0)
+
+    def fail(self, error, lost_rows):
+        """İlk yazma hatasını sakla ve bir kez bildir; kayıt bundan sonra satır atar"""
+        self.dropped += lost_rows
+        if self.error is not None:
+            return
+        self.error = error
+        print(f"Uyarı: Duygu kaydı yazılamıyor, kayıt durduruldu ({self.path}): {error}")
+        try:
+            if self.file is not None:
+                self.file.close()
+        except Exception:
+            pass
+        self.file = self.writer = None
+
+    def file_path(self):
+        """Sıradaki dosyanın yolu (döndürme kapalıysa verilen yol)"""
+        if not (self.rotate_bytes or self.rotate_seconds):
+            return self.path
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}_{self.file_index:05d}{ext}"
+
+    def rotation_due(self):
+        if self.rotate_seconds and time.monotonic() - self.opened_at >= self.rotate_seconds:
+            return True
+        return bool(self.rotate_bytes) and self.file.tell() >= self.rotate_bytes
+
+    def open_file(self):
+        self.file_index += 1
+        path = self.file_path()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if self.format == 'parquet':
+            self.file = open(path, 'wb')
+            self.writer = None  # Şema ilk toplu yazmada kurulur
+        else:
+            self.file = open(path, 'w', encoding='utf-8', newline='')
+            if self.format == 'csv':
+                self.writer = csv.DictWriter(self.file, fieldnames=LOG_COLUMNS)
+                self.writer.writeheader()
+        self.opened_at = time.monotonic()
+        self.files.append(path)
+
+    def close_file(self):
+        if self.file is None:
+            return
+        if self.format == 'parquet' and self.writer is not None:
+            self.writer.close()
+        self.file.close()
+        self.file = self.writer = None
+
+    def write_batch(self, batch):
+        if self.file is not None and self.rotation_due():
+            self.close_file()
+        if self.file is None:
+            self.open_file()
+
+        if self.format == 'csv':
+            self.writer.writerows(batch)
+        elif self.format == 'jsonl':
+            self.file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in batch))
+        else:
+            pa = self.pyarrow
+            table = pa.Table.from_pylist(batch, schema=self.parquet_schema())
+            if self.writer is None:
+                self.writer = pa.parquet.ParquetWriter(self.file, table.schema)
+            self.writer.write_table(table)
+        self.file.flush()
+
+        self.rows += len(batch)
+        self.batches += 1
+
+    def parquet_schema(self):
+        pa = self.pyarrow
+        fields = [
+            ('source', pa.string()), ('frame', pa.int64()), ('time', pa.float64()),
+            ('timestamp', pa.string()), ('face', pa.int32()),
+            ('x', pa.int32()), ('y', pa.int32()), ('w', pa.int32()), ('h', pa.int32()),
+            ('emotion', pa.string())
+        ]
+        fields += [(emo, pa.float32()) for emo in EMOTION_LABELS]
+        return pa.schema(fields)
+
+    def stats(self):
+        """
+        Kayıt istatistikleri
+
+        Returns:
+            Yazılan satır ve toplu yazma sayıları, atılan satırlar, dosyalar ve varsa yazma hatası
+        """
+        return {
+            'rows': self.rows,
+            'batches': self.batches,
+            'dropped': self.dropped,
+            'files': list(self.files),
+            'error': None if self.error is None else str(self.error)
+        }
+
+    def close(self):
+        """Bekleyen satırları yaz ve dosyayı kapat; yazma sırasında hata olduysa onu fırlat"""
+        if self.thread.is_alive():
+            self.pending.put(None)
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
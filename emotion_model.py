@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Toplu Duygu Analizi Modeli
+Bir frame'deki tüm yüz bölgelerini tek bir model çağrısında sınıflandırır.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from importlib import metadata
+import cv2
+import numpy as np
+from deepface import DeepFace
+from deepface.commons import functions
+from emotion_labels import EMOTION_LABELS
+
+# DeepFace'in duygu modeli ağırlıklarını indirdiği dosya
+WEIGHTS_FILE = "facial_expression_model_weights.h5"
+
+# DeepFace yüz dedektörlerini süreç genelinde önbelleğe alır; aynı cascade nesnesi
+# tüm EmotionModel örnekleri arasında paylaşıldığından yeniden tespit sıraya alınır
+REDETECT_LOCK = threading.Lock()
+
+
+class EmotionModel:
+    def __init__(self, detector_backend='opencv', precropped=False):
+        """
+        Duygu modelini başlat
+
+        Args:
+            detector_backend: DeepFace'in yüz bölgesi içinde kullanacağı tespit yöntemi
+            precropped: True ise yüz bölgeleri zaten kesilmiş kabul edilir ve
+                DeepFace'in yeniden tespit/hizalama adımı atlanır
+        """
+        self.detector_backend = detector_backend
+        self.precropped = precropped
+        self.model = None
+
+        # Başlangıç süreleri (saniye), warmup() tarafından doldurulur
+        self.load_time = None
+        self.warmup_time = None
+        self._version = None
+
+    def get_model(self):
+        """Keras duygu modelini döndür (ilk çağrıda yüklenir)"""
+        if self.model is None:
+            self.model = DeepFace.build_model("Emotion")
+        return self.model
+
+    def version(self):
+        """
+        Sonuçları etkileyen model sürümü (ör. önbellek anahtarları için)
+
+        DeepFace sürümü, ağırlık dosyasının özeti ve ön işleme modundan oluşur;
+        ağırlıklar ya da DeepFace güncellenince değişir. Model kurulmaz; yalnızca
+        ağırlık dosyası henüz indirilmemişse (ilk çalıştırma) indirmek için yüklenir.
+
+        Returns:
+            Sürüm metni
+        """
+        if self._version is None:
+            try:
+                deepface_version = metadata.version('deepface')
+            except metadata.PackageNotFoundError:
+                deepface_version = 'bilinmiyor'
+
+            weights_path = os.path.join(functions.get_deepface_home(), '.deepface', 'weights', WEIGHTS_FILE)
+            if not os.path.isfile(weights_path):
+                # DeepFace ağırlıkları model ilk kurulurken indirir
+                self.get_model()
+            weights_digest = 'yok'
+            if os.path.isfile(weights_path):
+                with open(weights_path, 'rb') as f:
+                    weights_digest = hashlib.sha1(f.read()).hexdigest()[:12]
+
+            mode = 'precropped' if self.precropped else f"redetect-{self.detector_backend}"
+            self._version = f"deepface-{deepface_version}/{weights_digest}/{mode}"
+        return self._version
+
+    def warmup(self):
+        """
+        Modeli yükle ve sahte bir çıkarım çalıştır
+
+        Böylece ilk gerçek frame model kurulumunu ve ilk çağrı maliyetlerini ödemez.
+
+        Returns:
+            (yükleme süresi, ısınma süresi) saniye cinsinden
+        """
+        start = time.perf_counter()
+        self.get_model()
+        self.load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dummy_face = np.zeros((64, 64, 3), dtype=np.uint8)
+        self.analyze_batch([dummy_face])
+        self.warmup_time = time.perf_counter() - start
+
+        return self.load_time, self.warmup_time
+
+    def preprocess(self, face_roi):
+        """
+        Yüz bölgesini modelin girişine hazırla
+
+        Varsayılan modda DeepFace.analyze ile aynı adımlar uygulanır (kesit içinde
+        yeniden yüz tespiti, hizalama, 224x224 dolgu).
+
+        Args:
+            face_roi: BGR yüz bölgesi
+
+        Returns:
+            48x48 gri tonlamalı, [0, 1] aralığında görüntü
+        """
+        if self.precropped:
+            # Haar kesiti doğrudan sınıflandırıcıya gider
+            img_gray = cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY)
+            img_gray = cv2.resize(img_gray, (48, 48), interpolation=cv2.INTER_AREA)
+            return img_gray.astype(np.float32) / 255
+
+        with REDETECT_LOCK:
+            img_objs = functions.extract_faces(
+                img=face_roi,
+                target_size=(224, 224),
+                detector_backend=self.detector_backend,
+                grayscale=False,
+                enforce_detection=False,
+                align=True
+            )
+        img_content = img_objs[0][0]
+        img_gray = cv2.cvtColor(img_content[0], cv2.COLOR_BGR2GRAY)
+        return cv2.resize(img_gray, (48, 48))
+
+    def analyze_batch(self, face_rois):
+        """
+        Tüm yüz bölgelerini tek bir ileri geçişte sınıflandır
+
+        Args:
+            face_rois: BGR yüz bölgeleri listesi
+
+        Returns:
+            Her yüz için DeepFace.analyze formatında sonuç (aynı sırada),
+            ön işlemesi başarısız olan yüzler için None
+        """
+        results = [None] * len(face_rois)
+        inputs = []
+        indices = []
+
+        for idx, face_roi in enumerate(face_rois):
+            try:
+                inputs.append(self.preprocess(face_roi))
+                indices.append(idx)
+            except Exception:
+                continue
+
+        if not inputs:
+            return results
+
+        # (N, 48, 48, 1) tensörü ile tek model çağrısı
+        batch = np.stack(inputs).astype(np.float32)[..., np.newaxis]
+        predictions = np.asarray(self.get_model()(batch, training=False))
+
+        for idx, prediction in zip(indices, predictions):
+            results[idx] = self.to_result(prediction)
+
+        return results
+
+    def analyze(self, face_roi):
+        """Tek bir yüz bölgesini analiz et"""
+        return self.analyze_batch([face_roi])[0]
+
+    @staticmethod
+    def to_result(prediction):
+        """Model çıktısını DeepFace.analyze sonuç formatına çevir"""
+        total = float(prediction.sum())
+        scores = {
+            label: 100 * float(prediction[i]) / total
+            for i, label in enumerate(EMOTION_LABELS)
+        }
+        return {
+            'dominant_emotion': EMOTION_LABELS[int(np.argmax(prediction))],
+            'emotion': scores
+        }
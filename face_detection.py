@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yüz Tespiti Yardımcıları
+Değiştirilebilir cascade tabanlı yüz tespit yöntemleri (Haar, LBP, Haar + profil).
+Tarama küçültülmüş gri görüntü üzerinde yapılıp kutular orijinal çözünürlüğe
+geri taşınabilir.
+"""
+
+import os
+import time
+import cv2
+import numpy as np
+from face_tracker import box_iou
+from analysis_scheduler import FrameTimeStats
+
+
+# Cascade dosyalarının aranacağı klasörler (LBP cascade'leri pip paketinde gelmez)
+CASCADE_DIRS = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cascades'),
+    cv2.data.haarcascades,
+    os.path.join(cv2.data.haarcascades, os.pardir, 'lbpcascades'),
+    '/usr/share/opencv4/lbpcascades',
+    '/usr/share/opencv/lbpcascades',
+    '/usr/local/share/opencv4/lbpcascades',
+]
+
+# Tespit yöntemleri: (cascade dosyası, aynalanmış görüntüde de taransın mı)
+DETECTOR_BACKENDS = {
+    'haar': [
+        ('haarcascade_frontalface_default.xml', False),
+    ],
+    'lbp': [
+        ('lbpcascade_frontalface_improved.xml', False),
+    ],
+    # Profil cascade'i yalnızca bir yöne bakan yüzleri bulur, diğer yön için aynalanır
+    'haar-profile': [
+        ('haarcascade_frontalface_default.xml', False),
+        ('haarcascade_profileface.xml', True),
+    ],
+}
+
+
+def detect_faces(face_cascade, gray, detect_width=None, scale_factor=1.1,
+                 min_neighbors=5, min_size=(30, 30)):
+    """
+    Gri görüntüde yüzleri tespit et
+
+    Args:
+        face_cascade: cv2.CascadeClassifier
+        gray: Tam çözünürlüklü gri görüntü
+        detect_width: Verilirse tarama bu genişliğe küçültülmüş görüntüde yapılır
+        scale_factor: detectMultiScale ölçek adımı
+        min_neighbors: detectMultiScale komşu eşiği
+        min_size: Orijinal çözünürlükte en küçük yüz boyutu
+
+    Returns:
+        Orijinal koordinatlarda (x, y, w, h) kutuları
+    """
+    height, width = gray.shape[:2]
+    scale = 1.0
+
+    if detect_width and width > detect_width:
+        scale = detect_width / width
+        gray = cv2.resize(
+            gray,
+            (detect_width, int(round(height * scale))),
+            interpolation=cv2.INTER_AREA
+        )
+        min_size = (
+            max(1, int(round(min_size[0] * scale))),
+            max(1, int(round(min_size[1] * scale)))
+        )
+
+    faces = face_cascade.detectMultiScale(
+        gray,
+        scaleFactor=scale_factor,
+        minNeighbors=min_neighbors,
+        minSize=min_size
+    )
+
+    if scale != 1.0 and len(faces) > 0:
+        faces = np.round(np.asarray(faces) / scale).astype(int)
+        # Yuvarlama yüzünden görüntü dışına taşan kutuları kırp
+        faces[:, 2] = np.minimum(faces[:, 2], width - faces[:, 0])
+        faces[:, 3] = np.minimum(faces[:, 3], height - faces[:, 1])
+
+    return faces
+
+
+def expand_box(box, margin, width, height):
+    """Kutuyu her yönde margin * boyut kadar büyüt ve görüntü sınırlarına kırp"""
+    x, y, w, h = box
+    pad_x = int(w * margin)
+    pad_y = int(h * margin)
+    x0 = max(0, x - pad_x)
+    y0 = max(0, y - pad_y)
+    x1 = min(width, x + w + pad_x)
+    y1 = min(height, y + h + pad_y)
+    return x0, y0, x1, y1
+
+
+def find_cascade(filename):
+    """
+    Cascade dosyasının tam yolunu bul
+
+    Args:
+        filename: Cascade dosyasının adı
+
+    Returns:
+        Dosyanın yolu
+    """
+    for directory in CASCADE_DIRS:
+        path = os.path.normpath(os.path.join(directory, filename))
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(
+        f"'{filename}' bulunamadı! OpenCV deposundaki data/ klasöründen indirip "
+        f"'cascades/' klasörüne koyun."
+    )
+
+
+def available_backends():
+    """
+    Cascade dosyalarının tamamı bulunabilen tespit yöntemleri
+
+    LBP cascade'i opencv-python paketinde gelmez; dosya cascades/ klasörüne
+    konmadıkça 'lbp' listelenmez.
+
+    Returns:
+        Sıralı yöntem adları
+    """
+    available = []
+    for backend, cascades in DETECTOR_BACKENDS.items():
+        try:
+            for filename, _ in cascades:
+                find_cascade(filename)
+        except FileNotFoundError:
+            continue
+        available.append(backend)
+    return sorted(available)
+
+
+def suppress_duplicates(faces, iou_threshold=0.3):
+    """Örtüşen taramalarda iki kez bulunan yüzleri tekille"""
+    kept = []
+    for box in faces:
+        box = tuple(int(v) for v in box)
+        if all(box_iou(box, other) < iou_threshold for other in kept):
+            kept.append(box)
+    return kept
+
+
+class CascadeFaceDetector:
+    def __init__(self, backend='haar', detect_width=None, scale_factor=1.1,
+                 min_neighbors=5, min_size=(30, 30)):
+        """
+        Bir veya birden fazla cascade ile yüz tespiti
+
+        Args:
+            backend: DETECTOR_BACKENDS içindeki yöntem adı
+            detect_width: Verilirse tarama bu genişliğe küçültülmüş görüntüde yapılır
+            scale_factor: detectMultiScale ölçek adımı
+            min_neighbors: detectMultiScale komşu eşiği
+            min_size: Orijinal çözünürlükte en küçük yüz boyutu
+        """
+        if backend not in DETECTOR_BACKENDS:
+            raise ValueError(
+                f"Bilinmeyen tespit yöntemi: '{backend}' "
+                f"(seçenekler: {', '.join(DETECTOR_BACKENDS)})"
+            )
+
+        self.backend = backend
+        self.detect_width = detect_width
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+
+        self.cascades = []
+        for filename, mirrored in DETECTOR_BACKENDS[backend]:
+            cascade = cv2.CascadeClassifier(find_cascade(filename))
+            if cascade.empty():
+                raise IOError(f"'{filename}' cascade dosyası yüklenemedi!")
+            self.cascades.append((cascade, mirrored))
+
+        # detect() çağrısı başına süre
+        self.timings = FrameTimeStats()
+
+    def detect(self, gray):
+        """
+        Gri görüntüde yüzleri tespit et
+
+        Args:
+            gray: Tam çözünürlüklü gri görüntü
+
+        Returns:
+            Orijinal koordinatlarda (x, y, w, h) kutuları
+        """
+        start = time.perf_counter()
+        width = gray.shape[1]
+
+        faces = []
+        for cascade, mirrored in self.cascades:
+            faces.extend(self._scan(cascade, gray))
+            if mirrored:
+                for (x, y, w, h) in self._scan(cascade, cv2.flip(gray, 1)):
+                    faces.append((width - x - w, y, w, h))
+
+        if len(self.cascades) > 1:
+            faces = suppress_duplicates(faces)
+
+        self.timings.add(time.perf_counter() - start)
+        return np.array(faces, dtype=int).reshape(-1, 4)
+
+    def _scan(self, cascade, gray):
+        return detect_faces(
+            cascade,
+            gray,
+            detect_width=self.detect_width,
+            scale_factor=self.scale_factor,
+            min_neighbors=self.min_neighbors,
+            min_size=self.min_size
+        )
+
+    def stats(self):
+        """Tespit yöntemi ve çağrı başına süre (milisaniye)"""
+        stats = {'backend': self.backend}
+        stats.update(self.timings.summary())
+        stats['mean_ms'] = (
+            float(np.mean(self.timings.samples)) * 1000 if self.timings.samples else 0.0
+        )
+        return stats
+
+
+class IncrementalFaceDetector:
+    def __init__(self, detect_fn, full_scan_interval=10, margin=0.5):
+        """
+        Bilinen yüzlerin çevresinde arama yapan artımlı yüz tespiti
+
+        Çoğu frame'de yalnızca son bilinen kutuların genişletilmiş pencereleri
+        taranır. Tam frame taraması her full_scan_interval frame'de bir ya da bir
+        yüz penceresinde kaybolursa yapılır. Hiç yüz bilinmiyorsa sahneye girenleri
+        yakalamak için tam tarama full_scan_interval // 2 frame'de bir yapılır,
+        aradaki frame'ler taranmaz.
+
+        Args:
+            detect_fn: Gri görüntü alıp (x, y, w, h) kutuları döndüren tespit fonksiyonu
+            full_scan_interval: Yeni gelenleri yakalamak için kaç frame'de bir tam tarama yapılır
+            margin: Pencere genişletme oranı (kutu boyutuna göre, her yönde)
+        """
+        self.detect_fn = detect_fn
+        self.full_scan_interval = full_scan_interval
+        self.margin = margin
+
+        self.known_boxes = []
+        # İlk frame tam taranır
+        self.frames_since_full = full_scan_interval
+
+        # Frame başına toplam tespit süresi (pencere taramaları ve yeniden tarama dahil)
+        self.timings = FrameTimeStats()
+
+        # İstatistikler
+        self.full_scans = 0
+        self.roi_scans = 0
+        self.lost_rescans = 0
+        self.idle_frames = 0     # Yüz bilinmediği için hiç taranmayan frame'ler
+        self.scanned_area = 0.0  # Taranan alanın tam frame alanına oranı (toplam)
+
+    def detect(self, gray):
+        """
+        Gri frame'de yüzleri tespit et
+
+        Args:
+            gray: Tam çözünürlüklü gri frame
+
+        Returns:
+            (x, y, w, h) kutuları
+        """
+        start = time.perf_counter()
+        faces = self._detect(gray)
+        self.timings.add(time.perf_counter() - start)
+        return faces
+
+    def _detect(self, gray):
+        height, width = gray.shape[:2]
+
+        # Boş sahnede tam tarama da seyreltilir
+        if not self.known_boxes and self.frames_since_full + 1 < self.full_scan_interval // 2:
+            self.idle_frames += 1
+            self.frames_since_full += 1
+            return np.empty((0, 4), dtype=int)
+
+        if self.known_boxes and self.frames_since_full < self.full_scan_interval:
+            faces = []
+            lost = False
+            area = 0
+            for box in self.known_boxes:
+                x0, y0, x1, y1 = expand_box(box, self.margin, width, height)
+                area += (x1 - x0) * (y1 - y0)
+                found = self.detect_fn(gray[y0:y1, x0:x1])
+                if len(found) == 0:
+                    lost = True
+                    break
+                faces.extend((fx + x0, fy + y0, fw, fh) for (fx, fy, fw, fh) in found)
+
+            if not lost:
+                self.roi_scans += 1
+                self.frames_since_full += 1
+                self.scanned_area += min(1.0, area / float(width * height))
+                self.known_boxes = suppress_duplicates(faces)
+                return np.array(self.known_boxes, dtype=int).reshape(-1, 4)
+
+            # Bir yüz penceresinde kayboldu: aynı frame'de tam tarama yap
+            self.lost_rescans += 1
+            self.scanned_area += min(1.0, area / float(width * height))
+
+        faces = self.detect_fn(gray)
+        self.full_scans += 1
+        self.frames_since_full = 0
+        self.scanned_area += 1.0
+        self.known_boxes = [tuple(int(v) for v in box) for box in faces]
+        return np.array(self.known_boxes, dtype=int).reshape(-1, 4)
+
+    def reset(self):
+        """Bilinen yüzleri unut; sıradaki frame tam taranır"""
+        self.known_boxes = []
+        self.frames_since_full = self.full_scan_interval
+
+    def stats(self):
+        """
+        Tarama istatistikleri ve frame başına tespit süresi (milisaniye)
+
+        mean_scanned_area frame başına taranan alan oranıdır (taranmayan frame'ler
+        dahil). Süreler bir frame'in tüm taramalarını kapsar; CascadeFaceDetector.stats()
+        ise çağrı başınadır.
+        """
+        frames = self.full_scans + self.roi_scans + self.idle_frames
+        stats = {
+            'full_scans': self.full_scans,
+            'roi_scans': self.roi_scans,
+            'lost_rescans': self.lost_rescans,
+            'idle_frames': self.idle_frames,
+            'mean_scanned_area': self.scanned_area / frames if frames else 0.0
+        }
+        stats.update(self.timings.summary())
+        stats['mean_ms'] = (
+            float(np.mean(self.timings.samples)) * 1000 if self.timings.samples else 0.0
+        )
+        return stats
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yüz Takipçisi
+Frame'ler arasında yüzlere kalıcı takip numarası verir, böylece saklanan duygu
+sonuçları listedeki sıraya değil kişiye bağlı kalır.
+"""
+
+import time
+
+
+def box_iou(box_a, box_b):
+    """İki (x, y, w, h) kutusunun kesişim/birleşim oranı"""
+    ax, ay, aw, ah = box_a
+    bx, by, bw, bh = box_b
+    inter_w = min(ax + aw, bx + bw) - max(ax, bx)
+    inter_h = min(ay + ah, by + bh) - max(ay, by)
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    return inter / float(aw * ah + bw * bh - inter)
+
+
+class Track:
+    def __init__(self, track_id, box, frame_index):
+        """
+        Tek bir yüzün takip durumu
+
+        Args:
+            track_id: Kalıcı takip numarası
+            box: Son (x, y, w, h) kutusu
+            frame_index: Yüzün ilk görüldüğü frame
+        """
+        self.track_id = track_id
+        self.box = tuple(int(v) for v in box)
+        self.velocity = (0.0, 0.0)  # Frame başına merkez hareketi
+        self.missed = 0
+        self.first_seen = frame_index
+
+        # Saklanan duygu sonucu ve analiz edildiği frame
+        self.emotion = None
+        self.analyzed_frame = None
+
+        # Son çıkarımdaki yüz görüntüsünün özeti (CropChangeFilter)
+        self.signature = None
+        self.signature_box = None
+        self.inferred_frame = None
+
+    def predicted_box(self):
+        """Sabit hız modeline göre bir sonraki frame'deki kutu tahmini"""
+        x, y, w, h = self.box
+        dx, dy = self.velocity
+        steps = self.missed + 1
+        return (x + dx * steps, y + dy * steps, w, h)
+
+    def update(self, box):
+        """Eşleşen yeni kutu ile durumu güncelle"""
+        x, y, w, h = (int(v) for v in box)
+        old_x, old_y, old_w, old_h = self.box
+        steps = self.missed + 1
+        dx = ((x + w / 2) - (old_x + old_w / 2)) / steps
+        dy = ((y + h / 2) - (old_y + old_h / 2)) / steps
+        # Titremeyi azaltmak için hızı yumuşat
+        self.velocity = (
+            0.5 * self.velocity[0] + 0.5 * dx,
+            0.5 * self.velocity[1] + 0.5 * dy
+        )
+        self.box = (x, y, w, h)
+        self.missed = 0
+
+
+class FaceTracker:
+    def __init__(self, result_ttl=30, iou_threshold=0.3, max_missed=10,
+                 baseline_interval=None):
+        """
+        IoU eşleştirmeli ve sabit hız modelli hafif yüz takipçisi
+
+        Args:
+            result_ttl: Bir takibin duygu sonucu kaç frame geçerli sayılır
+            iou_threshold: Eşleşme için gereken en düşük IoU
+            max_missed: Görülmeyen bir takip kaç frame sonra silinir
+            baseline_interval: Tasarruf kıyası için eski şemanın analiz aralığı
+                (verilmezse result_ttl)
+        """
+        self.result_ttl = result_ttl
+        self.baseline_interval = baseline_interval or result_ttl
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+
+        self.tracks = []
+        self.next_id = 1
+
+        # İstatistikler
+        self.start_time = time.time()
+        self.analyses = 0
+        self.baseline_analyses = 0
+
+    def update(self, boxes, frame_index):
+        """
+        Yeni frame'in tespitlerini mevcut takiplerle eşleştir
+
+        Args:
+            boxes: (x, y, w, h) kutuları
+            frame_index: Frame numarası
+
+        Returns:
+            Kutularla aynı sırada Track listesi
+        """
+        boxes = [tuple(int(v) for v in box) for box in boxes]
+
+        # Eski indeks tabanlı şema her aralıkta tüm yüzleri analiz ederdi
+        if frame_index % self.baseline_interval == 0:
+            self.baseline_analyses += len(boxes)
+
+        # Tüm (takip, kutu) çiftlerini IoU'ya göre sırala ve açgözlü eşleştir
+        pairs = []
+        for t_idx, track in enumerate(self.tracks):
+            predicted = track.predicted_box()
+            for b_idx, box in enumerate(boxes):
+                iou = box_iou(predicted, box)
+                if iou >= self.iou_threshold:
+                    pairs.append((iou, t_idx, b_idx))
+        pairs.sort(reverse=True)
+
+        assigned = [None] * len(boxes)
+        matched_tracks = set()
+        for _, t_idx, b_idx in pairs:
+            if t_idx in matched_tracks or assigned[b_idx] is not None:
+                continue
+            track = self.tracks[t_idx]
+            track.update(boxes[b_idx])
+            assigned[b_idx] = track
+            matched_tracks.add(t_idx)
+
+        # Eşleşmeyen takipler kayıp sayılır
+        for t_idx, track in enumerate(self.tracks):
+            if t_idx not in matched_tracks:
+                track.missed += 1
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+
+        # Eşleşmeyen kutular yeni takip başlatır
+        for b_idx, box in enumerate(boxes):
+            if assigned[b_idx] is None:
+                track = Track(self.next_id, box, frame_index)
+                self.next_id += 1
+                self.tracks.append(track)
+                assigned[b_idx] = track
+
+        return assigned
+
+    def get(self, track_id):
+        """Takip numarasına göre aktif takibi bul (yoksa None)"""
+        for track in self.tracks:
+            if track.track_id == track_id:
+                return track
+        return None
+
+    def needs_analysis(self, track, frame_index):
+        """Takip yeni mi ya da saklanan sonucu süresi dolmuş mu?"""
+        if track.analyzed_frame is None:
+            return True
+        return frame_index - track.analyzed_frame >= self.result_ttl
+
+    def record_analyses(self, count):
+        """Yapılan duygu analizi sayısını kaydet"""
+        self.analyses += count
+
+    def stats(self):
+        """
+        Eski indeks tabanlı şemaya göre tasarruf istatistikleri
+
+        Returns:
+            analiz sayıları ve saniye başına tasarrufu içeren sözlük
+        """
+        elapsed = max(time.time() - self.start_time, 1e-6)
+        saved = self.baseline_analyses - self.analyses
+        return {
+            'analyses': self.analyses,
+            'baseline_analyses': self.baseline_analyses,
+            'saved': saved,
+            'saved_per_second': saved / elapsed,
+            'active_tracks': len(self.tracks)
+        }
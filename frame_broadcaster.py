@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tek Üretici, Çok İzleyici Yayını
+Frame'leri tek bir arka plan thread'inde üretir (kamera + analiz) ve her
+izleyiciye yalnızca en son yayınlanan frame'i verir; izleyici sayısı arttıkça
+işlem yükü artmaz.
+"""
+
+import threading
+import time
+
+
+class FrameBroadcaster:
+    def __init__(self, produce, name="frame-producer"):
+        """
+        İzleyici varken çalışan tek üretici thread
+
+        Args:
+            produce: (başarılı mı, frame) döndüren, bir sonraki frame'i üreten fonksiyon
+            name: Üretici thread'in adı
+        """
+        self.produce = produce
+        self.name = name
+        self.condition = threading.Condition()
+        self.frame = None
+        self.frame_id = 0    # Son yayınlanan frame'in numarası
+        self.viewers = 0
+        self.clients = {}    # İzleyici numarası -> gönderim sayaçları
+        self.next_client_id = 1
+        self.listeners = []  # Her yayında frame numarasıyla çağrılır (ör. asyncio döngüsünü uyandırmak için)
+        self.running = False
+        self.thread = None
+
+        # İstatistikler
+        self.published = 0
+        self.failures = 0    # Frame üretilemeyen denemeler (hata fırlatanlar dahil)
+        self.last_error = None
+
+    def subscribe(self, kind='video'):
+        """
+        Yeni izleyici ekle; üretici thread ilk izleyiciyle başlar
+
+        Args:
+            kind: İzleyici türü (ör. 'video' ya da 'events'), üretici neyi hazırlayacağını buna göre seçebilir
+
+        Returns:
+            İzleyicinin sayaçlarını tutan sözlük (unsubscribe ve record_sent için)
+        """
+        with self.condition:
+            client = {
+                'id': self.next_client_id,
+                'kind': kind,
+                'connected_at': time.time(),
+                'last_id': 0,
+                'sent': 0,
+                'skipped': 0,
+                'bytes': 0
+            }
+            self.next_client_id += 1
+            self.clients[client['id']] = client
+            self.viewers += 1
+            if not self.running:
+                self.running = True
+                self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+            return client
+
+    def unsubscribe(self, client):
+        """İzleyiciyi çıkar; izleyici kalmazsa üretici bekler"""
+        with self.condition:
+            if self.clients.pop(client['id'], None) is not None:
+                self.viewers -= 1
+            self.condition.notify_all()
+
+    def viewer_count(self, kind):
+        """Belirli türdeki izleyici sayısı"""
+        with self.condition:
+            return sum(1 for client in self.clients.values() if client['kind'] == kind)
+
+    def next_frame(self, client, timeout=5.0):
+        """
+        İzleyiciye henüz görmediği en yeni frame'i ver
+
+        Yavaş izleyici arada yayınlanan frame'leri almaz, atlanmış sayılır.
+
+        Args:
+            client: subscribe() ile alınan izleyici
+            timeout: En fazla bekleme süresi (saniye)
+
+        Returns:
+            Frame; süre dolarsa None
+        """
+        frame_id, frame = self.wait(client['last_id'], timeout)
+        if frame is None:
+            return None
+        if client['last_id']:
+            client['skipped'] += frame_id - client['last_id'] - 1
+        client['last_id'] = frame_id
+        return frame
+
+    def record_sent(self, client, size):
+        """İzleyiciye gönderilen frame'i ve bayt sayısını kaydet"""
+        client['sent'] += 1
+        client['bytes'] += size
+
+    def client_stats(self):
+        """
+        İzleyici başına gönderim istatistikleri
+
+        Returns:
+            Her izleyici için gönderilen/atlanan frame, bayt ve ortalama kbit/s
+        """
+        now = time.time()
+        with self.condition:
+            clients = list(self.clients.values())
+        return [
+            {
+                'id': client['id'],
+                'kind': client['kind'],
+                'sent': client['sent'],
+                'skipped': client['skipped'],
+                'bytes': client['bytes'],
+                'kbps': client['bytes'] * 8 / 1000 / max(now - client['connected_at'], 1e-6)
+            }
+            for client in clients
+        ]
+
+    def add_listener(self, callback):
+        """Yeni frame yayınlandığında üretici thread'den çağrılacak fonksiyonu ekle"""
+        with self.condition:
+            self.listeners.append(callback)
+
+    def latest(self):
+        """Son yayınlanan (frame numarası, frame) çifti"""
+        with self.condition:
+            return self.frame_id, self.frame
+
+    def wait(self, last_id, timeout=5.0):
+        """
+        last_id'den yeni bir frame yayınlanana kadar bekle
+
+        Aradaki frame'ler atlanır, izleyici her zaman en son frame'i alır.
+
+        Args:
+            last_id: İzleyicinin aldığı son frame numarası
+            timeout: En fazla bekleme süresi (saniye)
+
+        Returns:
+            (frame numarası, frame); süre dolarsa (last_id, None)
+        """
+        with self.condition:
+            has_new = self.condition.wait_for(
+                lambda: self.frame_id > last_id or not self.running,
+                timeout
+            )
+            if not has_new or self.frame_id == last_id:
+                return last_id, None
+            return self.frame_id, self.frame
+
+    def stop(self, timeout=2.0):
+        """Üretici thread'i durdur"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def _run(self):
+        try:
+            while True:
+                # İzleyici yokken kamera okunmaz ve analiz yapılmaz
+                with self.condition:
+                    self.condition.wait_for(lambda: self.viewers > 0 or not self.running)
+                    if not self.running:
+                        break
+
+                try:
+                    success, frame = self.produce()
+                except Exception as e:
+                    # Kamera okuma ya da analiz hatası üreticiyi durdurmasın
+                    if self.last_error is None:
+                        print(f"Uyarı: Frame üretilemedi: {e!r}")
+                    self.last_error = repr(e)
+                    success, frame = False, None
+                    time.sleep(0.01)
+
+                with self.condition:
+                    if not success:
+                        self.failures += 1
+                        continue
+                    self.frame = frame
+                    self.frame_id += 1
+                    self.published += 1
+                    self.condition.notify_all()
+                    frame_id = self.frame_id
+                    listeners = list(self.listeners)
+
+                for callback in listeners:
+                    callback(frame_id)
+        finally:
+            # Thread beklenmedik şekilde biterse sıradaki subscribe() yenisini başlatsın
+            with self.condition:
+                if self.thread is threading.current_thread():
+                    self.running = False
+                self.condition.notify_all()
@@ -2,150 +2,261 @@
 # -*- coding: utf-8 -*-
 """
 Görüntü Dosyasından Duygu Analizi
-Bir görüntü dosyasındaki yüzleri tespit eder ve duygu analizi yapar.
+Bir görüntü dosyasındaki yüzleri tespit eder ve duygu analizi yapar. Dizin,
+glob deseni veya dosya listesi verildiğinde görüntüleri süreç havuzunda toplu
+olarak işler.
 """
 
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import time
 import cv2
-import sys
-from deepface import DeepFace
+import numpy as np
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from emotion_model import EmotionModel, EMOTION_LABELS
+from face_detection import CascadeFaceDetector, available_backends
+from result_cache import ResultCache
+from emotion_log import EmotionLog, close_log
+from stage_profiler import StageProfiler
+
+# Toplu modda taranan dosya uzantıları
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+# Duygu renkleri (BGR formatında)
+EMOTION_COLORS = {
+    'happy': (0, 255, 0),      # Yeşil
+    'sad': (255, 0, 0),        # Mavi
+    'angry': (0, 0, 255),      # Kırmızı
+    'surprise': (0, 255, 255), # Sarı
+    'fear': (128, 0, 128),     # Mor
+    'disgust': (0, 128, 128),  # Kahverengi
+    'neutral': (255, 255, 255) # Beyaz
+}
+
+# Duygu Türkçe karşılıkları
+EMOTION_TR = {
+    'happy': 'Mutlu',
+    'sad': 'Üzgün',
+    'angry': 'Kızgın',
+    'surprise': 'Şaşkın',
+    'fear': 'Korkmuş',
+    'disgust': 'İğrenmiş',
+    'neutral': 'Nötr'
+}
 
-def analyze_image(image_path):
+# Toplu işte her işçi sürecin bir kez yüklediği tespit yöntemi, model ve önbellek
+worker_face_detector = None
+worker_emotion_model = None
+worker_cache = None
+worker_profiler = StageProfiler()  # Açıksa görüntü başına aşama süreleri kayda eklenir
+
+def load_emotion_model(precropped=False):
     """
-    Görüntü dosyasındaki yüzleri tespit et ve duygularını analiz et
+    Duygu modelini yükle, ısıt ve yükleme/ısınma sürelerini raporla
     
     Args:
-        image_path: Analiz edilecek görüntü dosyasının yolu
+        precropped: Haar kesitlerini DeepFace'in yeniden tespitine sokmadan sınıflandır
+        
+    Returns:
+        Kullanıma hazır EmotionModel
     """
-    
-    # Duygu renkleri (BGR formatında)
-    emotion_colors = {
-        'happy': (0, 255, 0),      # Yeşil
-        'sad': (255, 0, 0),        # Mavi
-        'angry': (0, 0, 255),      # Kırmızı
-        'surprise': (0, 255, 255), # Sarı
-        'fear': (128, 0, 128),     # Mor
-        'disgust': (0, 128, 128),  # Kahverengi
-        'neutral': (255, 255, 255) # Beyaz
+    emotion_model = EmotionModel(precropped=precropped)
+    load_time, warmup_time = emotion_model.warmup()
+    print(f"Duygu modeli yüklendi: {load_time:.2f} sn, ısınma çıkarımı: {warmup_time:.2f} sn")
+    return emotion_model
+
+
+def face_record(box, result):
+    """Yüz kutusu ve analiz sonucunu kaydedilebilir sözlüğe çevir"""
+    x, y, w, h = box
+    return {
+        'box': [int(x), int(y), int(w), int(h)],
+        'emotion': result['dominant_emotion'] if result else None,
+        'scores': {
+            emo: round(float(score), 2)
+            for emo, score in (result['emotion'] if result else {}).items()
+        }
     }
+
+
+def face_result(face):
+    """face_record() kaydını analyze_batch sonuç biçimine geri çevir"""
+    if face['emotion'] is None:
+        return None
+    return {'dominant_emotion': face['emotion'], 'emotion': face['scores']}
+
+
+def cache_settings(detector, detect_width):
+    """Model dışında sonucu etkileyen ayarlar (önbellek anahtarına katılır)"""
+    return f"detector={detector};detect_width={detect_width}"
+
+
+def annotate_face(image, index, box, result):
+    """
+    Yüzün çevresine duyguya göre renkli kutu ve etiket çiz
     
-    # Duygu Türkçe karşılıkları
-    emotion_tr = {
-        'happy': 'Mutlu',
-        'sad': 'Üzgün',
-        'angry': 'Kızgın',
-        'surprise': 'Şaşkın',
-        'fear': 'Korkmuş',
-        'disgust': 'İğrenmiş',
-        'neutral': 'Nötr'
-    }
+    Args:
+        image: Üzerine çizilecek görüntü
+        index: Yüzün görüntüdeki sırası (1'den başlar)
+        box: (x, y, w, h) yüz kutusu
+        result: analyze_batch sonucu; None ise yalnızca beyaz kutu çizilir
+    """
+    x, y, w, h = box
+    if result is None:
+        # Hata durumunda sadece yüzü işaretle
+        cv2.rectangle(image, (x, y), (x+w, y+h), (255, 255, 255), 2)
+        return
+    
+    emotion = result['dominant_emotion']
+    color = EMOTION_COLORS.get(emotion, (255, 255, 255))
+    
+    # Yüzün etrafına dikdörtgen çiz ve duygu etiketini yaz
+    cv2.rectangle(image, (x, y), (x+w, y+h), color, 3)
+    cv2.putText(
+        image, 
+        f"Yuz #{index}: {EMOTION_TR.get(emotion, emotion)}", 
+        (x, y-10), 
+        cv2.FONT_HERSHEY_SIMPLEX, 
+        0.9, 
+        color, 
+        2
+    )
+
+
+def analyze_image(image_path, precropped=False, emotion_model=None, detect_width=None,
+                  detector='haar', profiler=None, cache=None):
+    """
+    Görüntü dosyasındaki yüzleri tespit et ve duygularını analiz et
+    
+    Args:
+        image_path: Analiz edilecek görüntü dosyasının yolu
+        precropped: Haar kesitlerini DeepFace'in yeniden tespitine sokmadan sınıflandır
+        emotion_model: Önceden yüklenmiş model (verilmezse yüklenip ısıtılır)
+        detect_width: Yüz taraması bu genişliğe küçültülmüş görüntüde yapılır (None = tam çözünürlük)
+        detector: Yüz tespit yöntemi: 'haar', 'lbp' veya 'haar-profile'
+        profiler: Aşama sürelerini ölçen StageProfiler (verilmezse ölçüm yapılmaz)
+        cache: Sonuçları saklayan ResultCache (verilmezse önbellek kullanılmaz)
+    """
+    if profiler is None:
+        profiler = StageProfiler()
     
     # Dosya kontrolü
     if not os.path.exists(image_path):
         print(f"Hata: '{image_path}' dosyası bulunamadı!")
         return
     
-    # Görüntüyü oku
-    image = cv2.imread(image_path)
+    # Görüntüyü oku (önbellek açıksa dosya anahtar için bir kez okunur)
+    profiler.begin()
+    cache_key = None
+    cached_faces = None
+    if cache is not None:
+        with open(image_path, 'rb') as f:
+            content = f.read()
+        cache_key = cache.key(content)
+        cached = cache.get(cache_key)
+        cached_faces = cached['faces'] if cached else None
+        image = cv2.imdecode(np.frombuffer(content, np.uint8), cv2.IMREAD_COLOR)
+    else:
+        image = cv2.imread(image_path)
+    profiler.lap('read')
     
     if image is None:
         print(f"Hata: '{image_path}' görüntüsü yüklenemedi!")
         return
     
+    if cached_faces is None:
+        if emotion_model is None:
+            emotion_model = load_emotion_model(precropped)
+        
+        # Model yükleme ve tespit kurulumu aşamalara sayılmaz
+        face_detector = CascadeFaceDetector(detector, detect_width=detect_width)
+        profiler.skip()
+    
     print(f"Analiz ediliyor: {image_path}")
     print("-" * 60)
     
-    # Yüz tespiti için cascade classifier
-    face_cascade = cv2.CascadeClassifier(
-        cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-    )
-    
-    # Gri tonlamaya çevir
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    
-    # Yüzleri tespit et
-    faces = face_cascade.detectMultiScale(
-        gray, 
-        scaleFactor=1.1, 
-        minNeighbors=5, 
-        minSize=(30, 30)
-    )
+    error = "ön işleme başarısız"
+    if cached_faces is not None:
+        # Aynı içerik aynı ayarlarla analiz edilmiş: tespit ve çıkarım atlanır
+        faces = [tuple(face['box']) for face in cached_faces]
+        results = [face_result(face) for face in cached_faces]
+        print(f"Sonuç önbellekten alındı ({len(faces)} yüz)")
+    else:
+        # Gri tonlamaya çevir
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        profiler.lap('cvtColor')
+        
+        # Yüzleri tespit et
+        faces = face_detector.detect(gray)
+        profiler.lap('detect')
+        det_stats = face_detector.stats()
+        print(f"Yüz tespiti ({det_stats['backend']}): {det_stats['mean_ms']:.1f} ms")
+        
+        # Tüm yüz bölgelerini kes ve tek çağrıda analiz et
+        face_rois = [image[y:y+h, x:x+w] for (x, y, w, h) in faces]
+        profiler.lap('crop')
+        try:
+            results = emotion_model.analyze_batch(face_rois)
+        except Exception as e:
+            results = [None] * len(face_rois)
+            error = str(e)
+        profiler.lap('inference')
+        
+        # Başarısız analizler önbelleğe girmez, sonraki çalıştırmada yeniden denenir
+        if cache is not None and all(result is not None for result in results):
+            cache.put(cache_key, {
+                'width': image.shape[1],
+                'height': image.shape[0],
+                'faces': [face_record(box, result) for box, result in zip(faces, results)]
+            })
     
     if len(faces) == 0:
         print("Görüntüde yüz tespit edilemedi!")
+        profiler.end_frame()
         return
     
     print(f"{len(faces)} adet yüz tespit edildi.\n")
     
     # Her yüz için
-    for i, (x, y, w, h) in enumerate(faces, 1):
-        # Yüz bölgesini kes
-        face_roi = image[y:y+h, x:x+w]
+    for i, ((x, y, w, h), result) in enumerate(zip(faces, results), 1):
+        annotate_face(image, i, (x, y, w, h), result)
+        if result is None:
+            print(f"Yüz #{i} analiz edilemedi: {error}")
+            continue
         
-        try:
-            # DeepFace ile duygu analizi yap
-            result = DeepFace.analyze(
-                face_roi, 
-                actions=['emotion'],
-                enforce_detection=False,
-                silent=True
-            )
-            
-            # Sonuç liste ise ilk elemanı al
-            if isinstance(result, list):
-                result = result[0]
-            
-            # Baskın duyguyu al
-            emotion = result['dominant_emotion']
-            
-            # Renk seç
-            color = emotion_colors.get(emotion, (255, 255, 255))
-            
-            # Türkçe duygu adı
-            emotion_tr_name = emotion_tr.get(emotion, emotion)
-            
-            # Yüzün etrafına dikdörtgen çiz
-            cv2.rectangle(image, (x, y), (x+w, y+h), color, 3)
-            
-            # Duygu etiketini yaz
-            label = f"Yuz #{i}: {emotion_tr_name}"
-            cv2.putText(
-                image, 
-                label, 
-                (x, y-10), 
-                cv2.FONT_HERSHEY_SIMPLEX, 
-                0.9, 
-                color, 
-                2
-            )
-            
-            # Konsola yazdır
-            print(f"Yüz #{i}:")
-            print(f"  Baskın Duygu: {emotion_tr_name}")
-            print(f"  Duygu Dağılımı:")
-            
-            # Duygu skorlarını sırala
-            sorted_emotions = sorted(
-                result['emotion'].items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )
-            
-            for emo, score in sorted_emotions:
-                emo_tr_name = emotion_tr.get(emo, emo)
-                bar = "█" * int(score / 5)
-                print(f"    {emo_tr_name:12s}: {score:5.2f}% {bar}")
-            
-            print()
-                    
-        except Exception as e:
-            print(f"Yüz #{i} analiz edilemedi: {str(e)}")
-            # Hata durumunda sadece yüzü işaretle
-            cv2.rectangle(image, (x, y), (x+w, y+h), (255, 255, 255), 2)
+        # Türkçe duygu adı
+        emotion_tr_name = EMOTION_TR.get(result['dominant_emotion'], result['dominant_emotion'])
+        
+        # Konsola yazdır
+        print(f"Yüz #{i}:")
+        print(f"  Baskın Duygu: {emotion_tr_name}")
+        print(f"  Duygu Dağılımı:")
+        
+        # Duygu skorlarını sırala
+        sorted_emotions = sorted(
+            result['emotion'].items(), 
+            key=lambda x: x[1], 
+            reverse=True
+        )
+        
+        for emo, score in sorted_emotions:
+            emo_tr_name = EMOTION_TR.get(emo, emo)
+            bar = "█" * int(score / 5)
+            print(f"    {emo_tr_name:12s}: {score:5.2f}% {bar}")
+        
+        print()
+    profiler.lap('overlay')
     
     # Sonuç dosyasını kaydet
     output_path = image_path.rsplit('.', 1)[0] + '_analyzed.' + image_path.rsplit('.', 1)[1]
     cv2.imwrite(output_path, image)
+    profiler.lap('write')
+    profiler.end_frame()
     print(f"Analiz edilmiş görüntü kaydedildi: {output_path}")
     
     print(f"\nAnaliz tamamlandı!")
@@ -154,17 +265,467 @@ def analyze_image(image_path):
     print(f"Lütfen '{output_path}' dosyasını bir görüntü görüntüleyici ile açın.")
 
 
+def expand_inputs(patterns, file_list=None):
+    """
+    Dosya, dizin (alt dizinleriyle), glob deseni ve liste dosyasından görüntü yollarını topla
+    
+    Args:
+        patterns: Dosya yolları, dizinler veya glob desenleri
+        file_list: Her satırında bir görüntü yolu olan metin dosyası
+        
+    Returns:
+        Tekrarsız, sıralı görüntü yolları
+    """
+    candidates = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                candidates.extend(os.path.join(root, name) for name in files)
+        elif os.path.isfile(pattern):
+            candidates.append(pattern)
+        else:
+            candidates.extend(glob.glob(pattern, recursive=True))
+    
+    if file_list:
+        with open(file_list, encoding='utf-8') as f:
+            candidates.extend(line.strip() for line in f if line.strip())
+    
+    paths = {
+        path for path in candidates
+        if os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS
+        and not os.path.splitext(path)[0].endswith('_analyzed')
+    }
+    return sorted(paths)
+
+
+def init_batch_worker(detector, detect_width, precropped, threads, cache_path=None,
+                      cache_max_entries=100000, profile=False):
+    """
+    Toplu iş süreci hazırla: cascade, model ve önbellek süreç başına bir kez açılır
+    
+    Args:
+        detector: Yüz tespit yöntemi
+        detect_width: Taramanın yapılacağı genişlik
+        precropped: Kesit modu
+        threads: Süreç başına OpenCV/TensorFlow thread sayısı (None = sınırlama)
+        cache_path: Sonuç önbelleği dosyası (None = önbellek yok)
+        cache_max_entries: Önbellekte saklanacak en fazla sonuç
+        profile: Görüntü başına aşama sürelerini ölç
+    """
+    global worker_face_detector, worker_emotion_model, worker_cache, worker_profiler
+    
+    if threads:
+        # İşçiler birbirinin çekirdeklerini kullanmasın
+        cv2.setNumThreads(threads)
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(threads)
+    
+    worker_profiler = StageProfiler(enabled=profile)
+    worker_face_detector = CascadeFaceDetector(detector, detect_width=detect_width)
+    worker_emotion_model = EmotionModel(precropped=precropped)
+    if cache_path:
+        # Tüm görüntüler önbellekteyse model hiç yüklenmez (bkz. analyze_file)
+        worker_cache = ResultCache(cache_path, worker_emotion_model.version(),
+                                   cache_settings(detector, detect_width), cache_max_entries)
+    else:
+        worker_emotion_model.warmup()
+
+
+def analyze_file(task):
+    """
+    Tek görüntüyü işçi süreçte analiz et
+    
+    Önbellekte sonucu olan görüntüler için tespit ve çıkarım yapılmaz;
+    işaretlenmiş görüntü istenmiyorsa görüntü çözülmez bile.
+    
+    Args:
+        task: (görüntü yolu, işaretlenmiş görüntünün yazılacağı yol ya da None)
+        
+    Returns:
+        Görüntünün kaydı: yol, boyut, yüzler (kutu, baskın duygu, skorlar), hata;
+        ölçüm açıksa 'stages' altında aşama süreleri
+    """
+    path, output_path = task
+    start = time.perf_counter()
+    worker_profiler.begin()
+    record = {'path': path, 'width': None, 'height': None, 'faces': [], 'error': None,
+              'cached': False}
+    
+    cache_key = None
+    if worker_cache is not None:
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            record['error'] = str(e)
+            return record
+        cache_key = worker_cache.key(content)
+        cached = worker_cache.get(cache_key)
+        worker_profiler.lap('cache')
+        if cached is not None:
+            record.update(cached)
+            record['cached'] = True
+            if output_path:
+                image = cv2.imdecode(np.frombuffer(content, np.uint8), cv2.IMREAD_COLOR)
+                for i, face in enumerate(record['faces'], 1):
+                    annotate_face(image, i, face['box'], face_result(face))
+                os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+                cv2.imwrite(output_path, image)
+                worker_profiler.lap('write')
+            return finish_record(record, start)
+        image = cv2.imdecode(np.frombuffer(content, np.uint8), cv2.IMREAD_COLOR)
+    else:
+        image = cv2.imread(path)
+    worker_profiler.lap('read')
+    
+    if image is None:
+        record['error'] = "görüntü yüklenemedi"
+        return record
+    record['height'], record['width'] = image.shape[:2]
+    
+    if worker_emotion_model.model is None:
+        # Önbellekli çalıştırmada model ilk ıskada yüklenir; yükleme aşamalara sayılmaz
+        worker_emotion_model.warmup()
+        worker_profiler.skip()
+    
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    worker_profiler.lap('cvtColor')
+    faces = worker_face_detector.detect(gray)
+    worker_profiler.lap('detect')
+    face_rois = [image[y:y+h, x:x+w] for (x, y, w, h) in faces]
+    worker_profiler.lap('crop')
+    try:
+        results = worker_emotion_model.analyze_batch(face_rois)
+    except Exception as e:
+        results = [None] * len(face_rois)
+        record['error'] = str(e)
+    worker_profiler.lap('inference')
+    
+    for i, (box, result) in enumerate(zip(faces, results), 1):
+        record['faces'].append(face_record(box, result))
+        if output_path:
+            annotate_face(image, i, box, result)
+    worker_profiler.lap('overlay')
+    
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        cv2.imwrite(output_path, image)
+        worker_profiler.lap('write')
+    
+    # Başarısız analizler önbelleğe girmez, sonraki çalıştırmada yeniden denenir
+    if (worker_cache is not None and record['error'] is None
+            and all(face['emotion'] is not None for face in record['faces'])):
+        worker_cache.put(cache_key, {
+            'width': record['width'],
+            'height': record['height'],
+            'faces': record['faces']
+        })
+        worker_profiler.lap('cache')
+    
+    return finish_record(record, start)
+
+
+def finish_record(record, start):
+    """Kayda işlem süresini ve (ölçüm açıksa) aşama sürelerini ekle"""
+    record['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    worker_profiler.end_frame()
+    if worker_profiler.enabled:
+        record['stages'] = worker_profiler.last_frame
+    return record
+
+
+class ResultWriter:
+    def __init__(self, path):
+        """
+        Toplu iş sonuçlarını JSONL (görüntü başına satır) ya da CSV (yüz başına satır) olarak yaz
+        
+        Args:
+            path: Sonuç dosyası; .csv uzantısında CSV, diğerlerinde JSONL yazılır
+        """
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.csv = None
+        if path.lower().endswith('.csv'):
+            self.csv = csv.writer(self.file)
+            self.csv.writerow(['path', 'face', 'x', 'y', 'w', 'h', 'emotion'] + EMOTION_LABELS + ['error'])
+    
+    def write(self, record):
+        """Bir görüntünün kaydını yaz"""
+        if self.csv is None:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return
+        if not record['faces']:
+            self.csv.writerow([record['path'], '', '', '', '', '', ''] +
+                              [''] * len(EMOTION_LABELS) + [record['error'] or ''])
+        for i, face in enumerate(record['faces'], 1):
+            self.csv.writerow(
+                [record['path'], i] + face['box'] + [face['emotion'] or ''] +
+                [face['scores'].get(emo, '') for emo in EMOTION_LABELS] + [record['error'] or '']
+            )
+    
+    def close(self):
+        self.file.close()
+
+
+def analyze_batch_files(paths, workers=1, output_dir=None, results_path='results.jsonl',
+                        detector='haar', detect_width=None, precropped=False, chunksize=8,
+                        progress_interval=5.0, cache_path=None, cache_max_entries=100000,
+                        log=None, profiler=None):
+    """
+    Görüntüleri süreç havuzunda analiz et; sonuçlar girdi sırasıyla yazılır
+    
+    Args:
+        paths: Görüntü yolları
+        workers: İşçi süreç sayısı (1 = havuz kurmadan bu süreçte)
+        output_dir: İşaretlenmiş görüntülerin yazılacağı dizin (None = yazılmaz);
+            girdilerin ortak kökünden itibaren dizin yapısı korunur
+        results_path: Sonuç dosyası (.jsonl ya da .csv)
+        detector: Yüz tespit yöntemi
+        detect_width: Taramanın yapılacağı genişlik
+        precropped: Kesit modu
+        chunksize: İşçiye tek seferde gönderilen görüntü sayısı
+        progress_interval: İlerlemenin kaç saniyede bir yazılacağı
+        cache_path: Sonuç önbelleği dosyası (None = önbellek yok)
+        cache_max_entries: Önbellekte saklanacak en fazla sonuç
+        log: Yüz başına satırların yazılacağı EmotionLog (None = yazılmaz)
+        profiler: İşçilerin ölçtüğü aşama sürelerinin toplanacağı StageProfiler
+            (None ya da kapalıysa ölçüm yapılmaz)
+        
+    Returns:
+        Görüntü, yüz, hata ve önbellek isabeti sayıları, süre ve saniyedeki görüntü sayısı
+    """
+    root = os.path.commonpath([os.path.abspath(os.path.dirname(p)) for p in paths]) if paths else ''
+    tasks = []
+    for path in paths:
+        output_path = None
+        if output_dir:
+            relative = os.path.relpath(os.path.abspath(path), root)
+            stem, ext = os.path.splitext(relative)
+            output_path = os.path.join(output_dir, f"{stem}_analyzed{ext}")
+        tasks.append((path, output_path))
+    
+    # Birden çok işçide her süreç tek thread kullanır, ölçeklenme çekirdek sayısıyla olur
+    profile = profiler is not None and profiler.enabled
+    initargs = (detector, detect_width, precropped, 1 if workers > 1 else None,
+                cache_path, cache_max_entries, profile)
+    
+    writer = ResultWriter(results_path)
+    summary = {'images': 0, 'faces': 0, 'errors': 0, 'cache_hits': 0}
+    start = time.perf_counter()
+    next_progress = start + progress_interval
+    executor = None
+    try:
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_batch_worker,
+                initargs=initargs
+            )
+            records = executor.map(analyze_file, tasks, chunksize=chunksize)
+        else:
+            init_batch_worker(*initargs)
+            records = map(analyze_file, tasks)
+        
+        for record in records:
+            stages = record.pop('stages', None)
+            if stages:
+                profiler.add_frame(stages)
+            writer.write(record)
+            if log is not None and record['faces']:
+                log.write_frame(None, None, record['faces'], record['path'])
+            summary['images'] += 1
+            summary['faces'] += len(record['faces'])
+            summary['errors'] += record['error'] is not None
+            summary['cache_hits'] += record['cached']
+            
+            now = time.perf_counter()
+            if now >= next_progress:
+                next_progress = now + progress_interval
+                rate = summary['images'] / (now - start)
+                remaining = (len(tasks) - summary['images']) / rate
+                print(f"İlerleme: {summary['images']}/{len(tasks)} görüntü, "
+                      f"{rate:.1f} görüntü/sn, kalan ~{remaining:.0f} sn")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        writer.close()
+    
+    summary['elapsed'] = time.perf_counter() - start
+    summary['images_per_second'] = summary['images'] / summary['elapsed'] if summary['elapsed'] else 0.0
+    return summary
+
+
 def main():
     """Ana program"""
-    if len(sys.argv) < 2:
-        print("Kullanım: python image_emotion_detection.py <görüntü_dosyası>")
-        print("\nÖrnek:")
-        print("  python image_emotion_detection.py foto.jpg")
-        print("  python image_emotion_detection.py /home/kullanici/resimler/portre.png")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description='Görüntü dosyasından duygu analizi',
+        epilog=(
+            "Örnek:\n"
+            "  python image_emotion_detection.py foto.jpg\n"
+            "  python image_emotion_detection.py /home/kullanici/resimler/portre.png\n"
+            "  python image_emotion_detection.py fotograflar/ --workers 8 --results sonuc.csv\n"
+            "  python image_emotion_detection.py 'arsiv/**/*.jpg' --output-dir isaretli/"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        'images',
+        nargs='*',
+        help='Görüntü dosyası; birden fazla dosya, dizin veya glob deseni verilirse toplu mod'
+    )
+    parser.add_argument(
+        '--file-list',
+        default=None,
+        help='Toplu mod: her satırında bir görüntü yolu olan metin dosyası'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Toplu mod: işçi süreç sayısı; görüntü sayısını aşmaz (varsayılan: çekirdek sayısı)'
+    )
+    parser.add_argument(
+        '--results',
+        default='results.jsonl',
+        help='Toplu mod: sonuç dosyası, .jsonl ya da .csv (varsayılan: results.jsonl)'
+    )
+    parser.add_argument(
+        '--log',
+        default=None,
+        help='Toplu mod: her yüzü (kutu ve 7 duygu skoru) arka planda bu dosyaya da yaz; .csv, .jsonl ya da .parquet (pyarrow gerekir)'
+    )
+    parser.add_argument(
+        '--log-rotate-mb',
+        type=float,
+        default=0,
+        help='--log dosyası bu boyutu aşınca numaralı yeni dosyaya geç (varsayılan: 0 = döndürme yok)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default=None,
+        help='Toplu mod: işaretlenmiş görüntülerin yazılacağı dizin (varsayılan: yazılmaz)'
+    )
+    parser.add_argument(
+        '--detect-width',
+        type=int,
+        default=None,
+        help='Yüz taraması için görüntünün küçültüleceği genişlik (varsayılan: tam çözünürlük)'
+    )
+    parser.add_argument(
+        '--precropped',
+        action='store_true',
+        help='Yüz kesitlerini yeniden tespit etmeden doğrudan sınıflandır'
+    )
+    parser.add_argument(
+        '--cache',
+        default=None,
+        help='Sonuç önbelleği dosyası, ör. emotion_cache.sqlite; aynı içerikli görüntüler yeniden analiz edilmez'
+    )
+    parser.add_argument(
+        '--cache-max-entries',
+        type=int,
+        default=100000,
+        help='Önbellekte saklanacak en fazla sonuç; aşılınca en eski kullanılanlar silinir (varsayılan: 100000)'
+    )
+    parser.add_argument(
+        '--clear-cache',
+        action='store_true',
+        help='Başlamadan önce önbelleği boşalt'
+    )
+    parser.add_argument(
+        '--detector',
+        choices=available_backends(),
+        default='haar',
+        help='Yüz tespit yöntemi; lbp, lbpcascade_frontalface_improved.xml cascades/ klasörüne konunca seçilebilir (varsayılan: haar)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Aşama sürelerini ölç (toplu modda tüm işçilerin görüntüleri birlikte); özeti yaz ve JSON rapor kaydet'
+    )
+    parser.add_argument(
+        '--profile-report',
+        default=None,
+        help='Ölçüm raporu dosyası (varsayılan: profile_TARIH_SAAT.json)'
+    )
+    args = parser.parse_args()
+    
+    if not args.images and not args.file_list:
+        parser.error("en az bir görüntü, dizin ya da --file-list gerekli")
     
-    image_path = sys.argv[1]
-    analyze_image(image_path)
+    # Önbellek model sürümüyle açılır; sürüm ağırlık dosyasının özetinden hesaplanır,
+    # model yalnızca önbellekte sonucu olmayan ilk görüntüde yüklenir
+    cache = None
+    if args.cache:
+        cache = ResultCache(args.cache, EmotionModel(precropped=args.precropped).version(),
+                            cache_settings(args.detector, args.detect_width), args.cache_max_entries)
+        if args.clear_cache:
+            cache.clear()
+    
+    # Toplu modda işçilerin ölçtüğü aşama süreleri bu süreçte toplanır
+    profiler = StageProfiler(enabled=args.profile)
+    log_ok = True
+    
+    # Tek dosya verildiyse ayrıntılı tek görüntü analizi, aksi halde toplu mod
+    if len(args.images) != 1 or args.file_list or not os.path.isfile(args.images[0]):
+        paths = expand_inputs(args.images, args.file_list)
+        if not paths:
+            print("Hata: Görüntü bulunamadı!")
+            return
+        log = None
+        if args.log:
+            try:
+                log = EmotionLog(args.log, rotate_bytes=int(args.log_rotate_mb * 1024 * 1024))
+            except ImportError as e:
+                print(f"Hata: {e}")
+                return
+        # Her işçi TensorFlow yüklediğinden görüntüden fazla işçi açılmaz
+        workers = min(args.workers or os.cpu_count() or 1, len(paths))
+        print(f"{len(paths)} görüntü, {workers} işçi süreç")
+        print("-" * 60)
+        summary = analyze_batch_files(
+            paths,
+            workers=workers,
+            output_dir=args.output_dir,
+            results_path=args.results,
+            detector=args.detector,
+            detect_width=args.detect_width,
+            precropped=args.precropped,
+            cache_path=args.cache,
+            cache_max_entries=args.cache_max_entries,
+            log=log,
+            profiler=profiler
+        )
+        print(f"\n{summary['images']} görüntü, {summary['faces']} yüz, {summary['errors']} hata; "
+              f"{summary['elapsed']:.1f} sn ({summary['images_per_second']:.1f} görüntü/sn)")
+        print(f"Sonuçlar: {args.results}")
+        if log is not None:
+            log_ok = close_log(log)
+        if args.output_dir:
+            print(f"İşaretlenmiş görüntüler: {args.output_dir}")
+        if cache is not None:
+            misses = summary['images'] - summary['cache_hits']
+            hit_rate = summary['cache_hits'] / summary['images'] if summary['images'] else 0.0
+            print(f"Önbellek: {summary['cache_hits']} isabet, {misses} ıska (%{hit_rate * 100:.1f}), "
+                  f"{cache.stats()['entries']} kayıt")
+            cache.close()
+    else:
+        analyze_image(args.images[0], precropped=args.precropped,
+                      detect_width=args.detect_width, detector=args.detector, profiler=profiler,
+                      cache=cache)
+        if cache is not None:
+            stats = cache.stats()
+            print(f"Önbellek: {stats['hits']} isabet, {stats['misses']} ıska, {stats['entries']} kayıt")
+            cache.close()
+    
+    profiler.print_summary()
+    report_path = profiler.save_report(args.profile_report)
+    if report_path:
+        print(f"Ölçüm raporu kaydedildi: {report_path}")
+    if not log_ok:
+        # Duygu kaydı yazılamadı
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arka Plan Çıkarım İşçisi
+Duygu modelini görüntü yakalama/gösterme döngüsünden ayrı bir thread'de çalıştırır.
+"""
+
+import queue
+import threading
+
+
+class InferenceWorker:
+    def __init__(self, emotion_model, max_pending=2):
+        """
+        Sınırlı kuyruktan beslenen arka plan çıkarım thread'i
+
+        Args:
+            emotion_model: Yüklenmiş EmotionModel
+            max_pending: Kuyrukta bekleyebilecek en fazla istek (frame) sayısı
+        """
+        self.emotion_model = emotion_model
+        self.requests = queue.Queue(maxsize=max_pending)
+        self.results = queue.Queue()
+        self.running = False
+        self.thread = None
+
+        # İstatistikler
+        self.submitted = 0
+        self.rejected = 0  # Kuyruk dolu olduğu için sonraki frame'e kalan istekler
+
+    def start(self):
+        """İşçi thread'ini başlat"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="inference-worker", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=2.0):
+        """İşçi thread'ini durdur"""
+        if not self.running:
+            return
+        self.running = False
+        try:
+            self.requests.put_nowait(None)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+
+    def submit(self, frame_index, jobs):
+        """
+        Bir frame'in yüzlerini analize gönder (beklemeden)
+
+        Args:
+            frame_index: Yüzlerin kesildiği frame numarası
+            jobs: (anahtar, yüz bölgesi) çiftleri; yüz bölgeleri kopyalanmış olmalı
+
+        Returns:
+            Kuyruk doluysa False
+        """
+        try:
+            self.requests.put_nowait((frame_index, jobs))
+        except queue.Full:
+            self.rejected += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def collect(self):
+        """
+        Hazır sonuçları beklemeden topla
+
+        Returns:
+            (frame numarası, anahtar, sonuç) listesi; sonuç başarısızsa None
+        """
+        collected = []
+        while True:
+            try:
+                collected.append(self.results.get_nowait())
+            except queue.Empty:
+                return collected
+
+    def pending(self):
+        """Kuyrukta bekleyen istek sayısı"""
+        return self.requests.qsize()
+
+    def _run(self):
+        while self.running:
+            request = self.requests.get()
+            if request is None:
+                break
+
+            frame_index, jobs = request
+            keys = [key for key, _ in jobs]
+            face_rois = [face_roi for _, face_roi in jobs]
+            try:
+                results = self.emotion_model.analyze_batch(face_rois)
+            except Exception:
+                results = [None] * len(face_rois)
+
+            for key, result in zip(keys, results):
+                self.results.put((frame_index, key, result))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prometheus Metrikleri
+Bağımlılıksız, düşük maliyetli sayaç ve histogramlar; /metrics için Prometheus
+metin biçiminde çıktı üretir.
+"""
+
+import bisect
+import threading
+
+
+# Frame aşamaları için varsayılan histogram sınırları (saniye)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+
+def escape_label(value):
+    """Etiket değerindeki ters bölü, tırnak ve satır sonlarını kaçır"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labelnames, labelvalues, extra=None):
+    """Etiketleri {ad="değer",...} biçimine çevir"""
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Yalnızca artan sayaç
+
+        Args:
+            name: Metrik adı
+            documentation: HELP açıklaması
+            labelnames: Etiket adları
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, labels=()):
+        """Sayacı artır (labels: etiket değerleri, labelnames ile aynı sırada)"""
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            items = sorted(self.values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """
+        Sabit sınırlı histogram (gözlem başına bir ikili arama)
+
+        Args:
+            name: Metrik adı
+            documentation: HELP açıklaması
+            labelnames: Etiket adları
+            buckets: Artan sırada üst sınırlar (+Inf otomatik eklenir)
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}  # etiketler -> [kova sayıları, toplam, adet]
+        self.lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        """Bir gözlem ekle"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self.series[labels] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            items = sorted((labels, [list(s[0]), s[1], s[2]]) for labels, s in self.series.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                label_text = format_labels(self.labelnames, labels, ('le', format_value(bound)))
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class CallbackMetric:
+    def __init__(self, name, documentation, callback, kind='gauge', labelnames=()):
+        """
+        Değeri okuma anında bir fonksiyondan alınan metrik
+
+        Args:
+            name: Metrik adı
+            documentation: HELP açıklaması
+            callback: Sayı ya da {etiket değerleri: sayı} döndüren fonksiyon
+            kind: 'gauge' veya 'counter'
+            labelnames: Etiket adları
+        """
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        value = self.callback()
+        if value is None:
+            return lines
+        items = sorted(value.items()) if isinstance(value, dict) else [((), value)]
+        for labels, item in items:
+            lines.append(f"{self.name}{format_labels(self.labelnames, labels)} {format_value(item)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Metrikleri toplayıp Prometheus metin biçiminde yazan kayıt"""
+        self.metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name, documentation, callback, kind='gauge', labelnames=()):
+        return self.register(CallbackMetric(name, documentation, callback, kind, labelnames))
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Tüm metrikleri Prometheus metin biçiminde döndür"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hareket Kapısı
+Küçültülmüş gri görüntüde frame farkı alarak sahnede hareket olup olmadığını
+ucuzca belirler; hareketsiz frame'lerde yüz tespiti ve duygu analizi atlanır.
+"""
+
+import cv2
+
+
+class MotionGate:
+    def __init__(self, min_changed=0.005, pixel_threshold=25, width=160, refresh_interval=300):
+        """
+        Frame farkına dayalı hareket kapısı
+
+        Karşılaştırma son işlenen frame ile yapılır; yavaş değişimler birikir ve
+        sonunda eşiği aşar.
+
+        Args:
+            min_changed: Değişen piksellerin oranı bunun üzerindeyse hareket var sayılır
+            pixel_threshold: Bir pikselin değişmiş sayılması için gereken gri düzey farkı
+            width: Karşılaştırmanın yapıldığı genişlik (küçük = ucuz)
+            refresh_interval: Hareket olmasa da en geç bu kadar frame'de bir işle (0 = hiçbir zaman)
+        """
+        self.min_changed = min_changed
+        self.pixel_threshold = pixel_threshold
+        self.width = width
+        self.refresh_interval = refresh_interval
+
+        self.reference = None    # Son işlenen frame'in küçültülmüş gri hali
+        self.since_processed = 0
+
+        # İstatistikler
+        self.frames = 0
+        self.skipped = 0
+        self.refreshes = 0
+
+    def prepare(self, frame):
+        """Frame'i karşılaştırma için küçült, griye çevir ve gürültüyü bastır"""
+        height = max(1, round(frame.shape[0] * self.width / frame.shape[1]))
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def check(self, frame):
+        """
+        Frame işlenmeli mi?
+
+        Args:
+            frame: BGR frame
+
+        Returns:
+            Hareket varsa (ya da yenileme zamanı geldiyse) True, frame atlanabilirse False
+        """
+        self.frames += 1
+        small = self.prepare(frame)
+
+        if self.reference is None or self.reference.shape != small.shape:
+            moved = True
+        else:
+            diff = cv2.absdiff(small, self.reference)
+            changed = cv2.countNonZero(cv2.threshold(diff, self.pixel_threshold, 255,
+                                                     cv2.THRESH_BINARY)[1])
+            moved = changed >= self.min_changed * diff.size
+
+        if not moved and self.refresh_interval and self.since_processed + 1 >= self.refresh_interval:
+            moved = True
+            self.refreshes += 1
+
+        if moved:
+            self.reference = small
+            self.since_processed = 0
+        else:
+            self.since_processed += 1
+            self.skipped += 1
+        return moved
+
+    def reset(self):
+        """Karşılaştırma frame'ini unut; sıradaki frame işlenir (istatistikler korunur)"""
+        self.reference = None
+        self.since_processed = 0
+
+    def stats(self):
+        """
+        Kapı istatistikleri
+
+        Returns:
+            Toplam, atlanan ve yenileme için işlenen frame sayıları, atlanma oranı
+        """
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'refreshes': self.refreshes,
+            'skip_rate': self.skipped / self.frames if self.frames else 0.0
+        }
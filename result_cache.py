@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İçerik Adresli Sonuç Önbelleği
+Görüntü analiz sonuçlarını (yüz kutuları ve duygu skorları) dosya içeriğinin
+özeti ve analiz ayarlarıyla anahtarlanmış olarak diskte saklar. Aynı dosya
+aynı ayarlarla yeniden analiz edildiğinde çözme, tespit ve çıkarım atlanır.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+
+
+class ResultCache:
+    def __init__(self, path, model_version, settings='', max_entries=100000):
+        """
+        SQLite tabanlı, en eski kullanılan kaydı silen (LRU) sonuç önbelleği
+
+        Birden fazla süreç aynı dosyayı aynı anda açabilir. Model sürümü
+        kayıtlı sürümden farklıysa önbellek açılışta boşaltılır.
+
+        Args:
+            path: Önbellek dosyası
+            model_version: Model sürümü (EmotionModel.version())
+            settings: Sonucu etkileyen diğer ayarlar (ör. tespit yöntemi ve genişliği)
+            max_entries: Saklanacak en fazla kayıt; aşılınca en eski kullanılanlar silinir
+        """
+        self.path = path
+        self.model_version = model_version
+        self.settings = settings
+        self.max_entries = max_entries
+
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+
+        # Model değiştiyse eski sonuçlar geçersizdir
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'model_version'").fetchone()
+        if row is None or row[0] != model_version:
+            with self.db:
+                self.db.execute("DELETE FROM results")
+                self.db.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('model_version', ?)",
+                    (model_version,)
+                )
+
+        self.entries = self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, content):
+        """
+        Dosya içeriği, model sürümü ve ayarlardan önbellek anahtarı üret
+
+        Args:
+            content: Görüntü dosyasının baytları
+
+        Returns:
+            Onaltılık anahtar
+        """
+        digest = hashlib.blake2b(content, digest_size=20)
+        digest.update(f"\0{self.model_version}\0{self.settings}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Kayıtlı sonucu döndür ve son kullanım zamanını güncelle
+
+        Returns:
+            put() ile kaydedilen sonuç (ör. boyut ve yüz listesi); kayıt yoksa None
+        """
+        row = self.db.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        with self.db:
+            self.db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        """Sonucu (JSON'a çevrilebilir) kaydet; kapasite aşılırsa en eski kullanılan kayıtları sil"""
+        with self.db:
+            inserted = self.db.execute(
+                "INSERT OR REPLACE INTO results (key, result, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(result), time.time())
+            ).rowcount
+            self.entries += inserted
+            if self.entries > self.max_entries:
+                # Her eklemede silmemek için kapasitenin %10'u kadar fazladan yer aç
+                self.entries = self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+                excess = self.entries - int(self.max_entries * 0.9)
+                if excess > 0:
+                    self.db.execute(
+                        "DELETE FROM results WHERE key IN "
+                        "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                        (excess,)
+                    )
+                    self.entries -= excess
+                    self.evictions += excess
+
+    def clear(self):
+        """Tüm kayıtları sil"""
+        with self.db:
+            self.db.execute("DELETE FROM results")
+        self.entries = 0
+
+    def stats(self):
+        """
+        Önbellek istatistikleri
+
+        Returns:
+            İsabet, ıska, isabet oranı, silinen ve kayıtlı sonuç sayıları
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            # Diğer süreçlerin eklediği kayıtlar da sayılsın
+            'entries': self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        }
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Aşama Süresi Ölçümü
+Her frame'in aşamalarını (okuma, gri ton, tespit, kesme, çıkarım, çizim,
+yazma/gösterme) ölçer; çıkışta yüzdelik özet ve JSON rapor üretir.
+"""
+
+import json
+import time
+from datetime import datetime
+
+import cv2
+
+from analysis_scheduler import FrameTimeStats
+
+
+class StageProfiler:
+    def __init__(self, enabled=False, window=10000):
+        """
+        Frame başına aşama süreleri
+
+        Kapalıyken tüm çağrılar hemen döner, ölçüm maliyeti yoktur.
+
+        Args:
+            enabled: Ölçüm açık mı (--profile)
+            window: Aşama başına saklanan en son ölçüm sayısı
+        """
+        self.enabled = enabled
+        self.window = window
+        self.stages = {}        # Aşama adı -> FrameTimeStats (ilk görülme sırasıyla)
+        self.current = {}       # Bu frame'in aşama süreleri (saniye)
+        self.last_frame = {}    # Son tamamlanan frame'in aşama süreleri (HUD için)
+        self.frame_start = None
+        self.last = None
+        self.skipped = 0.0      # Bu frame'de hiçbir aşamaya yazılmayan süre
+        self.frames = 0
+
+    def begin(self):
+        """Yeni frame'in ölçümünü başlat"""
+        if not self.enabled:
+            return
+        self.frame_start = self.last = time.perf_counter()
+        self.current = {}
+        self.skipped = 0.0
+
+    def lap(self, stage):
+        """Son işaretten bu yana geçen süreyi aşamaya yaz"""
+        if not self.enabled or self.last is None:
+            return
+        now = time.perf_counter()
+        self.current[stage] = self.current.get(stage, 0.0) + (now - self.last)
+        self.last = now
+
+    def skip(self):
+        """Son işaretten bu yana geçen süreyi hiçbir aşamaya (toplama da) yazma"""
+        if not self.enabled or self.last is None:
+            return
+        now = time.perf_counter()
+        self.skipped += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        """Frame'i tamamla ve aşama sürelerini kaydet"""
+        if not self.enabled or self.frame_start is None:
+            return
+        self.current['total'] = time.perf_counter() - self.frame_start - self.skipped
+        self.add_frame(self.current)
+        self.current = {}
+        self.frame_start = self.last = None
+
+    def add_frame(self, stages):
+        """
+        Tamamlanmış bir frame'in aşama sürelerini kaydet
+
+        Başka süreçlerde (ör. toplu iş işçilerinde) ölçülen frame'leri tek özette
+        toplamak için de kullanılır.
+
+        Args:
+            stages: {aşama: saniye}, 'total' dahil
+        """
+        if not self.enabled:
+            return
+        for stage, seconds in stages.items():
+            if stage not in self.stages:
+                self.stages[stage] = FrameTimeStats(self.window)
+            self.stages[stage].add(seconds)
+        self.last_frame = stages
+        self.frames += 1
+
+    def summary(self):
+        """
+        Aşama başına özet (milisaniye)
+
+        Returns:
+            {aşama: {'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}}
+        """
+        summary = {}
+        for stage, stats in self.stages.items():
+            samples = stats.samples
+            summary[stage] = {
+                'count': len(samples),
+                'mean_ms': sum(samples) / len(samples) * 1000 if samples else 0.0,
+                'p50_ms': stats.percentile(50),
+                'p95_ms': stats.percentile(95),
+                'p99_ms': stats.percentile(99),
+                'max_ms': max(samples) * 1000 if samples else 0.0
+            }
+        return summary
+
+    def print_summary(self):
+        """Aşama tablosunu konsola yazdır"""
+        if not self.enabled or not self.stages:
+            return
+        print()
+        print(f"Aşama süreleri ({self.frames} frame, ms)")
+        print("-" * 66)
+        print(f"{'Aşama':12s} | {'Adet':>6} | {'Ort.':>7} | {'p50':>7} | "
+              f"{'p95':>7} | {'p99':>7} | {'En yüksek':>9}")
+        print("-" * 66)
+        for stage, stats in self.summary().items():
+            print(f"{stage:12s} | {stats['count']:6d} | {stats['mean_ms']:7.2f} | "
+                  f"{stats['p50_ms']:7.2f} | {stats['p95_ms']:7.2f} | {stats['p99_ms']:7.2f} | "
+                  f"{stats['max_ms']:9.2f}")
+
+    def save_report(self, path=None, extra=None):
+        """
+        Özeti JSON dosyasına kaydet
+
+        Args:
+            path: Rapor dosyası (verilmezse profile_TARIH_SAAT.json)
+            extra: Rapora eklenecek ek bilgiler (ör. komut satırı seçenekleri)
+
+        Returns:
+            Kaydedilen dosyanın yolu (ölçüm kapalıysa None)
+        """
+        if not self.enabled:
+            return None
+        if path is None:
+            path = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        report = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'frames': self.frames,
+            'stages': self.summary()
+        }
+        if extra:
+            report.update(extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return path
+
+    def draw_hud(self, frame, origin=(10, 10)):
+        """
+        Son frame'in aşama sürelerini görüntünün köşesine çiz
+
+        Args:
+            frame: Üzerine çizilecek görüntü
+            origin: Kutunun sol üst köşesi
+        """
+        if not self.enabled or not self.last_frame:
+            return
+        x, y = origin
+        line_height = 16
+        height = line_height * len(self.last_frame) + 8
+        cv2.rectangle(frame, (x, y), (x + 170, y + height), (0, 0, 0), -1)
+        for i, (stage, seconds) in enumerate(self.last_frame.items()):
+            cv2.putText(
+                frame,
+                f"{stage:10s} {seconds * 1000:6.1f} ms",
+                (x + 6, y + 16 + i * line_height),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.42,
+                (0, 255, 255) if stage == 'total' else (255, 255, 255),
+                1
+            )
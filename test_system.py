@@ -128,6 +128,419 @@ def test_deepface_model():
     return True
 
 
+def check(condition, message):
+    """Tek bir koşulu ✓/✗ olarak yazdır"""
+    print(f"{'✓' if condition else '✗'} {message}")
+    return condition
+
+
+def test_face_tracker():
+    """Yüz takipçisinin IoU ve hız tahminiyle eşleştirmesini test et"""
+    print("=" * 60)
+    print("5. Yüz Takipçisi Testi")
+    print("=" * 60)
+    
+    try:
+        from face_tracker import FaceTracker, box_iou
+        
+        ok = check(box_iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0, "Aynı kutuların IoU'su 1")
+        ok = check(box_iou((0, 0, 10, 10), (20, 20, 10, 10)) == 0.0, "Ayrık kutuların IoU'su 0") and ok
+        
+        tracker = FaceTracker(iou_threshold=0.3, max_missed=2)
+        first = tracker.update([(100, 100, 50, 50), (300, 100, 50, 50)], 0)
+        ok = check(len({t.track_id for t in first}) == 2, "İki yüze ayrı takip numarası verildi") and ok
+        
+        # Sağa frame başına 20 piksel kayan yüz aynı takipte kalmalı
+        for i in range(1, 4):
+            tracks = tracker.update([(100 + 20 * i, 100, 50, 50)], i)
+        ok = check(tracks[0].track_id == first[0].track_id, "Kayan yüz aynı takipte kaldı") and ok
+        ok = check(tracks[0].velocity[0] > 0, f"Hız tahmini sağa doğru ({tracks[0].velocity[0]:.1f} px/frame)") and ok
+        
+        # Bir frame görülmeyip 40 piksel ileride çıkan yüz: ham IoU eşiğin altında,
+        # hız tahmini ise doğru kutuyu bulmalı
+        last_box = tracks[0].box
+        tracker.update([], 4)
+        moved_box = (last_box[0] + 40, 100, 50, 50)
+        ok = check(box_iou(last_box, moved_box) < tracker.iou_threshold,
+                   "Kaçırılan frame sonrası ham IoU eşiğin altında") and ok
+        tracks = tracker.update([moved_box], 5)
+        ok = check(tracks[0].track_id == first[0].track_id,
+                   "Hız tahmini kaçırılan frame sonrası yüzü eşleştirdi") and ok
+        
+        # Uzun süre görülmeyen ikinci yüzün takibi silinmiş olmalı
+        ok = check(all(t.track_id != first[1].track_id for t in tracker.tracks),
+                   "Kaybolan yüzün takibi silindi") and ok
+        tracks = tracker.update([(600, 400, 50, 50)], 6)
+        ok = check(tracks[0].track_id not in (first[0].track_id, first[1].track_id),
+                   "Yeni konumdaki yüz yeni takip başlattı") and ok
+        if not ok:
+            return False
+    except Exception as e:
+        print(f"✗ Takipçi hatası: {e}")
+        return False
+    
+    print()
+    return True
+
+
+def test_analysis_scheduler():
+    """Analiz zamanlayıcısının bütçe ve sıralamasını test et"""
+    print("=" * 60)
+    print("6. Analiz Zamanlayıcısı Testi")
+    print("=" * 60)
+    
+    try:
+        from face_tracker import FaceTracker
+        from analysis_scheduler import AnalysisScheduler
+        
+        tracker = FaceTracker(result_ttl=3)
+        scheduler = AnalysisScheduler(tracker, max_per_frame=1)
+        boxes = [(100 * i, 0, 50, 50) for i in range(3)]
+        
+        analyzed = []
+        for frame_index in range(3):
+            tracks = tracker.update(boxes, frame_index)
+            selected = scheduler.select(tracks, frame_index)
+            for track in selected:
+                track.analyzed_frame = frame_index
+            analyzed.append([t.track_id for t in selected])
+        ok = check(all(len(ids) == 1 for ids in analyzed), "Frame başına en fazla bir yüz analiz edildi")
+        ok = check(sorted(sum(analyzed, [])) == [1, 2, 3],
+                   "Üç yüz ardışık frame'lere yayıldı") and ok
+        ok = check(scheduler.deferred == 3, f"Sonraki frame'e kalan analiz: {scheduler.deferred}") and ok
+        
+        # Sonucu en eski olan yüz önce yenilenir
+        tracks = tracker.update(boxes, 3)
+        selected = scheduler.select(tracks, 3)
+        ok = check([t.track_id for t in selected] == [analyzed[0][0]],
+                   "Süresi dolan en eski sonuç önce yenilendi") and ok
+        
+        # Yüz sayısı tüm yüzleri bir aralıkta yenilemeye yetmezse bütçe büyür
+        crowded = FaceTracker(result_ttl=3)
+        tracks = crowded.update([(100 * i, 0, 50, 50) for i in range(7)], 0)
+        selected = AnalysisScheduler(crowded, max_per_frame=1).select(tracks, 0)
+        ok = check(len(selected) == 3, f"7 yüz ve 3 frame aralık için bütçe: {len(selected)}") and ok
+        if not ok:
+            return False
+    except Exception as e:
+        print(f"✗ Zamanlayıcı hatası: {e}")
+        return False
+    
+    print()
+    return True
+
+
+def test_inference_worker():
+    """Arka plan çıkarım işçisinin kuyruk, sonuç ve durdurma davranışını test et"""
+    print("=" * 60)
+    print("7. Arka Plan Çıkarım İşçisi Testi")
+    print("=" * 60)
+    
+    try:
+        import threading
+        import time
+        import numpy as np
+        from inference_worker import InferenceWorker
+        
+        class BlockingModel:
+            # İzin verilene kadar çıkarımı bekleten sahte model
+            def __init__(self):
+                self.release = threading.Event()
+            
+            def analyze_batch(self, face_rois):
+                self.release.wait(5.0)
+                return [{'dominant_emotion': 'happy'} for _ in face_rois]
+        
+        model = BlockingModel()
+        worker = InferenceWorker(model, max_pending=1)
+        worker.start()
+        face = np.zeros((48, 48, 3), dtype=np.uint8)
+        
+        ok = check(worker.submit(0, [('a', face)]), "İlk istek kabul edildi")
+        # İşçi ilk isteği alıp modelde beklerken kuyrukta bir yer var
+        deadline = time.time() + 5.0
+        while worker.pending() and time.time() < deadline:
+            time.sleep(0.01)
+        ok = check(worker.submit(1, [('b', face), ('c', face)]), "İkinci istek kuyruğa alındı") and ok
+        ok = check(not worker.submit(2, [('d', face)]) and worker.rejected == 1,
+                   "Kuyruk doluyken submit False döndürdü") and ok
+        
+        model.release.set()
+        collected = []
+        deadline = time.time() + 5.0
+        while len(collected) < 3 and time.time() < deadline:
+            collected.extend(worker.collect())
+            time.sleep(0.01)
+        ok = check(sorted((frame, key) for frame, key, _ in collected) == [(0, 'a'), (1, 'b'), (1, 'c')],
+                   f"collect biten {len(collected)} sonucu döndürdü") and ok
+        ok = check(all(result['dominant_emotion'] == 'happy' for _, _, result in collected),
+                   "Sonuçlar modelin çıktısı") and ok
+        ok = check(worker.collect() == [], "Toplanan sonuçlar yeniden dönmedi") and ok
+        
+        worker.stop()
+        ok = check(not worker.thread.is_alive(), "stop işçi thread'ini bekleyip durdurdu") and ok
+        if not ok:
+            return False
+    except Exception as e:
+        print(f"✗ Çıkarım işçisi hatası: {e}")
+        return False
+    
+    print()
+    return True
+
+
+def test_incremental_detector():
+    """Artımlı tespitin tam tarama sayısını boş ve dolu sahnede test et"""
+    print("=" * 60)
+    print("8. Artımlı Yüz Tespiti Testi")
+    print("=" * 60)
+    
+    try:
+        import numpy as np
+        from face_detection import IncrementalFaceDetector
+        
+        def detect_white(gray):
+            # Beyaz kareyi yüz sayan sahte tespit (pencere içinde de çalışır)
+            ys, xs = np.nonzero(gray == 255)
+            if len(xs) == 0:
+                return []
+            return [(xs.min(), ys.min(), xs.max() - xs.min() + 1, ys.max() - ys.min() + 1)]
+        
+        empty = np.zeros((240, 320), dtype=np.uint8)
+        detector = IncrementalFaceDetector(detect_white, full_scan_interval=10)
+        for _ in range(20):
+            detector.detect(empty)
+        stats = detector.stats()
+        ok = check(stats['full_scans'] == 4 and stats['idle_frames'] == 16,
+                   f"Boş sahnede 20 frame: {stats['full_scans']} tam tarama, "
+                   f"{stats['idle_frames']} taranmayan frame")
+        
+        populated = empty.copy()
+        populated[80:120, 100:140] = 255
+        detector = IncrementalFaceDetector(detect_white, full_scan_interval=10)
+        for _ in range(22):
+            faces = detector.detect(populated)
+        stats = detector.stats()
+        ok = check(stats['full_scans'] == 2 and stats['roi_scans'] == 20,
+                   f"Yüzlü sahnede 22 frame: {stats['full_scans']} tam tarama, "
+                   f"{stats['roi_scans']} pencere taraması") and ok
+        ok = check([tuple(box) for box in faces] == [(100, 80, 40, 40)],
+                   "Pencere taramasında kutu tam frame koordinatında") and ok
+        
+        # Yüz sahneye girince en geç full_scan_interval // 2 frame içinde bulunur
+        detector = IncrementalFaceDetector(detect_white, full_scan_interval=10)
+        detector.detect(empty)
+        found_after = None
+        for i in range(1, 10):
+            if len(detector.detect(populated)):
+                found_after = i
+                break
+        ok = check(found_after is not None and found_after <= 5,
+                   f"Sahneye giren yüz {found_after}. frame'de bulundu") and ok
+        
+        detector.reset()
+        ok = check(len(detector.detect(populated)) == 1 and detector.stats()['full_scans'] == 3,
+                   "reset() sonrası ilk frame tam tarandı") and ok
+        if not ok:
+            return False
+    except Exception as e:
+        print(f"✗ Artımlı tespit hatası: {e}")
+        return False
+    
+    print()
+    return True
+
+
+def test_result_cache():
+    """Sonuç önbelleğinin LRU silmesini ve model sürümü kontrolünü test et"""
+    print("=" * 60)
+    print("9. Sonuç Önbelleği Testi")
+    print("=" * 60)
+    
+    try:
+        import shutil
+        import tempfile
+        import time
+        from result_cache import ResultCache
+        
+        workdir = tempfile.mkdtemp(prefix='emotion_test_')
+        try:
+            path = os.path.join(workdir, 'cache.sqlite')
+            cache = ResultCache(path, 'v1', max_entries=10)
+            for i in range(10):
+                cache.put(f"k{i}", {'faces': i})
+                time.sleep(0.002)  # Son kullanım zamanları ayrışsın
+            
+            # k0 kullanılınca en eski kayıt k1 olur
+            ok = check(cache.get('k0') == {'faces': 0}, "Kayıtlı sonuç okundu")
+            time.sleep(0.002)
+            cache.put('k10', {'faces': 10})
+            
+            stats = cache.stats()
+            ok = check(stats['entries'] == 9 and stats['evictions'] == 2,
+                       f"Kapasite aşılınca %10 yer açıldı ({stats['entries']} kayıt, "
+                       f"{stats['evictions']} silinen)") and ok
+            ok = check(cache.get('k1') is None and cache.get('k2') is None,
+                       "En eski kullanılan kayıtlar silindi") and ok
+            ok = check(cache.get('k0') is not None and cache.get('k10') is not None,
+                       "Yeni kullanılan ve eklenen kayıtlar korundu") and ok
+            cache.close()
+            
+            cache = ResultCache(path, 'v2', max_entries=10)
+            ok = check(cache.stats()['entries'] == 0, "Model sürümü değişince önbellek boşaltıldı") and ok
+            cache.close()
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        if not ok:
+            return False
+    except Exception as e:
+        print(f"✗ Önbellek hatası: {e}")
+        return False
+    
+    print()
+    return True
+
+
+def test_crop_change_filter():
+    """Değişmeyen yüzlerde sonucun yeniden kullanılmasını test et"""
+    print("=" * 60)
+    print("10. Yüz Değişim Filtresi Testi")
+    print("=" * 60)
+    
+    try:
+        import numpy as np
+        from face_tracker import Track
+        from analysis_scheduler import CropChangeFilter
+        
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 255, (240, 320, 3), dtype=np.uint8)
+        change_filter = CropChangeFilter(threshold=2.5, max_age=10)
+        
+        track = Track(1, (100, 80, 64, 64), 0)
+        ok = check(change_filter.filter([track], frame, 0) == [track],
+                   "Sonucu olmayan yüz analize gönderildi")
+        track.emotion = {'label': 'happy'}
+        change_filter.record(track, frame, 0)
+        
+        # Aynı görüntü ve hafif parlaklık kayması değişiklik sayılmaz
+        brighter = np.clip(frame.astype(np.int16) + 10, 0, 255).astype(np.uint8)
+        ok = check(change_filter.filter([track], brighter, 1) == [], "Değişmeyen yüzün sonucu yeniden kullanıldı") and ok
+        ok = check(track.analyzed_frame == 1, "Yeniden kullanılan sonucun frame'i güncellendi") and ok
+        
+        changed = frame.copy()
+        changed[80:144, 100:164] = rng.integers(0, 255, (64, 64, 3), dtype=np.uint8)
+        ok = check(change_filter.filter([track], changed, 2) == [track], "Değişen yüz analize gönderildi") and ok
+        ok = check(change_filter.filter([track], frame, 10) == [track],
+                   "max_age dolunca değişmeyen yüz de analiz edildi") and ok
+        
+        stats = change_filter.stats()
+        ok = check(stats['checks'] == 2 and stats['reused'] == 1,
+                   f"İstatistikler: {stats['checks']} karşılaştırma, {stats['reused']} yeniden kullanım") and ok
+        if not ok:
+            return False
+    except Exception as e:
+        print(f"✗ Filtre hatası: {e}")
+        return False
+    
+    print()
+    return True
+
+
+def test_motion_gate():
+    """Hareket kapısının durağan frame'leri atlamasını test et"""
+    print("=" * 60)
+    print("11. Hareket Kapısı Testi")
+    print("=" * 60)
+    
+    try:
+        import numpy as np
+        from motion_gate import MotionGate
+        
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 255, (240, 320, 3), dtype=np.uint8)
+        gate = MotionGate(min_changed=0.005, refresh_interval=4)
+        
+        ok = check(gate.check(frame), "İlk frame işlendi")
+        ok = check(not any(gate.check(frame) for _ in range(3)), "Durağan frame'ler atlandı") and ok
+        ok = check(gate.check(frame) and gate.refreshes == 1, "Yenileme aralığında durağan frame işlendi") and ok
+        
+        moved = frame.copy()
+        moved[60:180, 80:240] = 255 - moved[60:180, 80:240]
+        ok = check(gate.check(moved), "Hareketli frame işlendi") and ok
+        
+        gate.reset()
+        ok = check(gate.check(moved), "reset() sonrası ilk frame işlendi") and ok
+        stats = gate.stats()
+        ok = check(stats['frames'] == 7 and stats['skipped'] == 3,
+                   f"İstatistikler: {stats['frames']} frame, {stats['skipped']} atlanan") and ok
+        if not ok:
+            return False
+    except Exception as e:
+        print(f"✗ Hareket kapısı hatası: {e}")
+        return False
+    
+    print()
+    return True
+
+
+def test_emotion_log():
+    """Duygu kaydının dosya döndürmesini ve yazma hatasını test et"""
+    print("=" * 60)
+    print("12. Duygu Kaydı Testi")
+    print("=" * 60)
+    
+    try:
+        import csv
+        import shutil
+        import tempfile
+        from emotion_log import EmotionLog, LOG_COLUMNS
+        
+        face = {'box': (10, 20, 30, 40), 'emotion': 'happy', 'scores': {'happy': 90.0, 'sad': 10.0}}
+        workdir = tempfile.mkdtemp(prefix='emotion_test_')
+        try:
+            # Küçük boyut sınırı ve tek satırlık toplu yazmalarla birkaç dosya oluşmalı
+            log = EmotionLog(os.path.join(workdir, 'kayit.csv'), rotate_bytes=300,
+                             batch_size=1, flush_interval=0.01)
+            for i in range(10):
+                log.write_frame(i, i / 15, [face], source='test')
+            log.close()
+            stats = log.stats()
+            ok = check(stats['rows'] == 10, f"Tüm satırlar yazıldı ({stats['rows']})")
+            ok = check(len(stats['files']) > 1, f"Boyut sınırında dosya döndürüldü ({len(stats['files'])} dosya)") and ok
+            
+            rows = 0
+            for path in stats['files']:
+                with open(path, encoding='utf-8', newline='') as f:
+                    reader = csv.DictReader(f)
+                    ok = check(reader.fieldnames == LOG_COLUMNS,
+                               f"{os.path.basename(path)} başlık satırıyla başlıyor") and ok
+                    rows += sum(1 for _ in reader)
+            ok = check(rows == 10, "Dosyalardaki satır sayısı doğru") and ok
+            
+            # Açılamayan dosya yazıcıyı sessizce durdurmamalı; hata close()'da fırlatılır
+            blocked = os.path.join(workdir, 'klasor.csv')
+            os.makedirs(blocked)
+            log = EmotionLog(blocked, flush_interval=0.01)
+            log.write_frame(0, 0.0, [face])
+            try:
+                log.close()
+                raised = False
+            except OSError:
+                raised = True
+            ok = check(raised and log.stats()['error'] is not None,
+                       "Yazma hatası close() sırasında bildirildi") and ok
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        if not ok:
+            return False
+    except Exception as e:
+        print(f"✗ Kayıt hatası: {e}")
+        return False
+    
+    print()
+    return True
+
+
 def main():
     """Ana test fonksiyonu"""
     print("\n")
@@ -141,6 +554,14 @@ def main():
         ("Yüz Tanıma Modeli", test_face_cascade),
         ("Webcam Erişimi", test_webcam),
         ("DeepFace Modeli", test_deepface_model),
+        ("Yüz Takipçisi", test_face_tracker),
+        ("Analiz Zamanlayıcısı", test_analysis_scheduler),
+        ("Çıkarım İşçisi", test_inference_worker),
+        ("Artımlı Yüz Tespiti", test_incremental_detector),
+        ("Sonuç Önbelleği", test_result_cache),
+        ("Yüz Değişim Filtresi", test_crop_change_filter),
+        ("Hareket Kapısı", test_motion_gate),
+        ("Duygu Kaydı", test_emotion_log),
     ]
     
     results = []